@@ -0,0 +1,91 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark that compares load/save throughput of option store backends on large option sets
+Usage: python benchmarks/bench_backends.py [--count 50000] [--repeat 3]
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import os
+import sys
+import timeit
+import shutil
+import argparse
+import itertools
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tpDcc.libs.options.core import backends, store
+
+
+def build_entries(count):
+    """
+    Returns a synthetic option set with a mix of groups and option types
+    :param count: int
+    :return: list(tuple(str, object, str))
+    """
+
+    entries = list()
+    group_size = 50
+    for i in range(count):
+        group = 'group{}'.format(i // group_size)
+        if i % group_size == 0:
+            entries.append(('{}.'.format(group), True, 'group'))
+        kind = i % 5
+        path = '{}.option{}'.format(group, i)
+        if kind == 0:
+            entries.append((path, float(i) * 0.5, 'float'))
+        elif kind == 1:
+            entries.append((path, i, 'integer'))
+        elif kind == 2:
+            entries.append((path, bool(i % 2), 'boolean'))
+        elif kind == 3:
+            entries.append((path, 'joint_{}_jnt'.format(i), 'string'))
+        else:
+            entries.append((path, [0.1 * i, 0.2 * i, 0.3 * i], 'vector3f'))
+
+    return entries
+
+
+def best_time(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        start = timeit.default_timer()
+        fn()
+        elapsed = timeit.default_timer() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Option store backends benchmark')
+    parser.add_argument('--count', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    entries = build_entries(args.count)
+    temp_dir = tempfile.mkdtemp()
+    try:
+        print('{} options, best of {}'.format(len(entries), args.repeat))
+        print('{:<10}{:>12}{:>12}{:>14}{:>12}'.format('backend', 'save (s)', 'load (s)', 'edit 1 (s)', 'size (KB)'))
+        for name in backends.get_available_backends():
+            backend = backends.get_backend(name)
+            file_path = os.path.join(temp_dir, 'options{}'.format(backend.EXTENSIONS[0]))
+            save_time = best_time(lambda: backend.write(file_path, entries), args.repeat)
+            load_time = best_time(lambda: backend.read(file_path), args.repeat)
+            option_store = store.OptionStore(file_path, backend=name)
+            edit_path = entries[len(entries) // 2][0]
+            counter = itertools.count()
+            edit_time = best_time(lambda: option_store.set_option(edit_path, float(next(counter))), args.repeat)
+            size = os.path.getsize(file_path) / 1024.0
+            print('{:<10}{:>12.3f}{:>12.3f}{:>14.4f}{:>12.1f}'.format(name, save_time, load_time, edit_time, size))
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == '__main__':
+    main()
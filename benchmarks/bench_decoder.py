@@ -0,0 +1,125 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark that compares option decoding against the legacy per-entry type inference done by option lists
+Usage: python benchmarks/bench_decoder.py [--count 50000] [--repeat 7]
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import os
+import sys
+import timeit
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tpDcc.libs.options.core import decoder
+
+
+def build_options(count):
+    """
+    Returns a synthetic option set where half of the options are stored without explicit type
+    :param count: int
+    :return: list
+    """
+
+    options = list()
+    group_size = 50
+    for i in range(count):
+        group = 'rig.group{}'.format(i // group_size)
+        if i % group_size == 0:
+            options.append(['{}.'.format(group), [True, 'group']])
+        path = '{}.option{}'.format(group, i)
+        kind = i % 4
+        value = [0.5 * i, i, bool(i % 2), 'joint_{}'.format(i)][kind]
+        options.append([path, value] if i % 2 else [path, [value, ['float', 'integer', 'boolean', 'string'][kind]]])
+
+    return options
+
+
+def legacy_decode(options):
+    """
+    Decoding as it was done inline by OptionList._load_widgets
+    """
+
+    records = list()
+    for option in options:
+        option_type = None
+        if type(option[1]) == list:
+            if option[0] == 'list':
+                value = option[1]
+                option_type = 'list'
+            else:
+                value = option[1][0]
+                option_type = option[1][1]
+        else:
+            value = option[1]
+
+        split_name = option[0].split('.')
+        if split_name[-1] == '':
+            search_group = '.'.join(split_name[:-2])
+            name = split_name[-2]
+        else:
+            search_group = '.'.join(split_name[:-1])
+            name = split_name[-1]
+
+        is_group = False
+        if split_name[-1] == '':
+            is_group = True
+            parent_name = '.'.join(split_name[:-1])
+
+        if len(split_name) > 1 and split_name[-1] != '':
+            search_group = '.'.join(split_name[:-2])
+            after_search_group = '.'.join(split_name[:-1])
+            group_name = split_name[-2]
+
+        if not is_group:
+            if not option_type:
+                if isinstance(value, str):
+                    option_type = 'string'
+                elif type(value) == float:
+                    option_type = 'float'
+                elif type(option[1]) == int:
+                    option_type = 'integer'
+                elif type(option[1]) == bool:
+                    option_type = 'boolean'
+                elif type(option[1]) == dict:
+                    option_type = 'dictionary'
+                elif type(option[1]) == list:
+                    option_type = 'list'
+                elif option[1] is None:
+                    option_type = 'title'
+        records.append((option[0], option_type, value, is_group, name, search_group))
+
+    return records
+
+
+def best_time(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        start = timeit.default_timer()
+        fn()
+        elapsed = timeit.default_timer() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Option decoder benchmark')
+    parser.add_argument('--count', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=7)
+    args = parser.parse_args()
+
+    options = build_options(args.count)
+    legacy_time = best_time(lambda: legacy_decode(options), args.repeat)
+    decoder_time = best_time(lambda: list(decoder.decode_options(options)), args.repeat)
+    print('{} options, best of {}'.format(len(options), args.repeat))
+    print('legacy inline decoding: {:.4f} s'.format(legacy_time))
+    print('decoder:                {:.4f} s ({:.1f}x)'.format(decoder_time, legacy_time / decoder_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark that compares indexed option queries against scanning the flat list returned by get_options
+Usage: python benchmarks/bench_query.py [--count 100000] [--lookups 1000] [--repeat 5]
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import os
+import sys
+import timeit
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tpDcc.libs.options.core import store
+
+
+def build_store(count):
+    """
+    Returns an option store with a synthetic option set of nested groups
+    :param count: int
+    :return: OptionStore
+    """
+
+    option_store = store.OptionStore(undo_limit=0)
+    group_size = 50
+    with option_store.batch():
+        for i in range(count):
+            group = 'rig.group{}'.format(i // group_size)
+            if i % group_size == 0:
+                option_store.add_option('{}.'.format(group), True, option_type='group')
+            option_store.add_option('{}.option{}'.format(group, i), 0.5 * i, option_type='float')
+
+    return option_store
+
+
+def scan_get(options, path):
+    for option in options:
+        if option[0] == path:
+            return option[1][0]
+
+
+def scan_prefix(options, prefix):
+    return [option for option in options if option[0].startswith(prefix)]
+
+
+def best_time(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        start = timeit.default_timer()
+        fn()
+        elapsed = timeit.default_timer() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Option query benchmark')
+    parser.add_argument('--count', type=int, default=100000)
+    parser.add_argument('--lookups', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    option_store = build_store(args.count)
+    index = option_store.get_index()
+    paths = random.Random(0).sample([path for path in option_store if not path.endswith('.')], args.lookups)
+    groups = ['rig.group{}.'.format(i) for i in range(0, args.count // 50, max(1, args.count // 50 // args.lookups))]
+
+    def _scan_get():
+        options = option_store.get_options()
+        for path in paths:
+            scan_get(options, path)
+
+    def _scan_prefix():
+        options = option_store.get_options()
+        for group in groups:
+            scan_prefix(options, group)
+
+    scan_get_time = best_time(_scan_get, args.repeat)
+    index_get_time = best_time(lambda: [index.get(path) for path in paths], args.repeat)
+    scan_prefix_time = best_time(_scan_prefix, args.repeat)
+    index_prefix_time = best_time(lambda: [list(index.iterate(group)) for group in groups], args.repeat)
+
+    print('{} options, best of {}'.format(len(index), args.repeat))
+    print('{} exact lookups'.format(len(paths)))
+    print('  scan:  {:.4f} s'.format(scan_get_time))
+    print('  index: {:.4f} s ({:.1f}x)'.format(index_get_time, scan_get_time / max(index_get_time, 1e-9)))
+    print('{} group queries'.format(len(groups)))
+    print('  scan:  {:.4f} s'.format(scan_prefix_time))
+    print('  index: {:.4f} s ({:.1f}x)'.format(index_prefix_time, scan_prefix_time / max(index_prefix_time, 1e-9)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-libs-options numeric arrays
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import os
+import shutil
+import tempfile
+
+from tpDcc.libs.unittests.core import unittestcase
+
+from tpDcc.libs.options.core import backends, arrays
+
+
+class NumericArrayTests(unittestcase.UnitTestCase(as_class=True), object):
+
+    def setUp(self):
+        self._temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self._temp_dir)
+
+    def test_numeric_array_roundtrip(self):
+        weights = arrays.NumericArray([[0.0, 0.5, 1.0], [0.25, 0.75, 1.5]], columns=3)
+        for backend_name in backends.get_available_backends():
+            backend = backends.get_backend(backend_name)
+            option_file = os.path.join(self._temp_dir, 'options{}'.format(backend.EXTENSIONS[0]))
+            backend.write(option_file, [('weights', arrays.encode_array(weights), 'array')])
+            loaded_array = arrays.decode_array(backend.read(option_file)[0][0][1])
+            assert loaded_array == weights and loaded_array.get_row(1) == [0.25, 0.75, 1.5]
+
+    def test_decode_plain_lists(self):
+        assert arrays.decode_array([1, 2, 3]).get_dtype() == arrays.INTEGER
+        assert arrays.decode_array([[1.0, 2, 3]]).get_row(0) == [1.0, 2.0, 3.0]
+        with self.assertRaises(ValueError):
+            arrays.decode_array([[1.0, 2.0]])
@@ -0,0 +1,67 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-libs-options script completion index
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import gc
+import weakref
+
+from tpDcc.libs.unittests.core import unittestcase
+
+from tpDcc.libs.options.core import store, completion
+
+
+class _LegacyOptions(object):
+    """
+    Option object that does not notify its changes
+    """
+
+    def __init__(self):
+        self.options = [['arm.', [True, 'group']]]
+
+    def get_options(self):
+        return self.options
+
+
+class CompletionIndexTests(unittestcase.UnitTestCase(as_class=True), object):
+
+    def _create_store(self):
+        option_store = store.OptionStore()
+        with option_store.batch():
+            option_store.add_option('arm.', True, option_type='group')
+            option_store.add_option('ik', True, group='arm', option_type='boolean')
+
+        return option_store
+
+    def test_index_is_shared_and_incremental(self):
+        option_store = self._create_store()
+        completion_index = completion.get_completion_index(option_store)
+        assert completion.get_completion_index(option_store) is completion_index
+        assert completion_index.is_tracking()
+        option_store.add_option('arm.fk_blend', 0.0, option_type='float')
+        assert 'arm.fk_blend' in completion_index.complete('arm.')
+        option_store.remove_option('arm.fk_blend')
+        assert 'fk_blend' not in completion_index
+
+    def test_index_does_not_keep_option_object_alive(self):
+        option_store = self._create_store()
+        completion.get_completion_index(option_store)
+        store_reference = weakref.ref(option_store)
+        del option_store
+        gc.collect()
+        assert store_reference() is None
+
+    def test_legacy_option_objects_are_refreshed(self):
+        legacy_options = _LegacyOptions()
+        completion_index = completion.get_completion_index(legacy_options)
+        assert not completion_index.is_tracking()
+        legacy_options.options.append(['arm.twist', [0, 'integer']])
+        assert 'arm.twist' not in completion_index
+        completion_index.refresh()
+        assert 'arm.twist' in completion_index
+        completion_index.close()
+        assert completion.get_completion_index(legacy_options) is not completion_index
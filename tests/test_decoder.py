@@ -0,0 +1,30 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-libs-options option decoder
+"""
+
+from __future__ import print_function, division, absolute_import
+
+from tpDcc.libs.unittests.core import unittestcase
+
+from tpDcc.libs.options.core import decoder
+
+
+class DecoderTests(unittestcase.UnitTestCase(as_class=True), object):
+
+    def test_decode_options(self):
+        records = list(decoder.decode_options([
+            ['arm.', [True, 'group']], ['arm.fk.', True], ['arm.fk.count', [3, 'integer']], ['arm.name', 'arm'],
+            ['list', [1, 2]], ['title', None]]))
+        assert [record.path for record in records] == ['arm.', 'arm.fk.', 'arm.fk.count', 'arm.name', 'list', 'title']
+        assert records[1] == decoder.OptionRecord('arm.fk.', 'group', True, True, 'fk', 'arm')
+        assert records[2] == decoder.OptionRecord('arm.fk.count', 'integer', 3, False, 'count', 'arm.fk')
+        assert [record.option_type for record in records[3:]] == ['string', 'list', 'title']
+        assert decoder.decode_option('scale', 1.5).option_type == 'float'
+
+    def test_infer_option_type(self):
+        assert decoder.infer_option_type(True) == 'boolean' and decoder.infer_option_type(1) == 'integer'
+        assert decoder.infer_option_type(u'arm') == 'string' and decoder.infer_option_type(dict()) == 'dictionary'
+        assert decoder.infer_option_type(object()) is None
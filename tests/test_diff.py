@@ -0,0 +1,25 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-libs-options option diffs
+"""
+
+from __future__ import print_function, division, absolute_import
+
+from tpDcc.libs.unittests.core import unittestcase
+
+from tpDcc.libs.options.core import diff
+
+
+class DiffTests(unittestcase.UnitTestCase(as_class=True), object):
+
+    def test_diff_reports_changes(self):
+        old_options = [
+            ['arm.', [True, 'group']], ['arm.ik', [True, 'boolean']], ['color', [[1.0, 0.0, 0.0, 1.0], 'color']]]
+        new_options = [
+            ['color', [[1.0, 0.0, 0.0, 1.0], 'color']], ['arm.', [True, 'group']], ['arm.ik', [1.0, 'float']]]
+        options_diff = diff.diff_options(old_options, new_options)
+        assert options_diff.get_status('arm.ik') == diff.DiffStatus.RETYPED
+        assert [path for path, _, _ in options_diff.moved] == ['color']
+        assert not options_diff.added and not options_diff.removed and not options_diff.changed
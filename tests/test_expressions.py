@@ -0,0 +1,58 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-libs-options expression driven options
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import gc
+import weakref
+
+from tpDcc.libs.unittests.core import unittestcase
+
+from tpDcc.libs.options.core import store, expressions
+
+
+class ExpressionTests(unittestcase.UnitTestCase(as_class=True), object):
+
+    def _create_store(self):
+        option_store = store.OptionStore()
+        with option_store.batch():
+            option_store.add_option('arm.', True, option_type='group')
+            option_store.add_option('segments', 3, group='arm', option_type='integer')
+            option_store.add_option('twist_count', 0, group='arm', option_type='integer')
+            option_store.add_option('twist_length', 0.0, group='arm', option_type='float')
+
+        return option_store
+
+    def test_recompute_downstream_options(self):
+        option_store = self._create_store()
+        expression_graph = expressions.get_expression_graph(option_store)
+        expression_graph.set_expression('arm.twist_count', '2 * arm.segments')
+        expression_graph.set_expression('arm.twist_length', '1.0 / arm.twist_count')
+        with self.assertRaises(expressions.ExpressionCycleError):
+            expression_graph.set_expression('arm.segments', 'arm.twist_length * 2')
+        undo_stack = option_store.get_undo_stack()
+        undo_stack.clear()
+        option_store.set_option('arm.segments', 5)
+        assert option_store.get_option('arm.twist_count') == 10 and option_store.get_option('arm.twist_length') == 0.1
+        assert len(undo_stack) == 1
+        option_store.undo()
+        assert option_store.get_option('arm.twist_count') == 6
+
+    def test_private_attributes_are_rejected(self):
+        for text in ('len(().__class__.__base__.__subclasses__())', 'math.__loader__', '__import__("os")',
+                     '(lambda: 1)()', '[name for name in arm.segments]', 'arm.segments.append(1)'):
+            with self.assertRaises(expressions.ExpressionError):
+                expressions.Expression(text)
+        assert expressions.Expression('round(math.sqrt(arm.segments), 2)').dependencies == ('arm.segments',)
+
+    def test_graph_does_not_keep_option_object_alive(self):
+        option_store = self._create_store()
+        expressions.get_expression_graph(option_store).set_expression('arm.twist_count', 'arm.segments')
+        store_reference = weakref.ref(option_store)
+        del option_store
+        gc.collect()
+        assert store_reference() is None
@@ -0,0 +1,38 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-libs-options layered option stores
+"""
+
+from __future__ import print_function, division, absolute_import
+
+from tpDcc.libs.unittests.core import unittestcase
+
+from tpDcc.libs.options.core import store, layers
+
+
+class LayeredOptionStoreTests(unittestcase.UnitTestCase(as_class=True), object):
+
+    def test_layered_resolution(self):
+        studio_store = store.OptionStore()
+        studio_store.add_option('arm.', True, option_type='group')
+        studio_store.add_option('ik', True, group='arm', option_type='boolean')
+        user_store = store.OptionStore()
+        layered_store = layers.LayeredOptionStore([('studio', studio_store), ('user', user_store)])
+        layered_store.set_option('arm.ik', False)
+        assert layered_store.get_option_layer('arm.ik') == 'user'
+        assert user_store.get_options() == [['arm.ik', [False, 'boolean']]]
+        layered_store.set_option('arm.ik', True)
+        assert layered_store.get_option_layer('arm.ik') == 'studio'
+        assert not user_store.has_options()
+
+    def test_equal_sequences_are_not_overrides(self):
+        studio_store = store.OptionStore()
+        studio_store.add_option('offset', [0.0, 1.0, 0.0], option_type='vector3f')
+        user_store = store.OptionStore()
+        layered_store = layers.LayeredOptionStore([('studio', studio_store), ('user', user_store)])
+        layered_store.add_option('offset', (0.0, 1.0, 0.0), option_type='vector3f')
+        assert not user_store.has_options()
+        layered_store.set_entries([('offset', (0.0, 1.0, 0.0), 'vector3f')])
+        assert not user_store.has_options()
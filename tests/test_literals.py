@@ -0,0 +1,27 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-libs-options list literal parser
+"""
+
+from __future__ import print_function, division, absolute_import
+
+from tpDcc.libs.unittests.core import unittestcase
+
+from tpDcc.libs.options.core import literals
+
+
+class LiteralTests(unittestcase.UnitTestCase(as_class=True), object):
+
+    def test_literal_list_parser(self):
+        assert literals.parse_list("[u'pCube1.vtx[0]', 'a\\'b', 1, -2.5, None, (1, 2), [True]]") == [
+            'pCube1.vtx[0]', "a'b", 1, -2.5, None, (1, 2), [True]]
+        for text in ('[1 2]', "[__import__('os')]", '[1'):
+            with self.assertRaises(literals.LiteralParseError):
+                literals.parse_list(text)
+
+    def test_cached_values_are_copied(self):
+        parsed_list = literals.parse_list('[([1],)]')
+        parsed_list[0][0].append(2)
+        assert literals.parse_list('[([1],)]') == [([1],)]
@@ -0,0 +1,26 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-libs-options three-way merges
+"""
+
+from __future__ import print_function, division, absolute_import
+
+from tpDcc.libs.unittests.core import unittestcase
+
+from tpDcc.libs.options.core import merge
+
+
+class MergeTests(unittestcase.UnitTestCase(as_class=True), object):
+
+    def test_merge_keeps_both_sides_changes(self):
+        base = [('color', [1.0, 0.0, 0.0, 1.0], 'color'), ('arm.', True, 'group'), ('arm.ik', True, 'bool')]
+        ours = [('color', [0.0, 1.0, 0.0, 1.0], 'color'), ('arm.', True, 'group'), ('arm.ik', False, 'bool')]
+        theirs = base[:2] + [('arm.fk', True, 'bool'), ('arm.ik', True, 'bool')]
+        result = merge.merge_entries(base, ours, theirs)
+        assert not result.has_conflicts()
+        assert result.entries == [ours[0], ours[1], theirs[2], ours[2]]
+        result = merge.merge_entries(base, ours, [('color', [0.0, 0.0, 1.0, 1.0], 'color')] + base[1:], prefer='theirs')
+        assert [conflict.path for conflict in result.conflicts] == ['color']
+        assert result.entries[0] == ('color', [0.0, 0.0, 1.0, 1.0], 'color')
@@ -0,0 +1,38 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-libs-options multi-edit of numeric options
+"""
+
+from __future__ import print_function, division, absolute_import
+
+from tpDcc.libs.unittests.core import unittestcase
+
+from tpDcc.libs.options.core import store, multiedit
+
+
+class MultiEditTests(unittestcase.UnitTestCase(as_class=True), object):
+
+    def test_apply_numeric_edit(self):
+        assert multiedit.apply_numeric_edit(
+            [2, 0.5, [1.0, 2.0, 3.0]], ['integer', 'float', 'vector3f'], multiedit.EditMode.SCALE, 1.5) == [
+            3, 0.75, [1.5, 3.0, 4.5]]
+        assert multiedit.apply_numeric_edit(
+            [None, None], ['vector3f', 'float'], multiedit.EditMode.RELATIVE, 1.0) == [[1.0, 1.0, 1.0], 1.0]
+
+    def test_multi_edit_numeric_options(self):
+        option_store = store.OptionStore()
+        option_store.set_entries([
+            ('arm.', True, 'group'), ('arm.ik', True, 'boolean'), ('arm.count', 2, 'integer'),
+            ('arm.offset', [1.0, 2.0, 3.0], 'vector3f')])
+        undo_stack = option_store.get_undo_stack()
+        undo_stack.clear()
+        changed_values = multiedit.edit_numeric_options(
+            option_store, ['arm.count', 'arm.offset', 'arm.ik'], multiedit.EditMode.SCALE, 1.5)
+        assert changed_values == {'arm.count': 3, 'arm.offset': [1.5, 3.0, 4.5]}
+        assert len(undo_stack) == 1
+        option_store.undo()
+        assert option_store.get_option('arm.count') == 2
+        option_store.set_option('arm.offset', (1.0, 2.0, 3.0))
+        assert not multiedit.edit_numeric_options(option_store, ['arm.offset'], multiedit.EditMode.SCALE, 1.0)
@@ -0,0 +1,102 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-libs-options path validation and completion
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import os
+import time
+import shutil
+import tempfile
+import threading
+
+from tpDcc.libs.unittests.core import unittestcase
+
+from tpDcc.libs.options.core import paths
+
+
+class _CountingStatCache(paths.StatCache, object):
+    """
+    Stat cache that counts the paths checked in disk
+    """
+
+    def __init__(self, ttl=paths.STAT_CACHE_TTL):
+        super(_CountingStatCache, self).__init__(ttl)
+        self.checked_paths = list()
+
+    def stat(self, path):
+        found, _ = self.get(path)
+        if not found:
+            self.checked_paths.append(path)
+
+        return super(_CountingStatCache, self).stat(path)
+
+
+class PathTests(unittestcase.UnitTestCase(as_class=True), object):
+
+    def setUp(self):
+        self._temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self._temp_dir)
+
+    def test_stat_cache_entries_expire(self):
+        stat_cache = paths.StatCache(ttl=0.05)
+        missing_path = os.path.join(self._temp_dir, 'missing')
+        assert stat_cache.stat(self._temp_dir) is not None and stat_cache.stat(missing_path) is None
+        assert stat_cache.get(self._temp_dir)[0] and len(stat_cache) == 2
+        time.sleep(0.1)
+        assert stat_cache.get(self._temp_dir) == (False, None)
+        stat_cache.stat(os.path.join(self._temp_dir, 'other'))
+        assert len(stat_cache) == 1
+
+    def test_validator_coalesces_same_path(self):
+        validator = paths.PathValidator(thread_count=2)
+        stat_cache = validator._cache = _CountingStatCache()
+        results = list()
+        finished = threading.Event()
+
+        def _on_validated(path, status):
+            results.append(status)
+            if len(results) == 3:
+                finished.set()
+
+        # Workers cannot take jobs while the condition is held, so all the requests are queued before any check
+        with validator._condition:
+            validator.validate(self._temp_dir, paths.PathKind.DIRECTORY, callback=_on_validated)
+            validator.validate(self._temp_dir, paths.PathKind.DIRECTORY, callback=_on_validated)
+            validator.validate(self._temp_dir, paths.PathKind.FILE, callback=_on_validated)
+            assert validator.pending() == 1
+        assert finished.wait(10)
+        assert stat_cache.checked_paths == [self._temp_dir]
+        assert sorted(results) == [paths.PathStatus.VALID, paths.PathStatus.VALID, paths.PathStatus.WRONG_KIND]
+        assert validator.validate(self._temp_dir, paths.PathKind.DIRECTORY) == paths.PathStatus.VALID
+
+    def test_directory_index_invalidated_by_mtime(self):
+        directory_index = paths.DirectoryIndex()
+        open(os.path.join(self._temp_dir, 'arm.json'), 'w').close()
+        text = os.path.join(self._temp_dir, 'ar')
+        completions = list()
+        listed = threading.Event()
+
+        def _on_listed(completed_text, new_completions):
+            completions.append(new_completions)
+            listed.set()
+
+        assert directory_index.complete(text, callback=_on_listed) == list()
+        assert listed.wait(10)
+        assert completions[-1] == [os.path.join(self._temp_dir, 'arm.json')]
+        assert directory_index.complete(text) == [os.path.join(self._temp_dir, 'arm.json')]
+
+        listed.clear()
+        open(os.path.join(self._temp_dir, 'arm_ik.json'), 'w').close()
+        mtime = os.stat(self._temp_dir).st_mtime + 10
+        os.utime(self._temp_dir, (mtime, mtime))
+        assert directory_index.complete(text, callback=_on_listed) == [os.path.join(self._temp_dir, 'arm.json')]
+        assert listed.wait(10)
+        assert completions[-1] == [
+            os.path.join(self._temp_dir, 'arm.json'), os.path.join(self._temp_dir, 'arm_ik.json')]
+        assert directory_index.get_listing(self._temp_dir).mtime == mtime
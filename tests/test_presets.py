@@ -0,0 +1,81 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-libs-options option presets
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import os
+import shutil
+import tempfile
+
+from tpDcc.libs.unittests.core import unittestcase
+
+from tpDcc.libs.options.core import store, presets
+
+
+class PresetsTests(unittestcase.UnitTestCase(as_class=True), object):
+
+    def setUp(self):
+        self._temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self._temp_dir)
+
+    def _create_store(self):
+        option_store = store.OptionStore()
+        option_store.set_entries([
+            ('arm.', True, 'group'), ('arm.ik', True, 'boolean'), ('arm.count', 3, 'integer'),
+            ('leg.', True, 'group'), ('leg.ik', True, 'boolean')])
+
+        return option_store
+
+    def test_snapshots_share_unchanged_nodes(self):
+        snapshot = presets.OptionsSnapshot(presets.PathTree.from_entries(
+            [('arm.ik', True, 'boolean'), ('leg.ik', True, 'boolean')]), ('arm.ik', 'leg.ik'))
+        new_tree = snapshot.tree.set('arm.ik', ('arm.ik', False, 'boolean'))
+        assert new_tree.get('arm.ik') == ('arm.ik', False, 'boolean') and snapshot.tree.get('arm.ik')[1] is True
+        assert presets.get_tree_changes(snapshot.tree, new_tree) == ([('arm.ik', False, 'boolean')], [])
+
+    def test_apply_preset(self):
+        option_store = self._create_store()
+        presets_manager = presets.PresetsManager(option_store)
+        presets_manager.save_preset('default')
+        option_store.set_option('arm.count', 5)
+        option_store.remove_option('leg.ik')
+        presets_manager.save_preset('five')
+
+        changed_values, structure_changed = presets_manager.apply_preset('default')
+        assert structure_changed and changed_values == {'arm.count': 3, 'leg.ik': True}
+        assert option_store.get_entries() == self._create_store().get_entries()
+        changed_values, structure_changed = presets_manager.apply_preset('default')
+        assert not changed_values and not structure_changed
+        presets_manager.close()
+
+    def test_presets_roundtrip(self):
+        option_store = self._create_store()
+        presets_manager = presets.PresetsManager(option_store)
+        option_store.set_option('arm.ik', False)
+        presets_manager.save_preset('fk')
+        presets_file = os.path.join(self._temp_dir, 'presets.json')
+        presets_manager.save_presets(presets_file)
+
+        loaded_manager = presets.PresetsManager(self._create_store())
+        loaded_manager.load_presets(presets_file)
+        assert loaded_manager.get_preset_names() == ['fk']
+        assert loaded_manager.get_preset('fk').get_entries() == presets_manager.get_preset('fk').get_entries()
+
+    def test_apply_preset_restores_order(self):
+        option_store = store.OptionStore()
+        option_store.set_entries([('a', 1, 'integer'), ('b', 2, 'integer'), ('c', 3, 'integer')])
+        presets_manager = presets.PresetsManager(option_store)
+        presets_manager.save_preset('abc')
+        option_store.set_entries([('c', 3, 'integer'), ('a', 1, 'integer'), ('b', 2, 'integer')])
+        assert presets_manager.take_snapshot().order == ('c', 'a', 'b')
+        changed_values, structure_changed = presets_manager.apply_preset('abc')
+        assert not changed_values and structure_changed
+        assert list(option_store) == ['a', 'b', 'c']
+        option_store.undo()
+        assert presets_manager.take_snapshot().order == ('c', 'a', 'b')
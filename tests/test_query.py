@@ -0,0 +1,41 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-libs-options indexed option queries
+"""
+
+from __future__ import print_function, division, absolute_import
+
+from tpDcc.libs.unittests.core import unittestcase
+
+from tpDcc.libs.options.core import store, query
+
+
+class OptionsIndexTests(unittestcase.UnitTestCase(as_class=True), object):
+
+    def _create_store(self):
+        option_store = store.OptionStore()
+        option_store.set_entries([
+            ('arm.', True, 'group'), ('arm.ik', True, 'boolean'), ('arm.fk.', True, 'group'),
+            ('arm.fk.count', 3, 'integer'), ('leg.', True, 'group'), ('leg.ik', False, 'boolean')])
+
+        return option_store
+
+    def test_queries(self):
+        options_index = query.OptionsIndex(self._create_store())
+        assert options_index.get('arm.fk.count') == 3 and options_index.get_type('leg.ik') == 'boolean'
+        assert [entry[0] for entry in options_index.iterate_group('arm', recursive=False)] == ['arm.fk.', 'arm.ik']
+        assert [entry[0] for entry in options_index.iterate_group('arm')] == ['arm.fk.', 'arm.fk.count', 'arm.ik']
+        assert [entry[0] for entry in options_index.glob('*.ik')] == ['arm.ik', 'leg.ik']
+        assert [entry[0] for entry in options_index.find(prefix='arm.', option_type='boolean')] == ['arm.ik']
+        assert [entry[0] for entry in options_index.search(r'\.count$')] == ['arm.fk.count']
+
+    def test_index_tracks_store_changes(self):
+        option_store = self._create_store()
+        options_index = option_store.get_index()
+        option_store.remove_option('leg.ik')
+        option_store.add_option('count', 2, group='leg', option_type='integer')
+        option_store.set_option('arm.ik', False)
+        assert 'leg.ik' not in options_index and options_index.get('arm.ik') is False
+        assert [entry[0] for entry in options_index.of_type('integer')] == ['arm.fk.count', 'leg.count']
@@ -0,0 +1,33 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-libs-options option schemas
+"""
+
+from __future__ import print_function, division, absolute_import
+
+from tpDcc.libs.unittests.core import unittestcase
+
+from tpDcc.libs.options.core import schema
+
+
+class SchemaTests(unittestcase.UnitTestCase(as_class=True), object):
+
+    def test_range_validation(self):
+        validator = schema.compile_validator(schema.OptionField('float', min_value=0.0, max_value=1.0))
+        assert validator(0.5) is None and validator(1.5) and validator('0.5')
+
+        validator = schema.compile_validator(schema.OptionField('color', min_value=0.0, max_value=1.0))
+        assert validator([1.0, 0.5, 0.0, 1.0]) is None and validator([1.0, 2.0, 0.0])
+
+        validator = schema.compile_validator(schema.OptionField('string', min_value=0, max_value=1))
+        assert validator('arm') is None
+
+    def test_choices_validation(self):
+        validator = schema.compile_validator(schema.OptionField('string', choices=['a', 'b']))
+        assert validator('b') is None and validator('c')
+
+        validator = schema.compile_validator(schema.OptionField('combo', choices=['a', 'b']))
+        assert validator([['a', 'b'], [1, 'b']]) is None and validator([['a', 'b']]) is None
+        assert validator([['a', 'c'], [1, 'c']])
@@ -0,0 +1,61 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-libs-options option scripts
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import sys
+import threading
+
+from tpDcc.libs.unittests.core import unittestcase
+
+from tpDcc.libs.options.core import scripts
+
+
+class ScriptTests(unittestcase.UnitTestCase(as_class=True), object):
+
+    def test_thread_output_is_restored(self):
+        stdout = sys.stdout
+        script_run = scripts.run_script('print(options["name"])', [['name', 'arm']], mode=scripts.RunMode.THREAD)
+        assert script_run.wait(10)
+        assert script_run.get_status() == scripts.ScriptStatus.FINISHED
+        assert script_run.get_output() == 'arm\n'
+        assert sys.stdout is stdout
+
+    def test_cancel_thread(self):
+        stdout = sys.stdout
+        script_run = scripts.run_script('while True:\n    pass', list(), mode=scripts.RunMode.THREAD)
+        script_run.cancel()
+        assert script_run.wait(10)
+        assert script_run.get_status() == scripts.ScriptStatus.CANCELLED
+        assert sys.stdout is stdout
+
+    def test_process_messages_are_drained(self):
+        script_run = scripts.run_script(
+            'print("done")\nraise ValueError("invalid")', list(), mode=scripts.RunMode.PROCESS)
+        assert script_run.wait(60)
+        assert script_run.get_status() == scripts.ScriptStatus.FAILED
+        assert 'done' in script_run.get_output() and 'ValueError' in script_run.get_error()
+
+    def test_syntax_checker_only_checks_latest_text(self):
+        issue = scripts.check_syntax('if True\n    pass')
+        assert issue.line == 1 and scripts.check_syntax('if True\n    pass') is issue
+        assert scripts.check_syntax('print(1)') is None
+
+        syntax_checker = scripts.SyntaxChecker()
+        results = list()
+        checked = threading.Event()
+
+        def _on_checked(code_snippet, syntax_issue):
+            results.append((code_snippet, syntax_issue))
+            checked.set()
+
+        # Worker cannot take jobs while the condition is held, so the first text is replaced before being checked
+        with syntax_checker._condition:
+            syntax_checker.submit(self, 'x = (', _on_checked)
+            syntax_checker.submit(self, 'x = 1', _on_checked)
+        assert checked.wait(10)
+        assert results == [('x = 1', None)]
@@ -0,0 +1,38 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-libs-options options search
+"""
+
+from __future__ import print_function, division, absolute_import
+
+from tpDcc.libs.unittests.core import unittestcase
+
+from tpDcc.libs.options.core import store, search
+
+
+class OptionsFilterTests(unittestcase.UnitTestCase(as_class=True), object):
+
+    def test_filter_updates_changed_visibility(self):
+        option_store = store.OptionStore()
+        option_store.set_entries([
+            ('arm.', True, 'group'), ('arm.ik', True, 'boolean'), ('color', [1.0, 0.0, 0.0, 1.0], 'color')])
+        options_filter = search.OptionsFilter(search.OptionsSearchIndex(option_store))
+        to_show, to_hide = options_filter.set_text('ik')
+        assert not to_show and to_hide == {'color'}
+        to_show, to_hide = options_filter.set_text('color')
+        assert to_show == {'color'} and to_hide == {'arm.', 'arm.ik'}
+        assert options_filter.reset() == ({'arm.', 'arm.ik'}, set())
+
+    def test_matching_groups_include_visible_ancestors(self):
+        option_store = store.OptionStore()
+        option_store.set_entries([
+            ('arm.', True, 'group'), ('arm.fk.', True, 'group'), ('arm.fk.count', 3, 'integer'),
+            ('leg.', True, 'group'), ('leg.ik', True, 'boolean')])
+        options_filter = search.OptionsFilter(search.OptionsSearchIndex(option_store))
+        to_show, to_hide = options_filter.set_text('count')
+        assert not to_show and to_hide == {'leg.', 'leg.ik'}
+        assert options_filter.get_matching_groups() == {'arm.', 'arm.fk.'}
+        options_filter.reset()
+        assert not options_filter.get_matching_groups()
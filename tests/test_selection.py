@@ -0,0 +1,36 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-libs-options selection buffers
+"""
+
+from __future__ import print_function, division, absolute_import
+
+from tpDcc.libs.unittests.core import unittestcase
+
+from tpDcc.libs.options.core import selection
+
+
+class SelectionTests(unittestcase.UnitTestCase(as_class=True), object):
+
+    def test_compress_expand_roundtrip(self):
+        names = ['pSphere1.vtx[{}]'.format(index) for index in range(50000)] + ['pCube1', 'pCube1.f[3]']
+        items, count = selection.compress_selection(names)
+        assert items == ('pSphere1.vtx[0:49999]', 'pCube1', 'pCube1.f[3]') and count == len(names)
+        assert list(selection.expand_selection(items)) == names
+        assert selection.compress_selection(items) == (items, count)
+
+    def test_compress_keeps_selection_order(self):
+        names = ['pCube1.vtx[5]', 'pCube1.vtx[6]', 'pCube1.vtx[0:2]', 'pSphere1', 'pCube1.vtx[3]', 'pCube1.vtx[3]']
+        items, count = selection.compress_selection(names)
+        assert items == ('pCube1.vtx[5:6]', 'pCube1.vtx[0:2]', 'pSphere1', 'pCube1.vtx[3]', 'pCube1.vtx[3]')
+        assert count == 8
+        assert list(selection.expand_selection(items)) == list(selection.expand_selection(names))
+
+        selection_buffer = selection.SelectionBuffer(names)
+        assert len(selection_buffer) == 8 and selection_buffer.get_items()[0] == 'pCube1.vtx[5:6]'
+
+    def test_is_range_name(self):
+        assert selection.is_range_name('pSphere1.vtx[0:49999]')
+        assert not selection.is_range_name('pSphere1.vtx[3]') and not selection.is_range_name('pSphere1')
@@ -0,0 +1,107 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-libs-options option stores
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import os
+import shutil
+import tempfile
+
+from tpDcc.libs.unittests.core import unittestcase
+
+from tpDcc.libs.options.core import backends, store, schema
+
+
+class OptionStoreTests(unittestcase.UnitTestCase(as_class=True), object):
+
+    def setUp(self):
+        self._temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self._temp_dir)
+
+    def _create_store(self, backend_name):
+        extension = backends.BACKENDS[backend_name].EXTENSIONS[0]
+        option_file = os.path.join(self._temp_dir, 'options{}'.format(extension))
+        option_store = store.OptionStore(option_file, backend=backend_name)
+        with option_store.batch():
+            option_store.add_option('arm.', True, option_type='group')
+            option_store.add_option('ik', True, group='arm', option_type='boolean')
+            option_store.add_option('color', [1.0, 0.0, 0.0, 1.0], option_type='color')
+
+        return option_store
+
+    def test_backends_roundtrip(self):
+        for backend_name in backends.get_available_backends():
+            option_store = self._create_store(backend_name)
+            option_store.set_option('arm.ik', False)
+            option_store.remove_option('color')
+            loaded_store = store.OptionStore(option_store.get_option_file())
+            assert loaded_store.get_options() == [['arm.', [True, 'group']], ['arm.ik', [False, 'boolean']]]
+
+    def test_batch_defers_save(self):
+        option_store = self._create_store(backends.JSONBackend.NAME)
+        with option_store.batch():
+            option_store.set_option('arm.ik', False)
+            assert option_store.is_dirty()
+        assert not option_store.is_dirty()
+
+    def test_undo_merges_value_changes(self):
+        option_store = self._create_store(backends.JSONBackend.NAME)
+        undo_stack = option_store.get_undo_stack()
+        undo_stack.clear()
+        for value in (False, True, False):
+            option_store.set_option('arm.ik', value)
+        option_store.remove_option('color')
+        assert len(undo_stack) == 2
+        option_store.undo()
+        option_store.undo()
+        assert option_store.get_option('arm.ik') is True
+        assert option_store.get_options()[-1] == ['color', [[1.0, 0.0, 0.0, 1.0], 'color']]
+        option_store.redo()
+        assert option_store.get_option('arm.ik') is False
+
+    def test_undo_restores_removed_positions(self):
+        option_store = store.OptionStore()
+        paths = ['option{}'.format(index) for index in range(10)]
+        for path in paths:
+            option_store.add_option(path, 0, option_type='integer')
+        with option_store.batch():
+            for path in paths[1::2] + paths[:1]:
+                option_store.remove_option(path)
+            option_store.add_option('option10', 0, option_type='integer')
+            option_store.remove_option('option4')
+        assert [entry[0] for entry in option_store.get_entries()] == ['option2', 'option6', 'option8', 'option10']
+        option_store.undo()
+        assert [entry[0] for entry in option_store.get_entries()] == paths
+
+    def test_sparse_store_only_writes_changed_values(self):
+        rig_schema = schema.OptionSchema('rig', {
+            'arm.': schema.OptionField('group', default=True),
+            'arm.ik': schema.OptionField('boolean', default=True),
+            'arm.segments': schema.OptionField('integer', default=3, min_value=1)})
+        option_file = os.path.join(self._temp_dir, 'options.json')
+        option_store = store.OptionStore(option_file, schema=rig_schema, sparse=True)
+        option_store.set_option('arm.segments', 5)
+        option_store.set_option('arm.ik', True)
+        assert backends.JSONBackend().read(option_file)[0] == [('arm.segments', 5, 'integer')]
+        assert option_store.get_option('arm.ik') is True and len(option_store.get_options()) == 3
+        with self.assertRaises(schema.OptionValidationError):
+            option_store.set_option('arm.segments', 0)
+        option_store.set_option('arm.segments', 3)
+        assert backends.JSONBackend().read(option_file)[0] == list()
+
+    def test_own_saves_are_not_file_modifications(self):
+        option_store = self._create_store(backends.JSONBackend.NAME)
+        option_store.set_option('arm.ik', False)
+        option_store.set_option('color', (0.0, 1.0, 0.0, 1.0))
+        assert not option_store.is_file_modified()
+        assert len(option_store.get_undo_stack()) == 3
+
+        entries = option_store.get_entries()
+        backends.JSONBackend().write(option_store.get_option_file(), entries[:1] + [('arm.ik', True, 'boolean')])
+        assert option_store.is_file_modified()
@@ -0,0 +1,112 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-libs-options write-behind writer
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import os
+import time
+import shutil
+import tempfile
+import threading
+
+from tpDcc.libs.unittests.core import unittestcase
+
+from tpDcc.libs.options.core import backends, writer, store
+
+
+class _BlockingBackend(backends.JSONBackend, object):
+    """
+    Backend that waits until it is released before writing and counts the writes of each file
+    """
+
+    def __init__(self, delay=0.0):
+        super(_BlockingBackend, self).__init__()
+        self.release = threading.Event()
+        self.delay = delay
+        self.writes = dict()
+
+    def write(self, file_path, entries, metadata=None):
+        self.release.wait(10)
+        time.sleep(self.delay)
+        super(_BlockingBackend, self).write(file_path, entries, metadata)
+        self.writes[file_path] = self.writes.get(file_path, 0) + 1
+
+
+class _FailingBackend(backends.JSONBackend, object):
+    """
+    Backend whose data cannot be written into disk
+    """
+
+    def dumps(self, entries, metadata=None):
+        return [entries]
+
+
+class WriteBehindWriterTests(unittestcase.UnitTestCase(as_class=True), object):
+
+    def setUp(self):
+        self._temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self._temp_dir)
+
+    def test_saves_are_coalesced(self):
+        options_writer = writer.WriteBehindWriter()
+        backend = _BlockingBackend()
+        gate_file = os.path.join(self._temp_dir, 'gate.json')
+        option_file = os.path.join(self._temp_dir, 'options.json')
+        options_writer.submit(gate_file, backend, list())
+        for value in range(5):
+            options_writer.submit(option_file, backend, [('count', value, 'integer')])
+        backend.release.set()
+        assert options_writer.flush(timeout=10)
+        assert backend.writes[option_file] == 1
+        assert backend.read(option_file)[0] == [('count', 4, 'integer')]
+
+    def test_flush_waits_for_disk(self):
+        options_writer = writer.WriteBehindWriter()
+        backend = _BlockingBackend(delay=0.2)
+        option_file = os.path.join(self._temp_dir, 'options.json')
+        options_writer.submit(option_file, backend, [('count', 1, 'integer')])
+        assert not options_writer.flush(option_file, timeout=0.05)
+        backend.release.set()
+        assert options_writer.flush(option_file, timeout=10)
+        assert os.path.isfile(option_file) and not options_writer.pending(option_file)
+
+    def test_failed_write_keeps_previous_file(self):
+        options_writer = writer.WriteBehindWriter()
+        option_file = os.path.join(self._temp_dir, 'options.json')
+        backends.JSONBackend().write(option_file, [('count', 1, 'integer')])
+        options_writer.submit(option_file, _FailingBackend(), [('count', 2, 'integer')])
+        assert not options_writer.flush(option_file, timeout=10)
+        assert options_writer.get_error(option_file)
+        assert os.listdir(self._temp_dir) == ['options.json']
+        assert backends.JSONBackend().read(option_file)[0] == [('count', 1, 'integer')]
+
+        options_writer.submit(option_file, backends.JSONBackend(), [('count', 3, 'integer')])
+        assert options_writer.flush(option_file, timeout=10)
+        assert options_writer.get_error(option_file) is None
+
+    def test_failed_write_keeps_store_dirty(self):
+        option_file = os.path.join(self._temp_dir, 'options.json')
+        option_store = store.OptionStore(
+            option_file, backend=_FailingBackend(), auto_save=False, write_behind=writer.WriteBehindWriter())
+        option_store.add_option('count', 1, option_type='integer')
+        option_store.save()
+        assert not option_store.flush(timeout=10)
+        assert option_store.is_dirty()
+
+    def test_snapshot_does_not_share_values(self):
+        option_file = os.path.join(self._temp_dir, 'options.json')
+        backend = _BlockingBackend()
+        option_store = store.OptionStore(
+            option_file, backend=backend, auto_save=False, write_behind=writer.WriteBehindWriter())
+        option_store.add_option('items', ['a', 'b'])
+        option_store.save()
+        option_store.get_option('items').append('c')
+        backend.release.set()
+        assert option_store.flush(timeout=10)
+        assert backends.JSONBackend().read(option_file)[0] == [('items', ['a', 'b'], None)]
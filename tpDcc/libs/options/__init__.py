@@ -8,32 +8,48 @@ Initialization module for tpDcc-libs-options
 from __future__ import print_function, division, absolute_import
 
 import os
+import sys
+import importlib
 import logging.config
 
-from tpDcc.core import library
-
 LIB_ID = 'tpDcc-libs-options'
 LIB_ENV = LIB_ID.replace('-', '_').upper()
 
 LOGGER = logging.getLogger('tpDcc-libs-options')
 
+# Public names that are resolved on first access. Most of them live in modules that import Qt, tpDcc.core or the
+# widget libraries, so they are not loaded until some code actually touches them.
+# name: (module path, attribute name or None to return the module itself)
+_LAZY_ATTRIBUTES = {
+    'OptionsLib': ('tpDcc.libs.options.core.library', 'OptionsLib'),
+    'Option': ('tpDcc.libs.options.core.option', 'Option'),
+    'OptionList': ('tpDcc.libs.options.core.optionlist', 'OptionList'),
+    'OptionListGroup': ('tpDcc.libs.options.core.optionlist', 'OptionListGroup'),
+    'OptionsViewer': ('tpDcc.libs.options.core.viewer', 'OptionsViewer'),
+    'factory': ('tpDcc.libs.options.core.factory', None),
+}
+
+
+def __getattr__(name):
+    """
+    Resolves lazy package attributes (PEP 562)
+    :param name: str
+    :return: variant
+    """
+
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError('module {} has no attribute {}'.format(__name__, name))
 
-class OptionsLib(library.DccLibrary, object):
-    def __init__(self, *args, **kwargs):
-        super(OptionsLib, self).__init__(*args, **kwargs)
+    module_path, attribute_name = _LAZY_ATTRIBUTES[name]
+    module = importlib.import_module(module_path)
+    value = getattr(module, attribute_name) if attribute_name else module
+    globals()[name] = value
 
-    @classmethod
-    def config_dict(cls, file_name=None):
-        base_tool_config = library.DccLibrary.config_dict(file_name=file_name)
-        tool_config = {
-            'name': 'Options Library',
-            'id': LIB_ID,
-            'supported_dccs': {'maya': ['2017', '2018', '2019', '2020']},
-            'tooltip': 'Library to easily create data driven options/attributes views.'
-        }
-        base_tool_config.update(tool_config)
+    return value
 
-        return base_tool_config
+
+def __dir__():
+    return sorted(set(globals().keys()) | set(_LAZY_ATTRIBUTES.keys()))
 
 
 def create_logger(dev=False):
@@ -59,3 +75,7 @@ def create_logger(dev=False):
 
 
 create_logger()
+
+# Module level __getattr__ is not supported in Python 2, so there we keep the library class eagerly available
+if sys.version_info[0] < 3:
+    from tpDcc.libs.options.core.library import OptionsLib
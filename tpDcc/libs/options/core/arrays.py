@@ -0,0 +1,346 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains numeric arrays stored in options.
+Values are kept in a single contiguous buffer (a NumPy array when NumPy is available, an array.array otherwise), so
+large weight lists do not create a Python object per number. Option objects store arrays encoded as a small dictionary
+whose data is the little endian binary buffer in base64, which keeps them valid for text backends; binary backends
+store the raw buffer.
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import sys
+import array
+import base64
+import logging
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+LOGGER = logging.getLogger('tpDcc-libs-options')
+
+# Supported element types with their array.array type codes and NumPy data types. Both are stored little endian
+FLOAT = 'float'
+INTEGER = 'int'
+TYPECODES = {FLOAT: 'd', INTEGER: 'i'}
+NUMPY_DTYPES = {FLOAT: '<f8', INTEGER: '<i4'}
+
+# Supported number of columns: plain lists and lists of vectors (for example, per vertex positions)
+COLUMNS = (1, 3)
+
+_BIG_ENDIAN = sys.byteorder == 'big'
+
+
+class NumericArray(object):
+    """
+    Numeric array of one or three columns stored in a contiguous buffer
+    """
+
+    __slots__ = ('_dtype', '_columns', '_data')
+
+    def __init__(self, values=None, dtype=FLOAT, columns=1):
+        """
+        :param values: iterable or None, flat sequence of numbers or sequence of rows
+        :param dtype: str, FLOAT or INTEGER
+        :param columns: int, number of columns (1 or 3)
+        """
+
+        if dtype not in TYPECODES:
+            raise ValueError('Invalid array type "{}". Supported types: {}'.format(dtype, sorted(TYPECODES)))
+        if columns not in COLUMNS:
+            raise ValueError('Invalid number of array columns: {}. Supported: {}'.format(columns, COLUMNS))
+
+        self._dtype = dtype
+        self._columns = columns
+        self._data = _create_buffer(_flatten(values if values is not None else list()), dtype)
+        if len(self._data) % columns:
+            raise ValueError('Array of {} values cannot be split into {} columns'.format(len(self._data), columns))
+
+    def __len__(self):
+        return len(self._data) // self._columns
+
+    def __eq__(self, other):
+        if not isinstance(other, NumericArray):
+            return False
+
+        return self._dtype == other._dtype and self._columns == other._columns and self.to_bytes() == other.to_bytes()
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return 'NumericArray({} x {} {})'.format(len(self), self._columns, self._dtype)
+
+    @classmethod
+    def from_bytes(cls, data, dtype=FLOAT, columns=1):
+        """
+        Creates an array from a little endian binary buffer
+        :param data: bytes
+        :param dtype: str, FLOAT or INTEGER
+        :param columns: int
+        :return: NumericArray
+        """
+
+        new_array = cls(dtype=dtype, columns=columns)
+        if numpy is not None:
+            new_array._data = numpy.frombuffer(data, dtype=NUMPY_DTYPES[dtype]).copy()
+        else:
+            new_array._data = array.array(TYPECODES[dtype])
+            _frombytes(new_array._data, data)
+            if _BIG_ENDIAN:
+                new_array._data.byteswap()
+        if len(new_array._data) % columns:
+            raise ValueError('Array of {} values cannot be split into {} columns'.format(len(new_array._data), columns))
+
+        return new_array
+
+    def get_dtype(self):
+        """
+        Returns the type of the elements of the array
+        :return: str, FLOAT or INTEGER
+        """
+
+        return self._dtype
+
+    def get_columns(self):
+        """
+        Returns the number of columns of the array
+        :return: int
+        """
+
+        return self._columns
+
+    def get_data(self):
+        """
+        Returns the flat buffer that stores the values. Modifying it modifies the array
+        :return: numpy.ndarray or array.array
+        """
+
+        return self._data
+
+    def get_value(self, row, column=0):
+        """
+        Returns a single value of the array
+        :param row: int
+        :param column: int
+        :return: float or int
+        """
+
+        value = self._data[row * self._columns + column]
+
+        return float(value) if self._dtype == FLOAT else int(value)
+
+    def set_value(self, row, column, value):
+        """
+        Sets a single value of the array
+        :param row: int
+        :param column: int
+        :param value: float or int
+        """
+
+        self._data[row * self._columns + column] = float(value) if self._dtype == FLOAT else int(value)
+
+    def get_row(self, row):
+        """
+        Returns the values of a row of the array
+        :param row: int
+        :return: list(float or int)
+        """
+
+        return [self.get_value(row, column) for column in range(self._columns)]
+
+    def to_list(self):
+        """
+        Returns the values of the array as Python numbers
+        :return: list(float or int) or list(list(float or int)), rows are returned as lists when array has more than
+            one column
+        """
+
+        values = self._data.tolist()
+        if self._columns == 1:
+            return values
+
+        return [values[i:i + self._columns] for i in range(0, len(values), self._columns)]
+
+    def to_bytes(self):
+        """
+        Returns the values of the array as a little endian binary buffer
+        :return: bytes
+        """
+
+        if numpy is not None:
+            return numpy.asarray(self._data, dtype=NUMPY_DTYPES[self._dtype]).tobytes()
+        if not _BIG_ENDIAN:
+            return _tobytes(self._data)
+
+        data = array.array(self._data.typecode, self._data)
+        data.byteswap()
+
+        return _tobytes(data)
+
+    def copy(self):
+        """
+        Returns a copy of the array
+        :return: NumericArray
+        """
+
+        return self.from_bytes(self.to_bytes(), self._dtype, self._columns)
+
+
+def is_encoded_array(value):
+    """
+    Returns whether the given value is an array encoded by encode_array
+    :param value: variant
+    :return: bool
+    """
+
+    return isinstance(value, dict) and 'data' in value and 'dtype' in value and 'columns' in value
+
+
+def encode_array(numeric_array, binary=False):
+    """
+    Encodes given array into the value stored in option objects
+    :param numeric_array: NumericArray
+    :param binary: bool, whether data is stored as raw bytes (for binary backends) instead of base64 text
+    :return: dict
+    """
+
+    data = numeric_array.to_bytes()
+    if not binary:
+        data = base64.b64encode(data).decode('ascii')
+
+    return {'dtype': numeric_array.get_dtype(), 'columns': numeric_array.get_columns(), 'data': data}
+
+
+def decode_array(value):
+    """
+    Decodes a value stored in an option object into an array. Plain lists of numbers or rows are also accepted
+    :param value: dict or list or None
+    :return: NumericArray
+    """
+
+    if value is None:
+        return NumericArray()
+    if isinstance(value, NumericArray):
+        return value
+    if not is_encoded_array(value):
+        rows = list(value)
+        columns = len(rows[0]) if rows and isinstance(rows[0], (list, tuple)) else 1
+        dtype = FLOAT if any(isinstance(item, float) for item in _flatten(rows)) else INTEGER
+        return NumericArray(rows, dtype=dtype, columns=columns)
+
+    data = value['data']
+    if _is_text(data):
+        data = base64.b64decode(data)
+
+    return NumericArray.from_bytes(data, dtype=value['dtype'], columns=value['columns'])
+
+
+def to_binary(value):
+    """
+    Returns given encoded array with its data stored as raw bytes
+    :param value: dict
+    :return: dict
+    """
+
+    if not is_encoded_array(value) or not _is_text(value['data']):
+        return value
+
+    binary_value = dict(value)
+    binary_value['data'] = base64.b64decode(value['data'])
+
+    return binary_value
+
+
+def from_binary(value):
+    """
+    Returns given encoded array with its data stored as base64 text
+    :param value: dict
+    :return: dict
+    """
+
+    if not is_encoded_array(value) or _is_text(value['data']):
+        return value
+
+    text_value = dict(value)
+    text_value['data'] = base64.b64encode(bytes(value['data'])).decode('ascii')
+
+    return text_value
+
+
+def _create_buffer(values, dtype):
+    """
+    Internal function that creates the buffer that stores the given values
+    :param values: list(float or int)
+    :param dtype: str
+    :return: numpy.ndarray or array.array
+    """
+
+    if numpy is not None:
+        return numpy.array(values, dtype=NUMPY_DTYPES[dtype])
+
+    return array.array(TYPECODES[dtype], [float(value) if dtype == FLOAT else int(value) for value in values])
+
+
+def _flatten(values):
+    """
+    Internal function that returns the values of the given rows as a flat list
+    :param values: iterable
+    :return: list
+    """
+
+    if numpy is not None and isinstance(values, numpy.ndarray):
+        return values.ravel()
+
+    flat_values = list()
+    for value in values:
+        if isinstance(value, (list, tuple)):
+            flat_values.extend(value)
+        else:
+            flat_values.append(value)
+
+    return flat_values
+
+
+def _is_text(data):
+    """
+    Internal function that returns whether the given array data is base64 text
+    :param data: str or bytes
+    :return: bool
+    """
+
+    if str is bytes:
+        # In Python 2, msgpack returns binary data as str too, so only unicode strings are considered text
+        return not isinstance(data, (str, bytearray))
+
+    return isinstance(data, str)
+
+
+def _frombytes(buffer_array, data):
+    """
+    Internal function that appends the values of the given binary buffer to the given array
+    :param buffer_array: array.array
+    :param data: bytes
+    """
+
+    if hasattr(buffer_array, 'frombytes'):
+        buffer_array.frombytes(data)
+    else:
+        buffer_array.fromstring(data)
+
+
+def _tobytes(buffer_array):
+    """
+    Internal function that returns the binary buffer of the given array
+    :param buffer_array: array.array
+    :return: bytes
+    """
+
+    if hasattr(buffer_array, 'tobytes'):
+        return buffer_array.tobytes()
+
+    return buffer_array.tostring()
@@ -0,0 +1,365 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains storage backends used to persist option sets
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import os
+import json
+import sqlite3
+import logging
+import tempfile
+from collections import OrderedDict
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+from tpDcc.libs.options.core import arrays
+
+LOGGER = logging.getLogger('tpDcc-libs-options')
+
+FORMAT_VERSION = 1
+
+try:
+    string_types = (basestring,)
+except NameError:
+    string_types = (str,)
+
+
+class OptionsBackend(object):
+    """
+    Base class for option storage backends.
+    Backends work with option entries, which are (path, value, option_type) tuples in display order, and a metadata
+    dictionary.
+    """
+
+    NAME = None
+    EXTENSIONS = tuple()
+
+    @classmethod
+    def is_available(cls):
+        """
+        Returns whether the dependencies of this backend are available
+        :return: bool
+        """
+
+        return True
+
+    def read(self, file_path):
+        """
+        Reads option entries from given file
+        :param file_path: str
+        :return: tuple(list(tuple(str, object, str)), dict)
+        """
+
+        with open(file_path, 'rb') as fh:
+            data = fh.read()
+        if not data:
+            return list(), dict()
+
+        return self.loads(data)
+
+    def write(self, file_path, entries, metadata=None):
+        """
+        Writes all given option entries into given file
+        :param file_path: str
+        :param entries: list(tuple(str, object, str))
+        :param metadata: dict or None
+        """
+
+        data = self.dumps(entries, metadata)
+        write_file_atomic(file_path, data)
+
+    def write_changes(self, file_path, entries, changed_paths, removed_paths, metadata=None):
+        """
+        Writes option changes into given file. By default the whole option set is rewritten, backends that can update
+        single options should override this function.
+        :param file_path: str
+        :param entries: list(tuple(str, object, str)), full list of option entries
+        :param changed_paths: list(str), paths whose value or type changed since last write
+        :param removed_paths: list(str), paths removed since last write
+        :param metadata: dict or None
+        """
+
+        self.write(file_path, entries, metadata)
+
+    def loads(self, data):
+        """
+        Decodes given serialized data
+        :param data: bytes
+        :return: tuple(list(tuple(str, object, str)), dict)
+        """
+
+        raise NotImplementedError('loads function not implemented in {}'.format(self.__class__.__name__))
+
+    def dumps(self, entries, metadata=None):
+        """
+        Encodes given option entries
+        :param entries: list(tuple(str, object, str))
+        :param metadata: dict or None
+        :return: bytes
+        """
+
+        raise NotImplementedError('dumps function not implemented in {}'.format(self.__class__.__name__))
+
+
+class JSONBackend(OptionsBackend):
+    """
+    Human readable backend. Options are stored as an indented JSON object keyed by option path so files can be easily
+    diffed and merged by hand.
+    """
+
+    NAME = 'json'
+    EXTENSIONS = ('.json', '.options')
+
+    def loads(self, data):
+        if isinstance(data, bytes):
+            data = data.decode('utf-8')
+        document = json.loads(data, object_pairs_hook=OrderedDict)
+
+        # Legacy files only contain the list of [name, value] pairs
+        if isinstance(document, list):
+            return [split_option_value(name, value) for name, value in document], dict()
+
+        options = document.get('options', dict())
+        entries = [(path, item.get('value'), item.get('type')) for path, item in options.items()]
+
+        return entries, dict(document.get('metadata', dict()))
+
+    def dumps(self, entries, metadata=None):
+        options = OrderedDict()
+        for path, value, option_type in entries:
+            options[path] = OrderedDict([('value', value), ('type', option_type)])
+        document = OrderedDict([('version', FORMAT_VERSION), ('metadata', metadata or dict()), ('options', options)])
+        data = json.dumps(document, indent=4, separators=(',', ': '))
+        if not isinstance(data, bytes):
+            data = data.encode('utf-8')
+
+        return data
+
+
+class MsgPackBackend(OptionsBackend):
+    """
+    Compact binary backend based on MessagePack. Requires msgpack package.
+    Numeric arrays are stored as raw binary buffers instead of base64 text.
+    """
+
+    NAME = 'msgpack'
+    EXTENSIONS = ('.msgpack', '.mpk')
+
+    @classmethod
+    def is_available(cls):
+        return msgpack is not None
+
+    def __init__(self):
+        if msgpack is None:
+            raise RuntimeError('msgpack is not installed. MsgPack options backend is not available!')
+        super(MsgPackBackend, self).__init__()
+
+    def loads(self, data):
+        document = msgpack.unpackb(data, raw=False)
+        entries = [(path, arrays.from_binary(value) if option_type == 'array' else value, option_type)
+                   for path, value, option_type in document.get('options', list())]
+
+        return entries, dict(document.get('metadata', dict()))
+
+    def dumps(self, entries, metadata=None):
+        document = {
+            'version': FORMAT_VERSION,
+            'metadata': metadata or dict(),
+            'options': [[path, arrays.to_binary(value) if option_type == 'array' else value, option_type]
+                        for path, value, option_type in entries]
+        }
+
+        return msgpack.packb(document, use_bin_type=True)
+
+
+class SQLiteBackend(OptionsBackend):
+    """
+    Backend that stores each option in its own row of a SQLite database. Changes are written in a single transaction
+    and only the rows of changed options are updated.
+    """
+
+    NAME = 'sqlite'
+    EXTENSIONS = ('.db', '.sqlite', '.sqlite3')
+
+    def read(self, file_path):
+        connection = self._connect(file_path)
+        try:
+            rows = connection.execute('SELECT path, value, type FROM options ORDER BY position').fetchall()
+            meta_rows = connection.execute('SELECT key, value FROM metadata').fetchall()
+        finally:
+            connection.close()
+
+        entries = [(path, json.loads(value), option_type) for path, value, option_type in rows]
+        metadata = dict((key, json.loads(value)) for key, value in meta_rows)
+
+        return entries, metadata
+
+    def write(self, file_path, entries, metadata=None):
+        connection = self._connect(file_path)
+        try:
+            with connection:
+                connection.execute('DELETE FROM options')
+                connection.executemany(
+                    'INSERT INTO options (path, position, value, type) VALUES (?, ?, ?, ?)',
+                    self._iterate_rows(entries))
+                self._write_metadata(connection, metadata)
+        finally:
+            connection.close()
+
+    def write_changes(self, file_path, entries, changed_paths, removed_paths, metadata=None):
+        if not os.path.isfile(file_path):
+            return self.write(file_path, entries, metadata)
+
+        changed_paths = set(changed_paths)
+        connection = self._connect(file_path)
+        try:
+            with connection:
+                if removed_paths:
+                    connection.executemany('DELETE FROM options WHERE path = ?', [(path,) for path in removed_paths])
+                if changed_paths:
+                    connection.executemany(
+                        'INSERT OR REPLACE INTO options (path, position, value, type) VALUES (?, ?, ?, ?)',
+                        self._iterate_rows(entries, changed_paths))
+                self._write_metadata(connection, metadata)
+        finally:
+            connection.close()
+
+    def loads(self, data):
+        raise NotImplementedError('SQLite backend works with files only')
+
+    def dumps(self, entries, metadata=None):
+        raise NotImplementedError('SQLite backend works with files only')
+
+    def _connect(self, file_path):
+        """
+        Internal function that opens a connection to given database and makes sure the tables exist
+        :param file_path: str
+        :return: sqlite3.Connection
+        """
+
+        connection = sqlite3.connect(file_path)
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS options '
+            '(path TEXT PRIMARY KEY, position INTEGER NOT NULL, value TEXT, type TEXT)')
+        connection.execute('CREATE TABLE IF NOT EXISTS metadata (key TEXT PRIMARY KEY, value TEXT)')
+
+        return connection
+
+    def _iterate_rows(self, entries, paths=None):
+        for i, (path, value, option_type) in enumerate(entries):
+            if paths is not None and path not in paths:
+                continue
+            yield path, i, json.dumps(value), option_type
+
+    def _write_metadata(self, connection, metadata):
+        connection.execute('DELETE FROM metadata')
+        if metadata:
+            connection.executemany(
+                'INSERT INTO metadata (key, value) VALUES (?, ?)',
+                [(key, json.dumps(value)) for key, value in metadata.items()])
+
+
+BACKENDS = OrderedDict([
+    (JSONBackend.NAME, JSONBackend),
+    (MsgPackBackend.NAME, MsgPackBackend),
+    (SQLiteBackend.NAME, SQLiteBackend)
+])
+
+
+def get_available_backends():
+    """
+    Returns the names of the backends that can be used in current environment
+    :return: list(str)
+    """
+
+    return [name for name, backend_class in BACKENDS.items() if backend_class.is_available()]
+
+
+def get_backend(name=None, file_path=None):
+    """
+    Returns backend instance with given name. If no name is given, the backend is resolved from file extension
+    :param name: str or None
+    :param file_path: str or None
+    :return: OptionsBackend
+    """
+
+    if isinstance(name, OptionsBackend):
+        return name
+
+    if not name and file_path:
+        extension = os.path.splitext(file_path)[-1].lower()
+        for backend_name, backend_class in BACKENDS.items():
+            if extension in backend_class.EXTENSIONS:
+                name = backend_name
+                break
+
+    name = name or JSONBackend.NAME
+    if name not in BACKENDS:
+        raise ValueError('Options backend "{}" is not supported. Available: {}'.format(name, list(BACKENDS.keys())))
+
+    return BACKENDS[name]()
+
+
+def write_file_atomic(file_path, data):
+    """
+    Writes given data into a temporary file next to the given one and replaces it once the write finishes, so readers
+    never find a partially written options file
+    :param file_path: str
+    :param data: bytes
+    """
+
+    file_directory = os.path.dirname(os.path.abspath(file_path))
+    file_handle, temp_path = tempfile.mkstemp(
+        prefix='.{}.'.format(os.path.basename(file_path)), suffix='.tmp', dir=file_directory)
+    try:
+        with os.fdopen(file_handle, 'wb') as fh:
+            fh.write(data)
+            fh.flush()
+            os.fsync(fh.fileno())
+        if os.path.isfile(file_path):
+            os.chmod(temp_path, os.stat(file_path).st_mode & 0o777)
+        _replace_file(temp_path, file_path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def _replace_file(source_path, target_path):
+    """
+    Internal function that atomically renames source file into target path
+    :param source_path: str
+    :param target_path: str
+    """
+
+    replace = getattr(os, 'replace', None)
+    if replace:
+        replace(source_path, target_path)
+        return
+
+    # Python 2 has no os.replace and os.rename fails in Windows if the target file exists
+    if os.name == 'nt' and os.path.exists(target_path):
+        os.remove(target_path)
+    os.rename(source_path, target_path)
+
+
+def split_option_value(name, value):
+    """
+    Converts an option item with the format used by option objects ([name, [value, type]] or [name, value]) into an
+    option entry
+    :param name: str
+    :param value: variant, raw value or [value, option_type]
+    :return: tuple(str, object, str)
+    """
+
+    if isinstance(value, list) and len(value) == 2 and isinstance(value[1], string_types) and name != 'list':
+        return name, value[0], value[1]
+
+    return name, value, None
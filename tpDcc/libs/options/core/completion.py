@@ -0,0 +1,262 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains the completion index used by script options.
+A single index is built per option object and shared by all the script widgets that edit its scripts. The index is
+updated incrementally with the modified paths when the option object notifies its changes.
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import bisect
+import keyword
+import logging
+import weakref
+
+try:
+    import __builtin__ as builtins
+except ImportError:
+    import builtins
+
+from tpDcc.libs.options.core import backends
+
+LOGGER = logging.getLogger('tpDcc-libs-options')
+
+# Name used by option scripts to access the option object
+OPTIONS_SCOPE_NAME = 'options'
+
+# Maximum number of completions returned by default
+MAX_COMPLETIONS = 50
+
+_INDICES = weakref.WeakKeyDictionary()
+_DEFAULT_SYMBOLS = None
+
+
+class CompletionIndex(object):
+    """
+    Sorted index of the names that can be completed in the scripts of an option object: option paths, each of the
+    tokens of the option paths, Python keywords, builtins and the public attributes of the option object.
+    """
+
+    def __init__(self, option_object=None, symbols=None):
+        """
+        :param option_object: object or None, option object whose option names are indexed
+        :param symbols: list(str) or None, extra names that are always indexed. If not given, Python keywords,
+            builtins and the public attributes of the option object are used
+        """
+
+        self._option_object_ref = _get_reference(option_object)
+        self._tracking = False
+        self._keys = list()
+        self._counts = dict()
+        self._paths = set()
+        if symbols is None:
+            symbols = list(get_default_symbols())
+            if option_object is not None:
+                symbols.extend('{}.{}'.format(OPTIONS_SCOPE_NAME, name) for name in dir(type(option_object))
+                               if not name.startswith('_'))
+        self._symbols = set(symbols)
+
+        self.build(option_object.get_options() if option_object is not None else list())
+        if option_object is not None and hasattr(option_object, 'add_listener'):
+            option_object.add_listener(self._on_options_changed)
+            self._tracking = True
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, name):
+        return name in self._counts
+
+    def close(self):
+        """
+        Stops tracking the changes of the option object. The index is no longer shared, so get_completion_index builds
+        a new one the next time it is requested
+        """
+
+        option_object = self.get_option_object()
+        self._tracking = False
+        if option_object is None:
+            return
+        if hasattr(option_object, 'remove_listener'):
+            option_object.remove_listener(self._on_options_changed)
+        try:
+            if _INDICES.get(option_object) is self:
+                del _INDICES[option_object]
+        except TypeError:
+            pass
+
+    def get_option_object(self):
+        """
+        Returns the option object whose option names are indexed. Indices only keep a weak reference to it
+        :return: object or None, None if the option object was deleted
+        """
+
+        return self._option_object_ref()
+
+    def is_tracking(self):
+        """
+        Returns whether the index is updated automatically when options change. Indices of option objects that do not
+        notify their changes must be refreshed manually
+        :return: bool
+        """
+
+        return self._tracking
+
+    def refresh(self):
+        """
+        Rebuilds the index with the current options of the option object. Only needed for option objects that do not
+        notify their changes
+        """
+
+        option_object = self.get_option_object()
+        if option_object is not None:
+            self.build(option_object.get_options())
+
+    def build(self, options):
+        """
+        Indexes the given options replacing the current ones
+        :param options: list, options with the format returned by option objects get_options function
+        """
+
+        self._counts = dict((symbol, 1) for symbol in self._symbols)
+        self._paths = set()
+        for option in options:
+            path = backends.split_option_value(*option)[0]
+            self._paths.add(path)
+            for name in _get_path_names(path):
+                self._counts[name] = self._counts.get(name, 0) + 1
+        self._keys = sorted((name.lower(), name) for name in self._counts)
+
+    def update(self, path, removed=False):
+        """
+        Updates the index of a single option. O(log n) per name of the option path, plus the insertion into the sorted
+        list of names when a name is new.
+        :param path: str
+        :param removed: bool, whether the option was removed
+        """
+
+        if removed == (path not in self._paths):
+            return
+
+        if removed:
+            self._paths.discard(path)
+            for name in _get_path_names(path):
+                count = self._counts.get(name, 0) - 1
+                if count > 0:
+                    self._counts[name] = count
+                    continue
+                self._counts.pop(name, None)
+                key = (name.lower(), name)
+                index = bisect.bisect_left(self._keys, key)
+                if index < len(self._keys) and self._keys[index] == key:
+                    del self._keys[index]
+            return
+
+        self._paths.add(path)
+        for name in _get_path_names(path):
+            count = self._counts.get(name, 0)
+            self._counts[name] = count + 1
+            if not count:
+                bisect.insort(self._keys, (name.lower(), name))
+
+    def complete(self, prefix, limit=MAX_COMPLETIONS):
+        """
+        Returns the indexed names that start with the given prefix (case insensitive), in alphabetical order
+        :param prefix: str
+        :param limit: int or None, maximum number of returned names
+        :return: list(str)
+        """
+
+        keys = self._keys
+        prefix = prefix.lower()
+        completions = list()
+        index = bisect.bisect_left(keys, (prefix, ''))
+        while index < len(keys) and keys[index][0].startswith(prefix):
+            completions.append(keys[index][1])
+            if limit and len(completions) >= limit:
+                break
+            index += 1
+
+        return completions
+
+    def _on_options_changed(self, option_object, paths):
+        """
+        Internal callback function that is called each time the options of the option object change
+        :param option_object: object
+        :param paths: list(str) or None
+        """
+
+        if paths is None:
+            self.build(option_object.get_options())
+            return
+
+        for path in paths:
+            self.update(path, removed=path not in option_object)
+
+
+def get_completion_index(option_object):
+    """
+    Returns the completion index of the given option object. Index is built the first time it is requested and shared
+    afterwards
+    :param option_object: object
+    :return: CompletionIndex
+    """
+
+    try:
+        completion_index = _INDICES.get(option_object)
+    except TypeError:
+        LOGGER.debug('Option object {} cannot share its completion index'.format(option_object))
+        return CompletionIndex(option_object)
+
+    if completion_index is None:
+        completion_index = _INDICES[option_object] = CompletionIndex(option_object)
+
+    return completion_index
+
+
+def get_default_symbols():
+    """
+    Returns the names that are always available in option scripts: Python keywords, builtins and the name of the
+    option object
+    :return: tuple(str)
+    """
+
+    global _DEFAULT_SYMBOLS
+    if _DEFAULT_SYMBOLS is None:
+        symbols = set(keyword.kwlist)
+        symbols.update(name for name in dir(builtins) if not name.startswith('_'))
+        symbols.add(OPTIONS_SCOPE_NAME)
+        _DEFAULT_SYMBOLS = tuple(sorted(symbols))
+
+    return _DEFAULT_SYMBOLS
+
+
+def _get_reference(option_object):
+    """
+    Internal function that returns a weak reference to the given option object. Objects that do not support weak
+    references are referenced strongly
+    :param option_object: object or None
+    :return: callable, function that returns the option object
+    """
+
+    try:
+        return weakref.ref(option_object)
+    except TypeError:
+        return lambda: option_object
+
+
+def _get_path_names(path):
+    """
+    Internal function that returns the names indexed for the given option path: the whole path and each of its tokens
+    :param path: str
+    :return: set(str)
+    """
+
+    path = path.rstrip('.')
+    names = set(token for token in path.split('.') if token)
+    if path:
+        names.add(path)
+
+    return names
@@ -0,0 +1,103 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains functions to decode option sets into normalized option records.
+Decoding does not depend on widgets, so it can be used by headless tools.
+"""
+
+from __future__ import print_function, division, absolute_import
+
+from collections import namedtuple
+
+try:
+    string_types = (basestring,)
+    TYPE_TABLE = {str: 'string', unicode: 'string'}
+except NameError:
+    string_types = (str,)
+    TYPE_TABLE = {str: 'string'}
+
+# Option type inferred from the exact type of the value of options stored without an explicit type
+TYPE_TABLE.update({
+    float: 'float',
+    int: 'integer',
+    bool: 'boolean',
+    dict: 'dictionary',
+    list: 'list',
+    type(None): 'title'
+})
+
+# path: full option path (group paths end with a dot)
+# option_type: option type, None if it cannot be inferred
+# value: option value
+# is_group: whether the option is a group
+# name: option name (last token of the path)
+# parent: path of the parent group without the trailing dot ('' for root options)
+OptionRecord = namedtuple('OptionRecord', ['path', 'option_type', 'value', 'is_group', 'name', 'parent'])
+
+
+def infer_option_type(value):
+    """
+    Returns the option type of the given value
+    :param value: variant
+    :return: str or None
+    """
+
+    option_type = TYPE_TABLE.get(type(value))
+    if option_type is None and isinstance(value, string_types):
+        option_type = 'string'
+
+    return option_type
+
+
+def decode_option(name, data):
+    """
+    Decodes a single option item
+    :param name: str, option path
+    :param data: variant, [value, option_type] or raw value
+    :return: OptionRecord
+    """
+
+    return next(decode_options([(name, data)]))
+
+
+def decode_options(options):
+    """
+    Generator that decodes the given options into normalized option records
+    Each path is split only once and the type of options stored without explicit type is resolved with a single
+    lookup in TYPE_TABLE.
+    :param options: list, options with the format returned by option objects get_options function:
+        [name, [value, option_type]] or [name, value]
+    :return: generator(OptionRecord)
+    """
+
+    # Local references avoid global lookups in the loop
+    make_record = tuple.__new__
+    record_class = OptionRecord
+    type_table_get = TYPE_TABLE.get
+    list_type = list
+
+    for option in options:
+        name, data = option[0], option[1]
+        option_type = None
+        if type(data) is list_type:
+            if name == 'list':
+                value = data
+                option_type = 'list'
+            else:
+                value, option_type = data[0], data[1]
+        else:
+            value = data
+
+        if name[-1:] == '.':
+            parent, _, option_name = name[:-1].rpartition('.')
+            yield make_record(record_class, (name, 'group', value, True, option_name, parent))
+            continue
+
+        parent, _, option_name = name.rpartition('.')
+        if not option_type:
+            option_type = type_table_get(type(value))
+            if option_type is None and isinstance(value, string_types):
+                option_type = 'string'
+
+        yield make_record(record_class, (name, option_type, value, False, option_name, parent))
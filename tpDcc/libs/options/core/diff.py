@@ -0,0 +1,223 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains the diff engine used to compare option sets.
+Option sets are compared with a merge join over their sorted paths, so no widgets (and no intermediate option
+objects) are needed to compare large option sets.
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import bisect
+import logging
+
+from tpDcc.libs.options.core import backends
+
+LOGGER = logging.getLogger('tpDcc-libs-options')
+
+
+class DiffStatus(object):
+    ADDED = 'added'
+    REMOVED = 'removed'
+    CHANGED = 'changed'
+    RETYPED = 'retyped'
+    MOVED = 'moved'
+
+
+class OptionsDiff(object):
+    """
+    Differences between two option sets
+    """
+
+    def __init__(self):
+        self.added = list()
+        self.removed = list()
+        self.changed = list()
+        self.retyped = list()
+        self.moved = list()
+        self._status = dict()
+
+    def __bool__(self):
+        return bool(self._status)
+
+    __nonzero__ = __bool__
+
+    def __len__(self):
+        return len(self._status)
+
+    def __contains__(self, path):
+        return path in self._status
+
+    def __repr__(self):
+        return 'OptionsDiff(added={}, removed={}, changed={}, retyped={}, moved={})'.format(
+            len(self.added), len(self.removed), len(self.changed), len(self.retyped), len(self.moved))
+
+    def get_status(self, path):
+        """
+        Returns how the option with given path differs
+        :param path: str
+        :return: str or None, DiffStatus value or None if the option did not change
+        """
+
+        return self._status.get(path)
+
+    def get_paths(self, status=None):
+        """
+        Returns the paths of the options that differ
+        :param status: str or None, if given, only paths with this DiffStatus are returned
+        :return: list(str)
+        """
+
+        if status is None:
+            return list(self._status.keys())
+
+        return [path for path, path_status in self._status.items() if path_status == status]
+
+    def is_structural(self):
+        """
+        Returns whether options were added, removed, retyped or reordered
+        :return: bool
+        """
+
+        return bool(self.added or self.removed or self.retyped or self.moved)
+
+    def add(self, status, path, *args):
+        """
+        Registers a difference
+        :param status: str, DiffStatus value
+        :param path: str
+        :param args: tuple, data of the difference
+        """
+
+        getattr(self, status).append((path,) + args)
+        self._status[path] = status
+
+
+def diff_options(old_options, new_options):
+    """
+    Compares two option sets with the format returned by option objects get_options function
+    :param old_options: list
+    :param new_options: list
+    :return: OptionsDiff
+    """
+
+    return diff_entries(
+        [backends.split_option_value(*option) for option in old_options],
+        [backends.split_option_value(*option) for option in new_options])
+
+
+def diff_files(old_file, new_file):
+    """
+    Compares the options stored in two files. Files can be stored with different backends
+    :param old_file: str
+    :param new_file: str
+    :return: OptionsDiff
+    """
+
+    old_entries, _ = backends.get_backend(file_path=old_file).read(old_file)
+    new_entries, _ = backends.get_backend(file_path=new_file).read(new_file)
+
+    return diff_entries(old_entries, new_entries)
+
+
+def diff_entries(old_entries, new_entries):
+    """
+    Compares two lists of option entries in display order. Following differences are reported:
+        - added: (path, value, option type)
+        - removed: (path, value, option type)
+        - changed: (path, old value, new value)
+        - retyped: (path, old type, new type, old value, new value)
+        - moved: (path, old index, new index), options kept whose relative order changed
+    :param old_entries: list(tuple(str, object, str))
+    :param new_entries: list(tuple(str, object, str))
+    :return: OptionsDiff
+    """
+
+    result = OptionsDiff()
+    old_sorted = sorted(range(len(old_entries)), key=lambda i: old_entries[i][0])
+    new_sorted = sorted(range(len(new_entries)), key=lambda i: new_entries[i][0])
+
+    # Merge join over sorted paths. Kept options are stored as (new index, old index) to detect moves
+    kept = list()
+    old_count, new_count = len(old_sorted), len(new_sorted)
+    i = j = 0
+    while i < old_count or j < new_count:
+        old_entry = old_entries[old_sorted[i]] if i < old_count else None
+        new_entry = new_entries[new_sorted[j]] if j < new_count else None
+        if new_entry is None or (old_entry is not None and old_entry[0] < new_entry[0]):
+            result.add(DiffStatus.REMOVED, *old_entry)
+            i += 1
+            continue
+        if old_entry is None or new_entry[0] < old_entry[0]:
+            result.add(DiffStatus.ADDED, *new_entry)
+            j += 1
+            continue
+
+        path, old_value, old_type = old_entry
+        _, new_value, new_type = new_entry
+        if old_type != new_type:
+            result.add(DiffStatus.RETYPED, path, old_type, new_type, old_value, new_value)
+        elif not are_values_equal(old_value, new_value):
+            result.add(DiffStatus.CHANGED, path, old_value, new_value)
+        kept.append((new_sorted[j], old_sorted[i]))
+        i += 1
+        j += 1
+
+    kept.sort()
+    for index in _get_moved_indices([old_index for _, old_index in kept]):
+        new_index, old_index = kept[index]
+        path = new_entries[new_index][0]
+        if path in result:
+            # Options that also changed keep their status but are still reported as moved
+            result.moved.append((path, old_index, new_index))
+        else:
+            result.add(DiffStatus.MOVED, path, old_index, new_index)
+
+    return result
+
+
+def are_values_equal(value, other_value):
+    """
+    Returns whether both option values are equal. Lists and tuples with the same items are considered equal
+    :param value: variant
+    :param other_value: variant
+    :return: bool
+    """
+
+    if value is other_value:
+        return True
+    if isinstance(value, (list, tuple)) and isinstance(other_value, (list, tuple)):
+        return len(value) == len(other_value) and all(are_values_equal(a, b) for a, b in zip(value, other_value))
+
+    return value == other_value
+
+
+def _get_moved_indices(old_indices):
+    """
+    Internal function that returns the positions of the given sequence that are not part of its longest increasing
+    subsequence. Those are the minimum set of options that must move to get the new order.
+    :param old_indices: list(int), old indices of the kept options in new order
+    :return: list(int)
+    """
+
+    tails = list()
+    tail_positions = list()
+    previous = [-1] * len(old_indices)
+    for position, value in enumerate(old_indices):
+        index = bisect.bisect_left(tails, value)
+        if index == len(tails):
+            tails.append(value)
+            tail_positions.append(position)
+        else:
+            tails[index] = value
+            tail_positions[index] = position
+        previous[position] = tail_positions[index - 1] if index else -1
+
+    in_order = set()
+    position = tail_positions[-1] if tail_positions else -1
+    while position != -1:
+        in_order.add(position)
+        position = previous[position]
+
+    return [position for position in range(len(old_indices)) if position not in in_order]
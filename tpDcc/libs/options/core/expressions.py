@@ -0,0 +1,690 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains options whose values are driven by expressions of other options.
+Expressions reference options by their path (for example, "arm.twist_count" can be driven by "2 * arm.segments").
+A dependency graph is built per option object: when a driver option changes, its downstream options are flagged as
+dirty and only those are recomputed, in topological order. Options whose recomputed value does not change do not
+propagate further. Expressions are stored in the metadata of option objects that support it.
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import ast
+import math
+import logging
+import weakref
+import traceback
+import contextlib
+from collections import deque
+
+LOGGER = logging.getLogger('tpDcc-libs-options')
+
+# Metadata key used to store the expressions of an option object
+EXPRESSIONS_METADATA_KEY = 'expressions'
+
+# Names that can be used in expressions without being considered option paths
+EXPRESSION_SCOPE = {
+    'abs': abs, 'min': min, 'max': max, 'round': round, 'int': int, 'float': float, 'bool': bool, 'len': len,
+    'sum': sum, 'math': math, 'pi': math.pi, 'True': True, 'False': False, 'None': None
+}
+
+# Syntax allowed in expressions. Anything else (lambdas, comprehensions, keyword arguments, ...) is rejected before
+# the expression is compiled
+_ALLOWED_NODES = tuple(getattr(ast, name) for name in (
+    'Expression', 'BinOp', 'UnaryOp', 'Compare', 'BoolOp', 'IfExp', 'Call', 'Name', 'Attribute', 'Subscript', 'Index',
+    'Tuple', 'List', 'Load', 'Constant', 'Num', 'Str', 'NameConstant', 'operator', 'unaryop', 'cmpop', 'boolop')
+    if hasattr(ast, name))
+
+_GRAPHS = weakref.WeakKeyDictionary()
+
+
+class ExpressionError(ValueError):
+    """
+    Exception raised when an expression is not valid
+    """
+
+    pass
+
+
+class ExpressionCycleError(ExpressionError):
+    """
+    Exception raised when an expression would make an option depend on itself
+    """
+
+    def __init__(self, cycle):
+        """
+        :param cycle: list(str), option paths of the cycle. First and last paths are the same
+        """
+
+        self.cycle = cycle
+        super(ExpressionCycleError, self).__init__('Expression dependency cycle: {}'.format(' -> '.join(cycle)))
+
+
+class Expression(object):
+    """
+    Compiled expression. Option paths referenced by the expression are replaced by local names, so evaluating it does
+    not need to resolve attributes
+    """
+
+    __slots__ = ('text', 'dependencies', '_code', '_names')
+
+    def __init__(self, text):
+        """
+        :param text: str, Python expression that references options by path
+        :raises ExpressionError: if the expression is not valid
+        """
+
+        self.text = text
+        try:
+            tree = ast.parse(text.strip(), mode='eval')
+        except SyntaxError as exc:
+            raise ExpressionError('Invalid expression "{}": {}'.format(text, exc))
+        _check_syntax(tree, text)
+
+        transformer = _PathTransformer()
+        tree = ast.fix_missing_locations(transformer.visit(tree))
+        self.dependencies = tuple(transformer.paths)
+        self._names = tuple(transformer.names)
+        self._code = compile(tree, '<expression>', 'eval')
+
+    def __repr__(self):
+        return 'Expression({!r})'.format(self.text)
+
+    def evaluate(self, get_value):
+        """
+        Evaluates the expression
+        :param get_value: callable, function that returns the value of an option path
+        :return: variant
+        """
+
+        scope = dict(EXPRESSION_SCOPE)
+        scope['__builtins__'] = dict()
+        for name, path in zip(self._names, self.dependencies):
+            scope[name] = get_value(path)
+
+        return eval(self._code, scope)
+
+
+class ExpressionGraph(object):
+    """
+    Dependency graph of the expressions of an option object. If the option object notifies its changes (for example,
+    OptionStore), downstream options are recomputed each time a driver option changes. Recomputed values are not
+    recorded in the undo history: undoing a driver change recomputes its downstream options again.
+    """
+
+    def __init__(self, option_object=None):
+        """
+        :param option_object: object or None, option object whose options are driven
+        """
+
+        self._option_object_ref = _get_reference(option_object)
+        self._expressions = dict()
+        self._dependents = dict()
+        self._dirty = set()
+        self._invalid = set()
+        self._changed = set()
+        self._listeners = list()
+        self._updating = False
+
+        self.load()
+        if option_object is not None and hasattr(option_object, 'add_listener'):
+            option_object.add_listener(self._on_options_changed)
+
+    def __len__(self):
+        return len(self._expressions)
+
+    def __contains__(self, path):
+        return path in self._expressions
+
+    def close(self):
+        """
+        Stops tracking the changes of the option object. The graph is no longer shared, so get_expression_graph builds
+        a new one the next time it is requested
+        """
+
+        option_object = self.get_option_object()
+        if option_object is None:
+            return
+        if hasattr(option_object, 'remove_listener'):
+            option_object.remove_listener(self._on_options_changed)
+        try:
+            if _GRAPHS.get(option_object) is self:
+                del _GRAPHS[option_object]
+        except TypeError:
+            pass
+
+    def get_option_object(self):
+        """
+        Returns the option object whose options are driven. Graphs only keep a weak reference to it
+        :return: object or None, None if the option object was deleted
+        """
+
+        return self._option_object_ref()
+
+    def add_listener(self, callback):
+        """
+        Adds a function that is called each time options are recomputed
+        :param callback: callable, function that receives the graph and a dictionary with the new values of the
+            recomputed options whose value changed
+        """
+
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        """
+        Removes a function added with add_listener
+        :param callback: callable
+        """
+
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def load(self):
+        """
+        Rebuilds the graph with the expressions stored in the option object metadata. Expressions that are not valid
+        or that create cycles are ignored
+        """
+
+        expressions = dict()
+        get_metadata = getattr(self.get_option_object(), 'get_metadata', None)
+        if get_metadata:
+            expressions = get_metadata(EXPRESSIONS_METADATA_KEY) or dict()
+
+        self._expressions = dict()
+        self._dependents = dict()
+        for path, text in expressions.items():
+            try:
+                expression = Expression(text)
+                cycle = self._find_cycle(path, expression.dependencies)
+                if cycle:
+                    raise ExpressionCycleError(cycle)
+                self._add_expression(path, expression)
+            except ExpressionError as exc:
+                LOGGER.warning('Ignoring expression of option "{}": {}'.format(path, exc))
+        self._dirty = set(self._expressions)
+        self._invalid = set(self._expressions)
+        self._changed = set()
+
+    def get_expression(self, path):
+        """
+        Returns the expression text that drives the given option
+        :param path: str
+        :return: str or None
+        """
+
+        expression = self._expressions.get(path)
+
+        return expression.text if expression is not None else None
+
+    def get_expressions(self):
+        """
+        Returns the expression texts of all the driven options
+        :return: dict, option path: expression text
+        """
+
+        return dict((path, expression.text) for path, expression in self._expressions.items())
+
+    def set_expression(self, path, text, recompute=True):
+        """
+        Drives the given option with an expression
+        :param path: str
+        :param text: str, Python expression that references options by path
+        :param recompute: bool, whether the option is recomputed immediately
+        :return: dict, new values of the recomputed options whose value changed
+        :raises ExpressionError: if the expression is not valid or creates a dependency cycle
+        """
+
+        expression = Expression(text)
+        cycle = self._find_cycle(path, expression.dependencies)
+        if cycle:
+            raise ExpressionCycleError(cycle)
+
+        self._remove_expression(path)
+        self._add_expression(path, expression)
+        self._store_expressions()
+        self._invalid.add(path)
+        self._mark_dirty([path], include_roots=True)
+
+        return self.recompute() if recompute else dict()
+
+    def remove_expression(self, path):
+        """
+        Removes the expression that drives the given option. Its current value is kept
+        :param path: str
+        :return: bool
+        """
+
+        if path not in self._expressions:
+            return False
+
+        self._remove_expression(path)
+        self._dirty.discard(path)
+        self._invalid.discard(path)
+        self._store_expressions()
+
+        return True
+
+    def get_dependencies(self, path):
+        """
+        Returns the option paths referenced by the expression of the given option
+        :param path: str
+        :return: tuple(str)
+        """
+
+        expression = self._expressions.get(path)
+
+        return expression.dependencies if expression is not None else tuple()
+
+    def get_dependents(self, path, recursive=False):
+        """
+        Returns the options whose expression references the given option
+        :param path: str
+        :param recursive: bool, whether indirect dependents are also returned
+        :return: set(str)
+        """
+
+        if not recursive:
+            return set(self._dependents.get(path, ()))
+
+        return self._get_downstream([path])
+
+    def is_dirty(self, path):
+        """
+        Returns whether the given option must be recomputed
+        :param path: str
+        :return: bool
+        """
+
+        return path in self._dirty
+
+    def get_dirty_paths(self):
+        """
+        Returns the options that must be recomputed
+        :return: set(str)
+        """
+
+        return set(self._dirty)
+
+    def mark_changed(self, paths):
+        """
+        Flags the options that depend on the given ones as dirty
+        :param paths: list(str), paths of the options whose value changed
+        :return: set(str), options flagged as dirty
+        """
+
+        paths = [path for path in paths if path in self._dependents]
+        self._changed.update(paths)
+
+        return self._mark_dirty(paths)
+
+    def invalidate(self, paths=None):
+        """
+        Flags the given driven options (and the ones that depend on them) to be evaluated again even if their drivers
+        did not change
+        :param paths: list(str) or None, if not given, all driven options are invalidated
+        """
+
+        paths = [path for path in (paths if paths is not None else self._expressions) if path in self._expressions]
+        self._invalid.update(paths)
+        self._mark_dirty(paths, include_roots=True)
+
+    def get_evaluation_order(self, paths=None):
+        """
+        Returns the given driven options sorted so each option comes after the options it depends on
+        :param paths: iterable(str) or None, if not given, all driven options are sorted
+        :return: list(str)
+        """
+
+        paths = set(paths if paths is not None else self._expressions)
+        pending = dict((path, sum(1 for dependency in self.get_dependencies(path) if dependency in paths))
+                       for path in paths)
+        ready = deque(sorted(path for path, count in pending.items() if not count))
+        order = list()
+        while ready:
+            path = ready.popleft()
+            order.append(path)
+            for dependent in sorted(self._dependents.get(path, ())):
+                if dependent not in pending:
+                    continue
+                pending[dependent] -= 1
+                if not pending[dependent]:
+                    ready.append(dependent)
+
+        return order
+
+    def recompute(self):
+        """
+        Recomputes the dirty options in topological order. An option is only evaluated if it was invalidated or if
+        one of its drivers changed; options whose value does not change do not propagate. New values are written
+        into the option object as a single batch.
+        :return: dict, new values of the recomputed options whose value changed
+        """
+
+        option_object = self.get_option_object()
+        if not self._dirty or option_object is None:
+            self._changed.clear()
+            return dict()
+
+        changed = set(self._changed)
+        changed_values = dict()
+        with self._writing(option_object):
+            for path in self.get_evaluation_order(self._dirty):
+                expression = self._expressions[path]
+                if path not in self._invalid and not changed.intersection(expression.dependencies):
+                    continue
+                try:
+                    value = _coerce_value(
+                        expression.evaluate(option_object.get_option), option_object.get_option_type(path))
+                except Exception:
+                    LOGGER.error('Error while evaluating expression of option "{}": {}'.format(
+                        path, traceback.format_exc()))
+                    continue
+                if value == option_object.get_option(path):
+                    continue
+                option_object.set_option(path, value)
+                changed.add(path)
+                changed_values[path] = value
+        self._dirty.clear()
+        self._invalid.clear()
+        self._changed.clear()
+
+        if changed_values:
+            self._notify_listeners(changed_values)
+
+        return changed_values
+
+    def _add_expression(self, path, expression):
+        """
+        Internal function that adds the given expression into the graph
+        :param path: str
+        :param expression: Expression
+        """
+
+        self._expressions[path] = expression
+        for dependency in expression.dependencies:
+            self._dependents.setdefault(dependency, set()).add(path)
+
+    def _remove_expression(self, path):
+        """
+        Internal function that removes the expression of the given option from the graph
+        :param path: str
+        """
+
+        expression = self._expressions.pop(path, None)
+        if expression is None:
+            return
+        for dependency in expression.dependencies:
+            dependents = self._dependents.get(dependency)
+            if dependents is None:
+                continue
+            dependents.discard(path)
+            if not dependents:
+                self._dependents.pop(dependency)
+
+    def _find_cycle(self, path, dependencies):
+        """
+        Internal function that returns the dependency cycle that would be created by driving the given option with an
+        expression that references the given options
+        :param path: str
+        :param dependencies: tuple(str)
+        :return: list(str) or None
+        """
+
+        stack = [(dependency, [path, dependency]) for dependency in dependencies]
+        visited = set()
+        while stack:
+            current, chain = stack.pop()
+            if current == path:
+                return chain
+            if current in visited:
+                continue
+            visited.add(current)
+            for dependency in self.get_dependencies(current):
+                stack.append((dependency, chain + [dependency]))
+
+        return None
+
+    def _get_downstream(self, paths):
+        """
+        Internal function that returns all the options that directly or indirectly depend on the given ones
+        :param paths: iterable(str)
+        :return: set(str)
+        """
+
+        downstream = set()
+        queue = deque(paths)
+        while queue:
+            for dependent in self._dependents.get(queue.popleft(), ()):
+                if dependent not in downstream:
+                    downstream.add(dependent)
+                    queue.append(dependent)
+
+        return downstream
+
+    def _mark_dirty(self, paths, include_roots=False):
+        """
+        Internal function that flags the options downstream of the given ones as dirty
+        :param paths: list(str)
+        :param include_roots: bool, whether given options are also flagged
+        :return: set(str), options flagged as dirty
+        """
+
+        dirty = self._get_downstream(paths)
+        if include_roots:
+            dirty.update(path for path in paths if path in self._expressions)
+        self._dirty.update(dirty)
+
+        return dirty
+
+    def _store_expressions(self):
+        """
+        Internal function that stores the expressions into the option object metadata
+        """
+
+        set_metadata = getattr(self.get_option_object(), 'set_metadata', None)
+        if not set_metadata:
+            return
+
+        self._updating = True
+        try:
+            set_metadata(EXPRESSIONS_METADATA_KEY, self.get_expressions())
+        finally:
+            self._updating = False
+
+    @contextlib.contextmanager
+    def _writing(self, option_object):
+        """
+        Internal context manager used while recomputed values are written into the option object. Changes are written
+        as a single batch and are not recorded in the undo history
+        :param option_object: object
+        """
+
+        self._updating = True
+        try:
+            undo_stack = getattr(option_object, 'get_undo_stack', lambda: None)()
+            batch = getattr(option_object, 'batch', None)
+            with _not_recording(undo_stack):
+                if batch:
+                    with batch():
+                        yield
+                else:
+                    yield
+        finally:
+            self._updating = False
+
+    def _notify_listeners(self, changed_values):
+        """
+        Internal function that notifies listeners about recomputed options
+        :param changed_values: dict
+        """
+
+        for listener in list(self._listeners):
+            try:
+                listener(self, changed_values)
+            except Exception:
+                LOGGER.error('Error while notifying expressions changes: {}'.format(traceback.format_exc()))
+
+    def _on_options_changed(self, option_object, paths):
+        """
+        Internal callback function that is called each time options of the option object change
+        :param option_object: object
+        :param paths: list(str) or None
+        """
+
+        if self._updating:
+            return
+
+        if paths is None:
+            self.load()
+        elif not self.mark_changed(paths):
+            return
+
+        self.recompute()
+
+
+class _PathTransformer(ast.NodeTransformer, object):
+    """
+    Internal AST transformer that replaces the option paths of an expression with local names
+    """
+
+    def __init__(self):
+        super(_PathTransformer, self).__init__()
+        self.paths = list()
+        self.names = list()
+
+    def visit_Name(self, node):
+        return self._replace_path(node, node.id) if node.id not in EXPRESSION_SCOPE else node
+
+    def visit_Attribute(self, node):
+        path = _get_attribute_path(node)
+        if path is None or path.split('.', 1)[0] in EXPRESSION_SCOPE:
+            return self.generic_visit(node)
+
+        return self._replace_path(node, path)
+
+    def _replace_path(self, node, path):
+        if not isinstance(node.ctx, ast.Load):
+            raise ExpressionError('Options cannot be assigned in expressions: "{}"'.format(path))
+        if path not in self.paths:
+            self.paths.append(path)
+            self.names.append('_option{}'.format(len(self.names)))
+
+        return ast.copy_location(ast.Name(id=self.names[self.paths.index(path)], ctx=ast.Load()), node)
+
+
+def get_expression_graph(option_object):
+    """
+    Returns the expression graph of the given option object. Graph is built the first time it is requested and shared
+    afterwards
+    :param option_object: object
+    :return: ExpressionGraph
+    """
+
+    try:
+        expression_graph = _GRAPHS.get(option_object)
+    except TypeError:
+        LOGGER.debug('Option object {} cannot share its expression graph'.format(option_object))
+        return ExpressionGraph(option_object)
+
+    if expression_graph is None:
+        expression_graph = _GRAPHS[option_object] = ExpressionGraph(option_object)
+
+    return expression_graph
+
+
+def _check_syntax(tree, text):
+    """
+    Internal function that checks that the given expression tree only uses the allowed syntax. Private names and
+    attributes (such as "__class__") are rejected, so expressions cannot reach objects other than option values and
+    the functions of EXPRESSION_SCOPE
+    :param tree: ast.Expression
+    :param text: str
+    :raises ExpressionError: if the expression uses syntax that is not allowed
+    """
+
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise ExpressionError('Invalid expression "{}": {} is not allowed'.format(text, type(node).__name__))
+        if isinstance(node, ast.Name) and node.id.startswith('_'):
+            raise ExpressionError('Invalid expression "{}": private name "{}" is not allowed'.format(text, node.id))
+        if isinstance(node, ast.Attribute) and node.attr.startswith('_'):
+            raise ExpressionError('Invalid expression "{}": private attribute "{}" is not allowed'.format(
+                text, node.attr))
+        if isinstance(node, ast.Call):
+            path = node.func.id if isinstance(node.func, ast.Name) else _get_attribute_path(node.func)
+            if not path or path.split('.', 1)[0] not in EXPRESSION_SCOPE or getattr(node, 'keywords', None) or \
+                    getattr(node, 'starargs', None) or getattr(node, 'kwargs', None):
+                raise ExpressionError('Invalid expression "{}": only calls to {} are allowed'.format(
+                    text, ', '.join(sorted(name for name, value in EXPRESSION_SCOPE.items() if callable(value)))))
+
+
+def _get_reference(option_object):
+    """
+    Internal function that returns a weak reference to the given option object. Objects that do not support weak
+    references are referenced strongly
+    :param option_object: object or None
+    :return: callable, function that returns the option object
+    """
+
+    try:
+        return weakref.ref(option_object)
+    except TypeError:
+        return lambda: option_object
+
+
+def _get_attribute_path(node):
+    """
+    Internal function that returns the dotted path of an attribute chain such as "arm.ik.enabled"
+    :param node: ast.Attribute
+    :return: str or None, None if the chain is not only made of names
+    """
+
+    names = list()
+    while isinstance(node, ast.Attribute):
+        names.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    names.append(node.id)
+
+    return '.'.join(reversed(names))
+
+
+def _coerce_value(value, option_type):
+    """
+    Internal function that converts an evaluated value into the type of the option it drives
+    :param value: variant
+    :param option_type: str or None
+    :return: variant
+    """
+
+    if option_type == 'integer':
+        return int(round(value))
+    if option_type == 'float':
+        return float(value)
+    if option_type == 'boolean':
+        return bool(value)
+    if option_type in ('string', 'text'):
+        return str(value)
+    if isinstance(value, tuple):
+        return list(value)
+
+    return value
+
+
+@contextlib.contextmanager
+def _not_recording(undo_stack):
+    """
+    Internal context manager that prevents the given undo stack from recording changes
+    :param undo_stack: UndoStack or None
+    """
+
+    if undo_stack is None or undo_stack.is_applying():
+        yield
+        return
+
+    with undo_stack.applying():
+        yield
@@ -10,7 +10,7 @@ from __future__ import print_function, division, absolute_import
 from tpDcc.libs.python import python
 
 from tpDcc.libs.options.options import title, bool, float, integer, list, dictionary, text, directory, file, color
-from tpDcc.libs.options.options import vector3, combo, script
+from tpDcc.libs.options.options import vector3, combo, script, array
 
 
 def add_option(option_type, name=None, value=None, parent=None, main_widget=None, option_object=None):
@@ -39,6 +39,8 @@ def add_option(option_type, name=None, value=None, parent=None, main_widget=None
         new_option = _add_color(name=name, parent=parent, value=value, main_widget=main_widget)
     elif option_type == 'vector3f':
         new_option = _add_vector3_float(name=name, parent=parent, value=value, main_widget=main_widget)
+    elif option_type == 'array':
+        new_option = _add_array(name=name, parent=parent, value=value, main_widget=main_widget)
     elif option_type == 'combo':
         new_option = _add_combo(name=name, parent=parent, value=value, main_widget=main_widget)
     elif option_type == 'script':
@@ -271,6 +273,23 @@ def _add_vector3_float(name='vector3f', value=None, parent=None, main_widget=Non
     return vector_option
 
 
+def _add_array(name='array', value=None, parent=None, main_widget=None):
+    """
+    Adds new numeric array property to the group box
+    :param name: str
+    :param value: dict or list, encoded array or list of numbers or rows of 3 numbers
+    :param parent: QWidget
+    """
+
+    if type(name) == bool:
+        name = 'array'
+
+    array_option = array.ArrayOption(name=name, parent=parent, main_widget=main_widget)
+    array_option.set_value(value)
+
+    return array_option
+
+
 def _add_combo(name='combo', value=None, parent=None, main_widget=None):
     """
     Adds new color property to the group box
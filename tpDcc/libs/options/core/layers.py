@@ -0,0 +1,525 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains layered option stores. A layered store is an option object that resolves each option path
+through an ordered stack of option stores (for example, studio > show > asset > user), where higher layers override
+the values of lower ones.
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import logging
+import traceback
+import contextlib
+from collections import OrderedDict
+
+from tpDcc.libs.options.core import diff, query, scripts
+
+LOGGER = logging.getLogger('tpDcc-libs-options')
+
+
+class LayeredOptionStore(object):
+    def __init__(self, layers=None, active_layer=None):
+        """
+        :param layers: list(tuple(str, OptionStore)) or None, layers ordered from lowest to highest priority
+        :param active_layer: str or None, name of the layer where edits are written. If not given, the highest layer
+            is used
+        """
+
+        self._layers = OrderedDict()
+        self._active_layer = None
+        self._merged = None
+        self._version = 0
+        self._listeners = list()
+        self._index = None
+
+        for name, store in layers or list():
+            self.add_layer(name, store)
+        if active_layer:
+            self.set_active_layer(active_layer)
+
+    def __len__(self):
+        return len(self._get_merged())
+
+    def __contains__(self, name):
+        return name in self._get_merged()
+
+    def __iter__(self):
+        return iter(list(self._get_merged().keys()))
+
+    # =================================================================================================================
+    # LAYERS
+    # =================================================================================================================
+
+    def get_layer_names(self):
+        """
+        Returns the names of the layers ordered from lowest to highest priority
+        :return: list(str)
+        """
+
+        return list(self._layers.keys())
+
+    def get_layer(self, name):
+        """
+        Returns the store of the layer with given name
+        :param name: str
+        :return: OptionStore or None
+        """
+
+        return self._layers.get(name)
+
+    def add_layer(self, name, store):
+        """
+        Adds a new layer on top of the current ones
+        :param name: str
+        :param store: OptionStore
+        """
+
+        if name in self._layers:
+            raise ValueError('Options layer "{}" already exists!'.format(name))
+
+        self._layers[name] = store
+        store.add_listener(self._on_layer_changed)
+        if self._active_layer is None or self._active_layer == self.get_layer_names()[-2]:
+            self._active_layer = name
+        self._invalidate()
+
+    def remove_layer(self, name):
+        """
+        Removes layer with given name
+        :param name: str
+        :return: OptionStore or None, store of the removed layer
+        """
+
+        store = self._layers.pop(name, None)
+        if store is None:
+            return None
+
+        store.remove_listener(self._on_layer_changed)
+        if self._active_layer == name:
+            self._active_layer = self.get_layer_names()[-1] if self._layers else None
+        self._invalidate()
+
+        return store
+
+    def get_active_layer_name(self):
+        """
+        Returns the name of the layer where edits are written
+        :return: str or None
+        """
+
+        return self._active_layer
+
+    def get_active_layer(self):
+        """
+        Returns the store of the layer where edits are written
+        :return: OptionStore or None
+        """
+
+        return self._layers.get(self._active_layer)
+
+    def set_active_layer(self, name):
+        """
+        Sets the layer where edits are written
+        :param name: str
+        """
+
+        if name not in self._layers:
+            raise ValueError('Options layer "{}" does not exist!'.format(name))
+
+        self._active_layer = name
+
+    def get_option_layer(self, name):
+        """
+        Returns the name of the layer the value of the option with given name is resolved from
+        :param name: str
+        :return: str or None
+        """
+
+        item = self._get_merged().get(name)
+
+        return item[2] if item else None
+
+    def get_inherited_option(self, name, default=None):
+        """
+        Returns the value the option with given name would have without the override of the active layer
+        :param name: str
+        :param default: variant
+        :return: variant
+        """
+
+        item = self._resolve(name, self._get_lower_layers())
+
+        return item[0] if item else default
+
+    # =================================================================================================================
+    # OPTION OBJECT INTERFACE
+    # =================================================================================================================
+
+    def get_option_file(self):
+        """
+        Returns file of the active layer
+        :return: str or None
+        """
+
+        store = self.get_active_layer()
+
+        return store.get_option_file() if store else None
+
+    def get_version(self):
+        """
+        Returns a counter that is incremented each time the resolved options change
+        :return: int
+        """
+
+        return self._version
+
+    def add_listener(self, callback):
+        """
+        Adds a function that is called each time resolved options change
+        :param callback: callable, function that receives the layered store and the list of changed paths (None if any
+            option may have changed)
+        """
+
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        """
+        Removes a function added with add_listener
+        :param callback: callable
+        """
+
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def get_index(self):
+        """
+        Returns the index used to query options by path. Index is created the first time it is requested and then
+        updated incrementally each time options change
+        :return: OptionsIndex
+        """
+
+        if self._index is None:
+            self._index = query.OptionsIndex(self)
+
+        return self._index
+
+    def has_options(self):
+        """
+        Returns whether any layer has options or not
+        :return: bool
+        """
+
+        return bool(self._get_merged())
+
+    def get_options(self):
+        """
+        Returns all resolved options in display order with the format used by option lists
+        :return: list
+        """
+
+        options = list()
+        for path, (value, option_type, _) in self._get_merged().items():
+            options.append([path, [value, option_type]] if option_type else [path, value])
+
+        return options
+
+    def get_option(self, name, default=None):
+        """
+        Returns the resolved value of the option with given name
+        :param name: str
+        :param default: variant
+        :return: variant
+        """
+
+        item = self._get_merged().get(name)
+
+        return item[0] if item else default
+
+    def get_option_type(self, name):
+        """
+        Returns the resolved type of the option with given name
+        :param name: str
+        :return: str or None
+        """
+
+        item = self._get_merged().get(name)
+
+        return item[1] if item else None
+
+    def add_option(self, name, value, group=None, option_type=None):
+        """
+        Adds or updates an option in the active layer. If the value matches the inherited one, the override of the
+        active layer is removed instead, so layers only store the values they actually override.
+        :param name: str
+        :param value: variant
+        :param group: str or None
+        :param option_type: str or None
+        """
+
+        store = self._get_active_layer_or_raise()
+        if group:
+            name = '{}.{}'.format(group, name)
+
+        inherited = self._resolve(name, self._get_lower_layers())
+        if inherited is not None and diff.are_values_equal(inherited[0], value) and inherited[1] == option_type:
+            store.remove_option(name)
+            return
+
+        store.add_option(name, value, option_type=option_type)
+
+    def set_option(self, name, value):
+        """
+        Sets the value of an option in the active layer keeping its resolved type
+        :param name: str
+        :param value: variant
+        """
+
+        self.add_option(name, value, option_type=self.get_option_type(name))
+
+    def remove_option(self, name):
+        """
+        Removes the override of the option with given name from the active layer
+        :param name: str
+        :return: bool
+        """
+
+        return self._get_active_layer_or_raise().remove_option(name)
+
+    def clear_options(self):
+        """
+        Removes all the overrides of the active layer
+        """
+
+        self._get_active_layer_or_raise().clear_options()
+
+    def run_code_snippet(self, code_snippet):
+        """
+        Executes given code snippet. Layered store is available in the snippet scope as "options"
+        :param code_snippet: str
+        """
+
+        scripts.run_code_snippet(code_snippet, scripts.get_script_scope(self))
+
+    # =================================================================================================================
+    # PERSISTENCE
+    # =================================================================================================================
+
+    def get_entries(self):
+        """
+        Returns resolved options as backend entries
+        :return: list(tuple(str, object, str))
+        """
+
+        return [(path, value, option_type) for path, (value, option_type, _) in self._get_merged().items()]
+
+    def set_entries(self, entries, metadata=None):
+        """
+        Replaces the overrides of the active layer with the given entries. Entries whose value matches the inherited
+        one are not stored.
+        :param entries: list(tuple(str, object, str))
+        :param metadata: dict or None
+        """
+
+        store = self._get_active_layer_or_raise()
+        lower_layers = self._get_lower_layers()
+        overrides = list()
+        for path, value, option_type in entries:
+            inherited = self._resolve(path, lower_layers)
+            if inherited is None or not diff.are_values_equal(inherited[0], value) or inherited[1] != option_type:
+                overrides.append((path, value, option_type))
+
+        store.set_entries(overrides, metadata)
+
+    def load(self):
+        """
+        Loads the options of all the layers from disk
+        """
+
+        for store in self._layers.values():
+            if store.get_option_file():
+                store.load()
+
+    def is_file_modified(self):
+        """
+        Returns whether the options stored in disk by any of the layers differ from the options in memory
+        :return: bool
+        """
+
+        return any(store.is_file_modified() for store in self._layers.values() if store.get_option_file())
+
+    def save(self):
+        """
+        Saves the options of all the layers into disk
+        """
+
+        for store in self._layers.values():
+            if store.get_option_file():
+                store.save()
+
+    def pending(self):
+        """
+        Returns the number of saves of all the layers that are not written into disk yet
+        :return: int
+        """
+
+        return sum(store.pending() for store in self._layers.values())
+
+    def flush(self, timeout=None):
+        """
+        Blocks until all the saves of all the layers are written into disk
+        :param timeout: float or None
+        :return: bool
+        """
+
+        return all([store.flush(timeout=timeout) for store in self._layers.values()])
+
+    def is_dirty(self):
+        """
+        Returns whether any layer has changes not saved into disk
+        :return: bool
+        """
+
+        return any(store.is_dirty() for store in self._layers.values())
+
+    @contextlib.contextmanager
+    def batch(self, label=None):
+        """
+        Context manager that groups several modifications of the active layer into a single save and a single undo
+        entry
+        :param label: str or None, label of the undo entry
+        """
+
+        with self._get_active_layer_or_raise().batch(label):
+            yield self
+
+    # =================================================================================================================
+    # UNDO
+    # =================================================================================================================
+
+    def get_undo_stack(self):
+        """
+        Returns the undo history of the active layer
+        :return: UndoStack or None
+        """
+
+        return self._get_active_layer_or_raise().get_undo_stack()
+
+    def undo(self):
+        """
+        Reverts the last recorded change of the active layer
+        :return: bool
+        """
+
+        return self._get_active_layer_or_raise().undo()
+
+    def redo(self):
+        """
+        Applies again the last reverted change of the active layer
+        :return: bool
+        """
+
+        return self._get_active_layer_or_raise().redo()
+
+    # =================================================================================================================
+    # INTERNAL
+    # =================================================================================================================
+
+    def _get_active_layer_or_raise(self):
+        """
+        Internal function that returns the store of the active layer
+        :return: OptionStore
+        """
+
+        store = self.get_active_layer()
+        if store is None:
+            raise RuntimeError('Layered options store has no layers!')
+
+        return store
+
+    def _get_lower_layers(self):
+        """
+        Internal function that returns the layers below the active one ordered from highest to lowest priority
+        :return: list(tuple(str, OptionStore))
+        """
+
+        layers = list()
+        for name, store in self._layers.items():
+            if name == self._active_layer:
+                break
+            layers.append((name, store))
+
+        return list(reversed(layers))
+
+    def _resolve(self, path, layers):
+        """
+        Internal function that resolves given path through the given layers
+        :param path: str
+        :param layers: list(tuple(str, OptionStore)), layers ordered from highest to lowest priority
+        :return: tuple(object, str, str) or None, value, option type and name of the layer
+        """
+
+        base_layer = self.get_layer_names()[0] if self._layers else None
+        for name, store in layers:
+            # Only the base layer provides the schema defaults of sparse stores. Upper layers just provide the values
+            # they explicitly override
+            if path in store and (name == base_layer or store.has_stored_option(path)):
+                return store.get_option(path), store.get_option_type(path), name
+
+        return None
+
+    def _get_merged(self):
+        """
+        Internal function that returns the cached resolved options, building them if necessary
+        :return: OrderedDict, path: (value, option type, layer name)
+        """
+
+        if self._merged is not None:
+            return self._merged
+
+        # Options keep the position of the lowest layer that declares them, but take their value from the highest
+        merged = OrderedDict()
+        for index, (name, store) in enumerate(self._layers.items()):
+            for path, value, option_type in store.get_entries(materialize=not index):
+                merged[path] = (value, option_type, name)
+        self._merged = merged
+
+        return merged
+
+    def _invalidate(self, paths=None):
+        """
+        Internal function that invalidates the resolved options of the given paths
+        :param paths: list(str) or None, if not given, all the resolved options are invalidated
+        """
+
+        if paths is not None and self._merged is not None:
+            for path in paths:
+                item = self._resolve(path, reversed(self._layers.items()))
+                if item is None:
+                    self._merged.pop(path, None)
+                elif path in self._merged:
+                    self._merged[path] = item
+                else:
+                    # New options change the display order, so the next read rebuilds the whole merge
+                    self._merged = None
+                    break
+        else:
+            self._merged = None
+
+        self._version += 1
+        for listener in list(self._listeners):
+            try:
+                listener(self, paths)
+            except Exception:
+                LOGGER.error('Error while notifying options changes: {}'.format(traceback.format_exc()))
+
+    def _on_layer_changed(self, store, paths):
+        """
+        Internal callback function that is called each time the options of a layer change
+        :param store: OptionStore
+        :param paths: list(str) or None
+        """
+
+        self._invalidate(paths)
@@ -0,0 +1,30 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tpDcc-libs-options library definition
+"""
+
+from __future__ import print_function, division, absolute_import
+
+from tpDcc.core import library
+
+from tpDcc.libs.options import LIB_ID
+
+
+class OptionsLib(library.DccLibrary, object):
+    def __init__(self, *args, **kwargs):
+        super(OptionsLib, self).__init__(*args, **kwargs)
+
+    @classmethod
+    def config_dict(cls, file_name=None):
+        base_tool_config = library.DccLibrary.config_dict(file_name=file_name)
+        tool_config = {
+            'name': 'Options Library',
+            'id': LIB_ID,
+            'supported_dccs': {'maya': ['2017', '2018', '2019', '2020']},
+            'tooltip': 'Library to easily create data driven options/attributes views.'
+        }
+        base_tool_config.update(tool_config)
+
+        return base_tool_config
@@ -0,0 +1,226 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains a safe parser for list literals.
+Lists and tuples of strings, numbers, booleans and None (such as node selections pasted from a DCC) are parsed with a
+single regular expression scanner, so no code is executed. Parsed texts are cached, so reading the same text again is
+a dictionary lookup.
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import re
+import ast
+import logging
+from collections import OrderedDict
+
+LOGGER = logging.getLogger('tpDcc-libs-options')
+
+# Maximum number of parsed texts kept in cache
+PARSE_CACHE_SIZE = 16
+
+_TOKEN_PATTERN = re.compile(r'''
+    \s+
+    |(?P<open>[\[(])
+    |(?P<close>[\])])
+    |(?P<comma>,)
+    |(?P<string>[uUbBrR]{0,2}(?:'(?:[^'\\\n]|\\.)*'|"(?:[^"\\\n]|\\.)*"))
+    |(?P<number>[-+]?(?:\d+\.?\d*(?:[eE][-+]?\d+)?|\.\d+(?:[eE][-+]?\d+)?)[lL]?)
+    |(?P<name>True|False|None)\b
+    |(?P<invalid>.)
+''', re.VERBOSE | re.DOTALL)
+
+# Flat lists of strings without escape sequences, numbers, booleans and None (the most common case when selections are
+# pasted) are validated with a single match and their items extracted with a single scan
+_FLAT_ITEM = (
+    r'''(?:[uU]?'[^'\\\n]*'|[uU]?"[^"\\\n]*"'''
+    r'''|[-+]?(?:\d+\.?\d*(?:[eE][-+]?\d+)?|\.\d+(?:[eE][-+]?\d+)?)[lL]?'''
+    r'''|True|False|None)''')
+_FLAT_LIST_PATTERN = re.compile(
+    r'\s*\[\s*(?:{0}\s*(?:,\s*{0}\s*)*,?\s*)?\]\s*\Z'.format(_FLAT_ITEM))
+_FLAT_ITEMS_PATTERN = re.compile(r'''[uU]?'([^'\\\n]*)'|[uU]?"([^"\\\n]*)"|([^\s,\[\]()]+)''')
+
+_NAMES = {'True': True, 'False': False, 'None': None}
+_CLOSERS = {'[': ']', '(': ')'}
+
+_PARSE_CACHE = OrderedDict()
+
+
+class LiteralParseError(ValueError):
+    """
+    Exception raised when a text is not a valid list literal
+    """
+
+    def __init__(self, message, position):
+        super(LiteralParseError, self).__init__('{} (at character {})'.format(message, position))
+        self.position = position
+
+
+def parse_list(text):
+    """
+    Parses a list or tuple literal of strings, numbers, booleans and None. Nested lists and tuples are supported.
+    :param text: str
+    :return: list, tuples are returned as lists
+    :raises LiteralParseError: if the text is not a valid literal
+    """
+
+    value = _PARSE_CACHE.pop(text, None)
+    if value is None:
+        value = _parse_flat(text)
+    if value is None:
+        value = _parse(text)
+        if not isinstance(value, (list, tuple)):
+            raise LiteralParseError('Literal is not a list', 0)
+        value = list(value)
+    _PARSE_CACHE[text] = value
+    while len(_PARSE_CACHE) > PARSE_CACHE_SIZE:
+        _PARSE_CACHE.popitem(last=False)
+
+    # Cached lists are copied so callers can modify returned lists
+    return _copy(value)
+
+
+def clear_cache():
+    """
+    Removes all the cached parsed texts
+    """
+
+    _PARSE_CACHE.clear()
+
+
+def _parse_flat(text):
+    """
+    Internal function that parses the given literal if it is a flat list of simple items
+    :param text: str
+    :return: list or None, None if the literal is not a flat list of simple items
+    """
+
+    if not _FLAT_LIST_PATTERN.match(text):
+        return None
+
+    return [_parse_name_or_number(other) if other else single or double
+            for single, double, other in _FLAT_ITEMS_PATTERN.findall(text)]
+
+
+def _parse(text):
+    """
+    Internal function that parses the given literal
+    :param text: str
+    :return: object
+    """
+
+    result = list()
+    stack = list()
+    items = result
+    closer = None
+    expect_value = True
+    has_comma = False
+    for match in _TOKEN_PATTERN.finditer(text):
+        kind = match.lastgroup
+        if kind is None:
+            continue
+        if kind == 'comma':
+            if expect_value or closer is None:
+                raise LiteralParseError('Unexpected ","', match.start())
+            expect_value = True
+            has_comma = True
+            continue
+        if kind == 'close':
+            if match.group() != closer:
+                raise LiteralParseError('Unexpected "{}"'.format(match.group()), match.start())
+            value = items
+            if closer == ')':
+                value = value[0] if len(value) == 1 and not has_comma else tuple(value)
+            items, closer, has_comma = stack.pop()
+            items.append(value)
+            expect_value = False
+            continue
+
+        if not expect_value:
+            raise LiteralParseError('Missing ","', match.start())
+        if kind == 'open':
+            stack.append((items, closer, has_comma))
+            items, closer, has_comma = list(), _CLOSERS[match.group()], False
+            continue
+        if kind == 'string':
+            items.append(_parse_string(match.group(), match.start()))
+        elif kind == 'number':
+            items.append(_parse_number(match.group()))
+        elif kind == 'name':
+            items.append(_NAMES[match.group()])
+        else:
+            raise LiteralParseError('Invalid character "{}"'.format(match.group()), match.start())
+        if closer is None and len(items) > 1:
+            raise LiteralParseError('Unexpected value', match.start())
+        expect_value = False
+
+    if stack:
+        raise LiteralParseError('Missing "{}"'.format(closer), len(text))
+    if not result:
+        raise LiteralParseError('Empty literal', 0)
+
+    return result[0]
+
+
+def _parse_string(token, position):
+    """
+    Internal function that returns the value of a string token
+    :param token: str
+    :param position: int
+    :return: str
+    """
+
+    quote_index = 0
+    while token[quote_index] not in '\'"':
+        quote_index += 1
+    if quote_index == 0 and '\\' not in token:
+        return token[1:-1]
+
+    try:
+        value = ast.literal_eval(token)
+    except (SyntaxError, ValueError) as exc:
+        raise LiteralParseError('Invalid string: {}'.format(exc), position)
+
+    return value.decode('utf-8') if isinstance(value, bytes) and not isinstance(value, str) else value
+
+
+def _parse_name_or_number(token):
+    """
+    Internal function that returns the value of a True, False, None or number token
+    :param token: str
+    :return: object
+    """
+
+    if token in _NAMES:
+        return _NAMES[token]
+
+    return _parse_number(token)
+
+
+def _parse_number(token):
+    """
+    Internal function that returns the value of a number token
+    :param token: str
+    :return: int or float
+    """
+
+    if token[-1] in 'lL':
+        token = token[:-1]
+    try:
+        return int(token)
+    except ValueError:
+        return float(token)
+
+
+def _copy(value):
+    """
+    Internal function that copies the lists and tuples of the given parsed value, so no nested list is shared with
+    the cached value
+    :param value: list or tuple
+    :return: list or tuple
+    """
+
+    items = [_copy(item) if isinstance(item, (list, tuple)) else item for item in value]
+
+    return tuple(items) if isinstance(value, tuple) else items
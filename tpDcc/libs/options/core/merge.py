@@ -0,0 +1,256 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains three-way merge of option sets.
+Values are merged per option path with a merge join over the sorted paths of the three option sets. The order of the
+children of each group is merged separately, so options added by both sides are kept next to their siblings.
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import logging
+from collections import namedtuple, OrderedDict
+
+from tpDcc.libs.options.core import backends, diff
+
+LOGGER = logging.getLogger('tpDcc-libs-options')
+
+# Option edited differently by both sides
+# path: option path
+# base, ours, theirs: tuple(object, str) or None, value and option type of each side (None if option does not exist)
+MergeConflict = namedtuple('MergeConflict', ['path', 'base', 'ours', 'theirs'])
+
+
+class MergeResult(object):
+    """
+    Result of a three-way merge of option sets
+    """
+
+    def __init__(self, entries, conflicts):
+        """
+        :param entries: list(tuple(str, object, str)), merged options in display order
+        :param conflicts: list(MergeConflict)
+        """
+
+        self.entries = entries
+        self.conflicts = conflicts
+
+    def __repr__(self):
+        return 'MergeResult(options={}, conflicts={})'.format(len(self.entries), len(self.conflicts))
+
+    def has_conflicts(self):
+        """
+        Returns whether the merge has conflicts
+        :return: bool
+        """
+
+        return bool(self.conflicts)
+
+    def get_options(self):
+        """
+        Returns merged options with the format used by option objects get_options function
+        :return: list
+        """
+
+        return [[path, [value, option_type]] if option_type else [path, value]
+                for path, value, option_type in self.entries]
+
+
+def merge_options(base_options, our_options, their_options, prefer='ours'):
+    """
+    Merges two option sets with the format returned by option objects get_options function
+    :param base_options: list, options both sides started from
+    :param our_options: list
+    :param their_options: list
+    :param prefer: str, 'ours' or 'theirs', side whose value is used for conflicting options
+    :return: MergeResult
+    """
+
+    return merge_entries(
+        [backends.split_option_value(*option) for option in base_options],
+        [backends.split_option_value(*option) for option in our_options],
+        [backends.split_option_value(*option) for option in their_options],
+        prefer=prefer)
+
+
+def merge_files(base_file, our_file, their_file, prefer='ours'):
+    """
+    Merges the options stored in the given files. Files can be stored with different backends
+    :param base_file: str
+    :param our_file: str
+    :param their_file: str
+    :param prefer: str, 'ours' or 'theirs'
+    :return: MergeResult
+    """
+
+    return merge_entries(*[backends.get_backend(file_path=file_path).read(file_path)[0]
+                           for file_path in (base_file, our_file, their_file)], prefer=prefer)
+
+
+def merge_entries(base_entries, our_entries, their_entries, prefer='ours'):
+    """
+    Merges two lists of option entries that were modified from the same base entries.
+    For each path, a change done by only one side is kept. If both sides modified the same path differently a
+    conflict is recorded and the value of the preferred side is used.
+    :param base_entries: list(tuple(str, object, str))
+    :param our_entries: list(tuple(str, object, str))
+    :param their_entries: list(tuple(str, object, str))
+    :param prefer: str, 'ours' or 'theirs'
+    :return: MergeResult
+    """
+
+    if prefer not in ('ours', 'theirs'):
+        raise ValueError('Invalid merge preference "{}"! Valid values are "ours" and "theirs"'.format(prefer))
+
+    merged_items = dict()
+    conflicts = list()
+    for path, base, ours, theirs in _iterate_joined(base_entries, our_entries, their_entries):
+        if _are_items_equal(ours, theirs):
+            item = ours
+        elif _are_items_equal(base, ours):
+            item = theirs
+        elif _are_items_equal(base, theirs):
+            item = ours
+        else:
+            conflicts.append(MergeConflict(path, base, ours, theirs))
+            item = ours if prefer == 'ours' else theirs
+        if item is not None:
+            merged_items[path] = item
+
+    order = _merge_order(
+        [entry[0] for entry in base_entries], [entry[0] for entry in our_entries],
+        [entry[0] for entry in their_entries], merged_items, prefer)
+
+    return MergeResult([(path,) + tuple(merged_items[path]) for path in order], conflicts)
+
+
+def _iterate_joined(base_entries, our_entries, their_entries):
+    """
+    Internal generator that iterates over the union of the paths of the three entry lists in path order
+    :return: generator(tuple(str, tuple or None, tuple or None, tuple or None)), path and (value, option type) of each
+        side
+    """
+
+    sides = [sorted(entries, key=lambda entry: entry[0]) for entries in (base_entries, our_entries, their_entries)]
+    positions = [0, 0, 0]
+    while True:
+        heads = [side[position] if position < len(side) else None for side, position in zip(sides, positions)]
+        paths = [head[0] for head in heads if head is not None]
+        if not paths:
+            return
+        path = min(paths)
+        items = list()
+        for index, head in enumerate(heads):
+            if head is not None and head[0] == path:
+                items.append((head[1], head[2]))
+                positions[index] += 1
+            else:
+                items.append(None)
+        yield (path,) + tuple(items)
+
+
+def _are_items_equal(item, other_item):
+    """
+    Internal function that returns whether both (value, option type) items are equal
+    :param item: tuple(object, str) or None
+    :param other_item: tuple(object, str) or None
+    :return: bool
+    """
+
+    if item is None or other_item is None:
+        return item is other_item
+
+    return item[1] == other_item[1] and diff.are_values_equal(item[0], other_item[0])
+
+
+def _merge_order(base_paths, our_paths, their_paths, merged_items, prefer):
+    """
+    Internal function that merges the order of the options. Children of each group are merged independently: if only
+    one side reordered them, its order is used; otherwise the preferred side order is used. Options added by the other
+    side are inserted after the sibling that precedes them in that side.
+    :return: list(str), merged paths in display order
+    """
+
+    base_children = _get_children(base_paths)
+    our_children = _get_children(our_paths)
+    their_children = _get_children(their_paths)
+
+    merged_children = dict()
+    for parent in set(our_children) | set(their_children):
+        base_order = base_children.get(parent, list())
+        ours = our_children.get(parent, list())
+        theirs = their_children.get(parent, list())
+        if _is_same_order(base_order, ours):
+            skeleton, other = theirs, ours
+        elif _is_same_order(base_order, theirs) or prefer == 'ours':
+            skeleton, other = ours, theirs
+        else:
+            skeleton, other = theirs, ours
+
+        children = list(skeleton)
+        positions = dict((path, index) for index, path in enumerate(children))
+        insert_after = dict()
+        previous = None
+        for path in other:
+            if path not in positions:
+                insert_after.setdefault(previous, list()).append(path)
+            else:
+                previous = path
+        if insert_after:
+            ordered = insert_after.get(None, list())
+            for path in children:
+                ordered.append(path)
+                ordered.extend(insert_after.get(path, list()))
+            children = ordered
+        merged_children[parent] = [path for path in children if path in merged_items]
+
+    order = list()
+    stack = [iter(merged_children.get('', list()))]
+    while stack:
+        path = next(stack[-1], None)
+        if path is None:
+            stack.pop()
+            continue
+        order.append(path)
+        if path.endswith('.'):
+            stack.append(iter(merged_children.get(path, list())))
+
+    # Options whose group was removed are kept at the end so no merged value is lost
+    if len(order) != len(merged_items):
+        ordered_paths = set(order)
+        for path in our_paths + their_paths:
+            if path in merged_items and path not in ordered_paths:
+                ordered_paths.add(path)
+                order.append(path)
+
+    return order
+
+
+def _get_children(paths):
+    """
+    Internal function that returns the children of each group in display order
+    :param paths: list(str)
+    :return: OrderedDict, group path ('' for root options): list of children paths
+    """
+
+    children = OrderedDict()
+    for path in paths:
+        parent = path[:-1].rpartition('.')[0] if path.endswith('.') else path.rpartition('.')[0]
+        children.setdefault(parent + '.' if parent else '', list()).append(path)
+
+    return children
+
+
+def _is_same_order(base_paths, paths):
+    """
+    Internal function that returns whether the paths that exist in both lists have the same relative order
+    :param base_paths: list(str)
+    :param paths: list(str)
+    :return: bool
+    """
+
+    path_set = set(paths)
+    base_set = set(base_paths)
+
+    return [path for path in base_paths if path in path_set] == [path for path in paths if path in base_set]
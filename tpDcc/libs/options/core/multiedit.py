@@ -0,0 +1,152 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains edition of several numeric options at once.
+The values of all the edited options are flattened into a single array, so absolute, relative and scaled changes are
+applied with one vectorized operation (NumPy is used when available) and written into the option object as a single
+batch.
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import array
+import logging
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+LOGGER = logging.getLogger('tpDcc-libs-options')
+
+# Option types that can be edited together, with the number of components of their values
+NUMERIC_TYPES = {'float': 1, 'integer': 1, 'vector3f': 3}
+
+
+class EditMode(object):
+    ABSOLUTE = 'absolute'
+    RELATIVE = 'relative'
+    SCALE = 'scale'
+
+
+def is_numeric_type(option_type):
+    """
+    Returns whether options of the given type can be edited together
+    :param option_type: str
+    :return: bool
+    """
+
+    return option_type in NUMERIC_TYPES
+
+
+def apply_numeric_edit(values, option_types, mode, amount):
+    """
+    Returns the given numeric values with the given edit applied to all their components
+    :param values: list(float or int or list(float)), values of the options
+    :param option_types: list(str), option types of the values
+    :param mode: str, EditMode value
+    :param amount: float, new value (ABSOLUTE), offset (RELATIVE) or factor (SCALE)
+    :return: list(float or int or list(float)), new values, in the same order and with the same shape
+    """
+
+    if mode not in (EditMode.ABSOLUTE, EditMode.RELATIVE, EditMode.SCALE):
+        raise ValueError('Invalid edit mode: "{}"'.format(mode))
+
+    components = list()
+    for value, option_type in zip(values, option_types):
+        if NUMERIC_TYPES[option_type] == 1:
+            components.append(value or 0)
+        else:
+            components.extend(value if value is not None else [0.0] * NUMERIC_TYPES[option_type])
+
+    result = _apply(components, mode, amount)
+
+    new_values = list()
+    index = 0
+    for option_type in option_types:
+        size = NUMERIC_TYPES[option_type]
+        if size == 1:
+            new_value = float(result[index])
+            new_values.append(int(round(new_value)) if option_type == 'integer' else new_value)
+        else:
+            new_values.append([float(component) for component in result[index:index + size]])
+        index += size
+
+    return new_values
+
+
+def edit_numeric_options(option_object, paths, mode, amount, label=None):
+    """
+    Applies the given edit to the numeric options with the given paths. All the options are written inside a single
+    batch, so the option object saves them once and records a single undo entry (when it supports batches).
+    :param option_object: object, option object that stores the options
+    :param paths: list(str), paths of the options to edit. Paths of non numeric options are ignored
+    :param mode: str, EditMode value
+    :param amount: float, new value (ABSOLUTE), offset (RELATIVE) or factor (SCALE)
+    :param label: str or None, label of the undo entry
+    :return: dict, option path: new value of the edited options
+    """
+
+    paths = [path for path in paths if is_numeric_type(option_object.get_option_type(path))]
+    if not paths:
+        return dict()
+
+    option_types = [option_object.get_option_type(path) for path in paths]
+    values = [option_object.get_option(path) for path in paths]
+    new_values = apply_numeric_edit(values, option_types, mode, amount)
+    changed_values = dict(
+        (path, new_value) for path, value, new_value in zip(paths, values, new_values)
+        if _normalize_value(value) != new_value)
+    if not changed_values:
+        return changed_values
+
+    batch = getattr(option_object, 'batch', None)
+    if batch:
+        with batch(label or 'Edit {} options'.format(len(changed_values))):
+            for path in paths:
+                if path in changed_values:
+                    option_object.set_option(path, changed_values[path])
+    else:
+        for path in paths:
+            if path in changed_values:
+                option_object.set_option(path, changed_values[path])
+
+    return changed_values
+
+
+def _normalize_value(value):
+    """
+    Internal function that returns the given option value with the shape of the edited values. Option objects can
+    return vectors as tuples, which never compare equal to the edited lists
+    :param value: float or int or list(float) or tuple(float) or None
+    :return: float or int or list(float) or None
+    """
+
+    return list(value) if isinstance(value, (list, tuple)) else value
+
+
+def _apply(components, mode, amount):
+    """
+    Internal function that applies the given edit to a flat sequence of numbers
+    :param components: list(float)
+    :param mode: str, EditMode value
+    :param amount: float
+    :return: sequence(float)
+    """
+
+    if numpy is not None:
+        values = numpy.asarray(components, dtype=numpy.float64)
+        if mode == EditMode.ABSOLUTE:
+            return numpy.full_like(values, amount)
+        if mode == EditMode.RELATIVE:
+            return values + amount
+        return values * amount
+
+    values = array.array('d', components)
+    if mode == EditMode.ABSOLUTE:
+        return array.array('d', [amount]) * len(values)
+    if mode == EditMode.RELATIVE:
+        return array.array('d', [value + amount for value in values])
+
+    return array.array('d', [value * amount for value in values])
@@ -9,6 +9,7 @@ from __future__ import print_function, division, absolute_import
 
 import logging
 import traceback
+import contextlib
 from functools import partial
 
 from Qt.QtCore import Qt, Signal, QPoint, QRect
@@ -17,11 +18,11 @@ from Qt.QtGui import QColor, QPalette, QPainter, QPen, QBrush, QPolygon
 
 from tpDcc import dcc
 from tpDcc.managers import resources
-from tpDcc.libs.python import python, name as name_utils
+from tpDcc.libs.python import name as name_utils
 from tpDcc.libs.qt.core import qtutils
 from tpDcc.libs.qt.widgets import layouts, messagebox
 
-from tpDcc.libs.options.core import factory
+from tpDcc.libs.options.core import factory, decoder
 
 LOGGER = logging.getLogger('tpDcc-libs-options')
 
@@ -37,8 +38,23 @@ class OptionList(QGroupBox, object):
     editModeChanged = Signal(bool)
     valueChanged = Signal()
 
+    # Background color of the widgets of the options that differ from a reference, by diff status
+    DIFF_COLORS = {
+        'added': QColor(70, 140, 70),
+        'changed': QColor(180, 135, 45),
+        'retyped': QColor(160, 80, 160),
+        'moved': QColor(70, 115, 180),
+        'conflict': QColor(185, 60, 60)
+    }
+
     FACTORY_CLASS = factory
 
+    # Option types whose widgets can be updated in place with set_value (list, dictionary and combo widgets append the
+    # given values to the existing ones, so those need to be rebuilt)
+    INCREMENTAL_UPDATE_TYPES = (
+        'group', 'boolean', 'float', 'integer', 'string', 'text', 'directory', 'file', 'nonedittext', 'color',
+        'vector3f', 'script', 'array')
+
     def __init__(self, parent=None, option_object=None):
         super(OptionList, self).__init__(parent)
         self._option_object = option_object
@@ -98,19 +114,103 @@ class OptionList(QGroupBox, object):
 
         self._option_object = option_object
 
-    def update_options(self):
+    def update_options(self, options=None):
         """
         Updates current widget options
+        :param options: list or None, options to load. If not given, options are retrieved from the option object
         """
 
         if not self._option_object:
             LOGGER.warning('Impossible to update options because option object is not defined!')
             return
 
-        options = self._option_object.get_options()
+        if options is None:
+            options = self._option_object.get_options()
 
         self._load_widgets(options)
 
+    def apply_option_changes(self, changed_values, removed_paths=None):
+        """
+        Updates the current widgets in place with the given option changes without writing them back into the option
+        object.
+        :param changed_values: dict, option path: new value
+        :param removed_paths: list(str) or None, paths of the options to remove
+        :return: bool, False if some change cannot be applied in place and options must be fully reloaded
+        """
+
+        changed_widgets = list()
+        for path, value in changed_values.items():
+            widget = self.find_option_widget(path)
+            if not widget or widget.get_option_type() not in self.INCREMENTAL_UPDATE_TYPES:
+                return False
+            changed_widgets.append((widget, path, value))
+
+        self._supress_update = True
+        try:
+            for path in removed_paths or list():
+                widget = self.find_option_widget(path)
+                if not widget:
+                    continue
+                if widget in self._parent._current_widgets:
+                    self.deselect_widget(widget)
+                parent = widget.get_parent() or widget.parent()
+                parent.child_layout.removeWidget(widget)
+                widget.deleteLater()
+            for widget, path, value in changed_widgets:
+                self._set_widget_value(widget, value)
+                self._update_option_source(widget, path)
+        finally:
+            self._supress_update = False
+
+        return True
+
+    def find_option_widget(self, path):
+        """
+        Returns the widget of the option with given path
+        :param path: str, option path (group paths end with a dot)
+        :return: Option or OptionListGroup or None
+        """
+
+        path = path[:-1] if path.endswith('.') else path
+        if not path:
+            return None
+
+        return self._find_group_widget(path)
+
+    def get_option_widgets(self):
+        """
+        Returns all the option widgets of the list in display order
+        :return: list(tuple(str, Option or OptionListGroup)), option path and widget
+        """
+
+        return self._get_option_widgets(self._find_list(self))
+
+    def get_path(self, widget):
+        """
+        Returns the option path of the given option widget
+        :param widget: Option or OptionListGroup
+        :return: str
+        """
+
+        return self._get_path(widget)
+
+    def highlight_widget(self, widget, status=None):
+        """
+        Paints the background of the given widget with the color of the given diff status
+        :param widget: Option or OptionListGroup
+        :param status: str or None, diff status. If None, widget highlight is removed
+        """
+
+        color = self.DIFF_COLORS.get(status)
+        if color is None:
+            self._unfill_background(widget)
+            return
+
+        palette = widget.palette()
+        palette.setColor(widget.backgroundRole(), color)
+        widget.setAutoFillBackground(True)
+        widget.setPalette(palette)
+
     def get_parent(self):
         """
         Returns parent Option
@@ -144,6 +244,7 @@ class OptionList(QGroupBox, object):
         self._option_group_class.FACTORY_CLASS = self.FACTORY_CLASS
         group = self._option_group_class(name=name, option_object=option_object, parent=self._parent)
         self._create_group_context_menu(group, group._context_menu)
+        group.valueChanged.connect(self.valueChanged)
         group.set_expanded(value)
         if self.__class__.__name__.endswith('OptionListGroup') or parent.__class__.__name__.endswith('OptionListGroup'):
             if dcc.is_maya():
@@ -335,6 +436,8 @@ class OptionList(QGroupBox, object):
             create_menu.addAction(add_color_action)
             add_vector3f_action = QAction(color_icon, 'Add Vector 3 float', create_menu)
             create_menu.addAction(add_vector3f_action)
+            add_array_action = QAction(list_icon, 'Add Numeric Array', create_menu)
+            create_menu.addAction(add_array_action)
             menu.addSeparator()
             parent.copy_action = QAction(copy_icon, 'Copy', menu)
             menu.addAction(parent.copy_action)
@@ -358,6 +461,7 @@ class OptionList(QGroupBox, object):
             add_title_action.triggered.connect(partial(parent._add_option, 'title'))
             add_color_action.triggered.connect(partial(parent._add_option, 'color'))
             add_vector3f_action.triggered.connect(partial(parent._add_option, 'vector3f'))
+            add_array_action.triggered.connect(partial(parent._add_option, 'array'))
             add_script_action.triggered.connect(partial(parent._add_option, 'script'))
             clear_action.triggered.connect(parent._clear_action)
 
@@ -522,71 +626,27 @@ class OptionList(QGroupBox, object):
         self._disable_auto_expand = True
         self._auto_rename = False
 
-        try:
-            for option in options:
-                option_type = None
-                if type(option[1]) == list:
-                    if option[0] == 'list':
-                        value = option[1]
-                        option_type = 'list'
-                    else:
-                        value = option[1][0]
-                        option_type = option[1][1]
-                    # value = option[1][0]
-                    # option_type = option[1][1]
-                else:
-                    value = option[1]
+        # Groups created while loading, by path. Avoids walking the widget tree to find the parent of each option
+        groups = dict()
 
-                split_name = option[0].split('.')
-                if split_name[-1] == '':
-                    search_group = '.'.join(split_name[:-2])
-                    name = split_name[-2]
-                else:
-                    search_group = '.'.join(split_name[:-1])
-                    name = split_name[-1]
-
-                widget = self._find_group_widget(search_group)
-                if not widget:
-                    widget = self
-
-                is_group = False
-                if split_name[-1] == '':
-                    is_group = True
-                    parent_name = '.'.join(split_name[:-1])
-                    group = self._find_group_widget(parent_name)
-                    if not group:
-                        self.add_group(name, value, widget)
-
-                if len(split_name) > 1 and split_name[-1] != '':
-                    search_group = '.'.join(split_name[:-2])
-                    after_search_group = '.'.join(split_name[:-1])
-                    group_name = split_name[-2]
-                    group_widget = self._find_group_widget(search_group)
-                    widget = self._find_group_widget(after_search_group)
-                    if not widget:
-                        self.add_group(group_name, value, group_widget)
-                        widget = self._find_group_widget(after_search_group)
-
-                if not is_group:
-                    if not option_type:
-                        if python.is_string(value):
-                            option_type = 'string'
-                        elif type(value) == float:
-                            option_type = 'float'
-                        elif type(option[1]) == int:
-                            option_type = 'integer'
-                        elif type(option[1]) == bool:
-                            option_type = 'boolean'
-                        elif type(option[1]) == dict:
-                            option_type = 'dictionary'
-                        elif type(option[1]) == list:
-                            option_type = 'list'
-                        elif option[1] is None:
-                            option_type = 'title'
-
-                    new_option = self._add_custom_option(option_type, name, value, widget)
-                    if not new_option:
-                        self._add_option(option_type, name, value, widget)
+        try:
+            for record in decoder.decode_options(options):
+                parent = record.parent
+                if record.is_group:
+                    if record.path[:-1] not in groups:
+                        groups[record.path[:-1]] = self.add_group(record.name, record.value, groups.get(parent))
+                    continue
+
+                widget = groups.get(parent)
+                if parent and widget is None:
+                    grand_parent, _, group_name = parent.rpartition('.')
+                    widget = groups[parent] = self.add_group(group_name, record.value, groups.get(grand_parent))
+
+                widget = widget or self
+                new_option = self._add_custom_option(record.option_type, record.name, record.value, widget)
+                if not new_option:
+                    new_option = self._add_option(record.option_type, record.name, record.value, widget)
+                self._update_option_source(new_option, record.path)
 
         except Exception:
             LOGGER.error(traceback.format_exc())
@@ -686,14 +746,16 @@ class OptionList(QGroupBox, object):
         if clear:
             self._write_all()
         else:
-            item_count = self.child_layout.count()
-            for i in range(0, item_count):
-                item = self.child_layout.itemAt(i)
-                widget = item.widget()
-                widget_type = widget.get_option_type()
-                name = self._get_path(widget)
-                value = widget.get_value()
-                self._option_object.add_option(name, value, None, widget_type)
+            with self.batch_writes():
+                item_count = self.child_layout.count()
+                for i in range(0, item_count):
+                    item = self.child_layout.itemAt(i)
+                    widget = item.widget()
+                    widget_type = widget.get_option_type()
+                    name = self._get_path(widget)
+                    value = widget.get_value()
+                    self._option_object.add_option(name, value, None, widget_type)
+                    self._update_option_source(widget, name)
 
         self.valueChanged.emit()
 
@@ -715,6 +777,7 @@ class OptionList(QGroupBox, object):
                 value = sub_widget.get_value()
 
                 self._option_object.add_option(name, value, None, sub_widget_type)
+                self._update_option_source(sub_widget, name)
 
                 if hasattr(sub_widget, 'child_layout'):
                     self._write_widget_options(sub_widget)
@@ -725,10 +788,90 @@ class OptionList(QGroupBox, object):
             LOGGER.warning('Impossible to write options because option object is not defined!')
             return
 
-        self._option_object.clear_options()
-
         options_list = self._find_list(self)
-        self._write_widget_options(options_list)
+        with self.batch_writes():
+            if not hasattr(self._option_object, 'set_entries'):
+                self._option_object.clear_options()
+                self._write_widget_options(options_list)
+                return
+            # Option stores compare the new options with the current ones, so only the options that actually changed
+            # are recorded and saved
+            option_widgets = self._get_option_widgets(options_list)
+            self._option_object.set_entries(
+                [(path, widget.get_value(), widget.get_option_type()) for path, widget in option_widgets])
+            for path, widget in option_widgets:
+                self._update_option_source(widget, path)
+
+    @contextlib.contextmanager
+    def batch_writes(self, label=None):
+        """
+        Context manager that groups all the writes done inside it into a single save and a single undo entry when the
+        option object supports it (for example, OptionStore)
+        :param label: str or None, label of the undo entry
+        """
+
+        batch = getattr(self._option_object, 'batch', None)
+        if not batch:
+            yield
+            return
+
+        with batch(label):
+            yield
+
+    def _get_option_widgets(self, widget, option_widgets=None):
+        """
+        Internal function that returns all the option widgets below the given one in display order
+        :param widget: OptionList or OptionListGroup
+        :param option_widgets: list or None, list where widgets are appended
+        :return: list(tuple(str, Option or OptionListGroup)), option path and widget
+        """
+
+        option_widgets = option_widgets if option_widgets is not None else list()
+        for i in range(widget.child_layout.count()):
+            item = widget.child_layout.itemAt(i)
+            if not item:
+                continue
+            sub_widget = item.widget()
+            option_widgets.append((self._get_path(sub_widget), sub_widget))
+            if hasattr(sub_widget, 'child_layout'):
+                self._get_option_widgets(sub_widget, option_widgets)
+
+        return option_widgets
+
+    def _update_option_source(self, widget, path):
+        """
+        Internal function that shows in the tooltip of the given widget the layer its value is resolved from, if the
+        option object is layered (for example, LayeredOptionStore)
+        :param widget: Option or None
+        :param path: str
+        """
+
+        get_option_layer = getattr(self._option_object, 'get_option_layer', None)
+        if not widget or not get_option_layer or hasattr(widget, 'child_layout'):
+            return
+
+        layer_name = get_option_layer(path)
+        widget.setToolTip('Value from "{}" layer'.format(layer_name) if layer_name else '')
+
+    def _set_widget_value(self, widget, value):
+        """
+        Internal function that sets the value of the given widget without notifying the change
+        :param widget: Option or OptionListGroup
+        :param value: variant
+        """
+
+        if hasattr(widget, 'set_expanded'):
+            widget.set_expanded(value)
+            return
+
+        option_widget = getattr(widget, '_option_widget', None)
+        if option_widget:
+            option_widget.blockSignals(True)
+        try:
+            widget.set_value(value)
+        finally:
+            if option_widget:
+                option_widget.blockSignals(False)
 
     def _fill_background(self, widget):
         """
@@ -0,0 +1,495 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains asynchronous validation and completion of the paths stored in file and directory options.
+Paths are checked by a small pool of background threads, so slow network mounts never block the DCC UI thread.
+Results are kept in a stat cache shared by all path options, so a path is only checked again once its entry expires.
+Directory listings used to complete paths are read by a background crawler and kept in memory until the modification
+time of their directory changes.
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import os
+import stat
+import time
+import bisect
+import logging
+import threading
+import traceback
+from collections import OrderedDict
+
+LOGGER = logging.getLogger('tpDcc-libs-options')
+
+# Seconds that stat results are cached
+STAT_CACHE_TTL = 10.0
+
+# Number of threads used to validate paths
+VALIDATOR_THREADS = 4
+
+# Maximum number of directory listings kept in memory
+DIRECTORY_CACHE_SIZE = 512
+
+# Maximum number of completions returned by default
+MAX_COMPLETIONS = 100
+
+_VALIDATOR = None
+_DIRECTORY_INDEX = None
+
+
+class PathKind(object):
+    ANY = 'any'
+    FILE = 'file'
+    DIRECTORY = 'directory'
+
+
+class PathStatus(object):
+    EMPTY = 'empty'
+    VALID = 'valid'
+    MISSING = 'missing'
+    WRONG_KIND = 'wrong_kind'
+
+
+class StatCache(object):
+    """
+    Thread safe cache of stat results whose entries expire after a given number of seconds.
+    Entries are kept in the order they were stored, so expired entries are always the oldest ones and are removed
+    every time a new result is stored.
+    """
+
+    def __init__(self, ttl=STAT_CACHE_TTL):
+        """
+        :param ttl: float, seconds that results are kept
+        """
+
+        self._ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, path):
+        """
+        Returns the cached stat result of the given path
+        :param path: str
+        :return: tuple(bool, os.stat_result or None), whether a fresh result is cached and the result (None if path
+            does not exist)
+        """
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None:
+                return False, None
+            if time.time() - entry[0] > self._ttl:
+                del self._entries[path]
+                return False, None
+
+        return True, entry[1]
+
+    def stat(self, path):
+        """
+        Returns the stat result of the given path, using the cached one if it did not expire
+        :param path: str
+        :return: os.stat_result or None, None if path does not exist
+        """
+
+        found, result = self.get(path)
+        if found:
+            return result
+
+        try:
+            result = os.stat(path)
+        except (OSError, IOError, ValueError):
+            result = None
+        with self._lock:
+            self._evict()
+            self._entries.pop(path, None)
+            self._entries[path] = (time.time(), result)
+
+        return result
+
+    def invalidate(self, path=None):
+        """
+        Removes cached results
+        :param path: str or None, if not given, all results are removed
+        """
+
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(path, None)
+
+    def _evict(self):
+        """
+        Internal function that removes expired entries. Must be called with the lock acquired
+        """
+
+        expire_time = time.time() - self._ttl
+        while self._entries:
+            path, (entry_time, _) = next(iter(self._entries.items()))
+            if entry_time >= expire_time:
+                break
+            del self._entries[path]
+
+
+class PathValidator(object):
+    """
+    Validates paths in a pool of background threads. Requests of the same path are coalesced, so a path shared by many
+    options is only checked once.
+    """
+
+    def __init__(self, thread_count=VALIDATOR_THREADS, ttl=STAT_CACHE_TTL):
+        """
+        :param thread_count: int, number of threads of the pool
+        :param ttl: float, seconds that stat results are cached
+        """
+
+        self._thread_count = thread_count
+        self._cache = StatCache(ttl)
+        self._condition = threading.Condition()
+        self._jobs = OrderedDict()
+        self._threads = list()
+
+    def get_cache(self):
+        """
+        Returns the stat cache used by the validator
+        :return: StatCache
+        """
+
+        return self._cache
+
+    def pending(self):
+        """
+        Returns the number of paths waiting to be checked
+        :return: int
+        """
+
+        with self._condition:
+            return len(self._jobs)
+
+    def validate(self, path, kind=PathKind.ANY, callback=None, force=False):
+        """
+        Validates given path. If a fresh result is cached, callback is called immediately from the caller thread;
+        otherwise, it is called from a worker thread once the path is checked.
+        :param path: str
+        :param kind: str, PathKind value
+        :param callback: callable or None, called with the path and its PathStatus
+        :param force: bool, whether to ignore the cached result
+        :return: str or None, PathStatus if it was available without checking the path; None otherwise
+        """
+
+        if not path:
+            if callback:
+                callback(path, PathStatus.EMPTY)
+            return PathStatus.EMPTY
+
+        if force:
+            self._cache.invalidate(path)
+        else:
+            found, result = self._cache.get(path)
+            if found:
+                status = get_path_status(result, kind)
+                if callback:
+                    callback(path, status)
+                return status
+
+        with self._condition:
+            callbacks = self._jobs.get(path)
+            if callbacks is None:
+                callbacks = self._jobs[path] = list()
+            if callback:
+                callbacks.append((kind, callback))
+            self._ensure_threads()
+            self._condition.notify()
+
+        return None
+
+    def _ensure_threads(self):
+        self._threads = [thread for thread in self._threads if thread.is_alive()]
+        while len(self._threads) < min(self._thread_count, len(self._jobs)):
+            thread = threading.Thread(target=self._run, name='tpDcc-libs-options-paths')
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._jobs:
+                    self._condition.wait()
+                path, callbacks = self._jobs.popitem(last=False)
+
+            result = self._cache.stat(path)
+            for kind, callback in callbacks:
+                try:
+                    callback(path, get_path_status(result, kind))
+                except Exception:
+                    LOGGER.error('Error while notifying validation of path "{}": {}'.format(
+                        path, traceback.format_exc()))
+
+
+class DirectoryListing(object):
+    """
+    Cached entries of a directory
+    """
+
+    __slots__ = ('mtime', 'names', 'keys', 'directories')
+
+    def __init__(self, mtime, names, directories):
+        """
+        :param mtime: float, modification time of the directory when it was listed
+        :param names: list(str), entry names
+        :param directories: set(str), names of the entries that are directories
+        """
+
+        self.mtime = mtime
+        self.names = sorted(names, key=lambda name: name.lower())
+        self.keys = [name.lower() for name in self.names]
+        self.directories = directories
+
+
+class DirectoryIndex(object):
+    """
+    In-memory index of directory listings used to complete paths. Listings are read by a background thread and
+    completions are always served from memory: completing a path whose directory was not listed yet returns no
+    results and calls the given callback once the directory is listed.
+    """
+
+    def __init__(self, max_directories=DIRECTORY_CACHE_SIZE):
+        """
+        :param max_directories: int, maximum number of cached directory listings
+        """
+
+        self._max_directories = max_directories
+        self._listings = OrderedDict()
+        self._lock = threading.Lock()
+        self._condition = threading.Condition()
+        self._jobs = OrderedDict()
+        self._thread = None
+
+    def __len__(self):
+        return len(self._listings)
+
+    def get_listing(self, directory):
+        """
+        Returns the cached listing of the given directory
+        :param directory: str
+        :return: DirectoryListing or None
+        """
+
+        with self._lock:
+            listing = self._listings.pop(directory, None)
+            if listing is not None:
+                self._listings[directory] = listing
+
+        return listing
+
+    def invalidate(self, directory=None):
+        """
+        Removes cached listings
+        :param directory: str or None, if not given, all listings are removed
+        """
+
+        with self._lock:
+            if directory is None:
+                self._listings.clear()
+            else:
+                self._listings.pop(directory, None)
+
+    def crawl(self, root, depth=1):
+        """
+        Lists given directory and its subdirectories in background
+        :param root: str
+        :param depth: int, number of subdirectory levels to list
+        """
+
+        if root:
+            self._queue(root, depth, None)
+
+    def complete(self, text, kind=PathKind.ANY, callback=None, limit=MAX_COMPLETIONS):
+        """
+        Returns the cached paths that start with the given text (case insensitive). The directory of the text is
+        listed again in background; if its entries changed, callback is called with the new completions.
+        :param text: str, path being typed
+        :param kind: str, PathKind value. If DIRECTORY, only directories are completed
+        :param callback: callable or None, called from the background thread with the text and its new completions
+        :param limit: int, maximum number of completions
+        :return: list(str)
+        """
+
+        directory, partial = os.path.split(text)
+        if not directory:
+            return list()
+
+        def _on_listed(listing):
+            if callback:
+                callback(text, _get_completions(directory, listing, partial, kind, limit))
+
+        self._queue(directory, 0, _on_listed)
+        listing = self.get_listing(directory)
+
+        return _get_completions(directory, listing, partial, kind, limit) if listing is not None else list()
+
+    def _queue(self, directory, depth, callback):
+        with self._condition:
+            job = self._jobs.get(directory)
+            if job is None:
+                job = self._jobs[directory] = [depth, list()]
+            job[0] = max(job[0], depth)
+            if callback:
+                job[1].append(callback)
+            if not self._thread or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='tpDcc-libs-options-directories')
+                self._thread.daemon = True
+                self._thread.start()
+            self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._jobs:
+                    self._condition.wait()
+                directory, (depth, callbacks) = self._jobs.popitem(last=False)
+
+            try:
+                listing, changed = self._update_listing(directory)
+            except Exception:
+                LOGGER.error('Error while listing directory "{}": {}'.format(directory, traceback.format_exc()))
+                continue
+            if listing is None:
+                continue
+
+            if changed:
+                for callback in callbacks:
+                    try:
+                        callback(listing)
+                    except Exception:
+                        LOGGER.error('Error while notifying directory listing: {}'.format(traceback.format_exc()))
+            if depth > 0:
+                for name in listing.directories:
+                    self._queue(os.path.join(directory, name), depth - 1, None)
+
+    def _update_listing(self, directory):
+        """
+        Internal function that lists the given directory if it was modified since it was cached
+        :param directory: str
+        :return: tuple(DirectoryListing or None, bool), listing (None if the directory does not exist) and whether
+            it changed
+        """
+
+        try:
+            mtime = os.stat(directory).st_mtime
+        except (OSError, IOError, ValueError):
+            self.invalidate(directory)
+            return None, False
+
+        listing = self.get_listing(directory)
+        if listing is not None and listing.mtime == mtime:
+            return listing, False
+
+        names, directories = _list_directory(directory)
+        listing = DirectoryListing(mtime, names, directories)
+        with self._lock:
+            self._listings.pop(directory, None)
+            self._listings[directory] = listing
+            while len(self._listings) > self._max_directories:
+                self._listings.popitem(last=False)
+
+        return listing, True
+
+
+def get_path_status(stat_result, kind=PathKind.ANY):
+    """
+    Returns the status of a path from its stat result
+    :param stat_result: os.stat_result or None
+    :param kind: str, PathKind value
+    :return: str, PathStatus value
+    """
+
+    if stat_result is None:
+        return PathStatus.MISSING
+    if kind == PathKind.FILE and stat.S_ISDIR(stat_result.st_mode):
+        return PathStatus.WRONG_KIND
+    if kind == PathKind.DIRECTORY and not stat.S_ISDIR(stat_result.st_mode):
+        return PathStatus.WRONG_KIND
+
+    return PathStatus.VALID
+
+
+def get_path_validator():
+    """
+    Returns the path validator shared by all path options
+    :return: PathValidator
+    """
+
+    global _VALIDATOR
+    if _VALIDATOR is None:
+        _VALIDATOR = PathValidator()
+
+    return _VALIDATOR
+
+
+def get_directory_index():
+    """
+    Returns the directory index shared by all path options
+    :return: DirectoryIndex
+    """
+
+    global _DIRECTORY_INDEX
+    if _DIRECTORY_INDEX is None:
+        _DIRECTORY_INDEX = DirectoryIndex()
+
+    return _DIRECTORY_INDEX
+
+
+def _list_directory(directory):
+    """
+    Internal function that returns the entries of the given directory
+    :param directory: str
+    :return: tuple(list(str), set(str)), entry names and names of the entries that are directories
+    """
+
+    scandir = getattr(os, 'scandir', None)
+    if scandir is not None:
+        names, directories = list(), set()
+        for entry in scandir(directory):
+            names.append(entry.name)
+            try:
+                if entry.is_dir():
+                    directories.add(entry.name)
+            except OSError:
+                pass
+        return names, directories
+
+    names = os.listdir(directory)
+
+    return names, set(name for name in names if os.path.isdir(os.path.join(directory, name)))
+
+
+def _get_completions(directory, listing, partial, kind, limit):
+    """
+    Internal function that returns the paths of the entries of the given listing that start with the given text
+    :param directory: str
+    :param listing: DirectoryListing
+    :param partial: str, start of the entry name
+    :param kind: str, PathKind value
+    :param limit: int
+    :return: list(str)
+    """
+
+    key = partial.lower()
+    completions = list()
+    index = bisect.bisect_left(listing.keys, key)
+    while index < len(listing.keys) and listing.keys[index].startswith(key):
+        name = listing.names[index]
+        index += 1
+        if kind == PathKind.DIRECTORY and name not in listing.directories:
+            continue
+        completions.append(os.path.join(directory, name))
+        if len(completions) >= limit:
+            break
+
+    return completions
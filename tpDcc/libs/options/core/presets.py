@@ -0,0 +1,428 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains in-memory presets of option sets.
+Option sets are tracked with a persistent tree keyed by dotted path: each edit copies only the nodes on the path of
+the modified option, so every other node is shared between snapshots. Taking a snapshot is O(1) and switching between
+snapshots only visits the subtrees that differ.
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import json
+import logging
+from collections import OrderedDict
+
+from tpDcc.libs.options.core import backends
+
+LOGGER = logging.getLogger('tpDcc-libs-options')
+
+PRESETS_FORMAT_VERSION = 1
+
+
+class PathTree(object):
+    """
+    Immutable node of a persistent tree of options keyed by dotted path.
+    Modifications return a new tree that shares all the unmodified nodes with the original one.
+    """
+
+    __slots__ = ('entry', 'children')
+
+    def __init__(self, entry=None, children=None):
+        """
+        :param entry: tuple(str, object, str) or None, option stored in this node (path, value, option type)
+        :param children: dict or None, token: PathTree
+        """
+
+        self.entry = entry
+        self.children = children or dict()
+
+    @classmethod
+    def from_entries(cls, entries):
+        """
+        Builds a new tree with the given entries
+        :param entries: list(tuple(str, object, str))
+        :return: PathTree
+        """
+
+        root = cls()
+        for entry in entries:
+            node = root
+            for token in _split_path(entry[0]):
+                child = node.children.get(token)
+                if child is None:
+                    child = node.children[token] = cls()
+                node = child
+            node.entry = tuple(entry)
+
+        return root
+
+    def get(self, path):
+        """
+        Returns the entry of the option with given path
+        :param path: str
+        :return: tuple(str, object, str) or None
+        """
+
+        node = self
+        for token in _split_path(path):
+            node = node.children.get(token)
+            if node is None:
+                return None
+
+        return node.entry
+
+    def set(self, path, entry):
+        """
+        Returns a new tree where the option with given path stores the given entry
+        :param path: str
+        :param entry: tuple(str, object, str) or None, if None, option is removed
+        :return: PathTree
+        """
+
+        return self._set(_split_path(path), 0, entry) or PathTree()
+
+    def iterate(self):
+        """
+        Generator that iterates over all the entries of the tree
+        :return: generator(tuple(str, object, str))
+        """
+
+        if self.entry is not None:
+            yield self.entry
+        for child in self.children.values():
+            for entry in child.iterate():
+                yield entry
+
+    def _set(self, tokens, index, entry):
+        if index == len(tokens):
+            if entry is None and not self.children:
+                return None
+            return PathTree(entry, self.children)
+
+        token = tokens[index]
+        child = self.children.get(token)
+        if child is None:
+            if entry is None:
+                return self
+            child = PathTree()
+        new_child = child._set(tokens, index + 1, entry)
+
+        children = dict(self.children)
+        if new_child is None:
+            children.pop(token, None)
+            if self.entry is None and not children:
+                return None
+        else:
+            children[token] = new_child
+
+        return PathTree(self.entry, children)
+
+
+class OptionsSnapshot(object):
+    """
+    Immutable state of an option set
+    """
+
+    __slots__ = ('tree', 'order')
+
+    def __init__(self, tree, order):
+        """
+        :param tree: PathTree, options of the snapshot
+        :param order: tuple(str), option paths in display order
+        """
+
+        self.tree = tree
+        self.order = order
+
+    def __len__(self):
+        return len(self.order)
+
+    def get_entries(self):
+        """
+        Returns the options of the snapshot as backend entries
+        :return: list(tuple(str, object, str))
+        """
+
+        tree = self.tree
+        return [tree.get(path) for path in self.order]
+
+    def get_delta(self, base):
+        """
+        Returns the changes needed to build this snapshot from the given one
+        :param base: OptionsSnapshot
+        :return: dict, serializable delta with the changed options, the removed paths and the new option order (only
+            if it changed)
+        """
+
+        changed_entries, removed_paths = get_tree_changes(base.tree, self.tree)
+        delta = {
+            'changed': OrderedDict((path, [value, option_type]) for path, value, option_type in changed_entries),
+            'removed': removed_paths
+        }
+        if self.order != base.order:
+            delta['order'] = list(self.order)
+
+        return delta
+
+    @classmethod
+    def from_delta(cls, base, delta):
+        """
+        Builds a snapshot applying the given delta to the given snapshot
+        :param base: OptionsSnapshot
+        :param delta: dict, delta with the format returned by get_delta function
+        :return: OptionsSnapshot
+        """
+
+        tree = base.tree
+        for path, (value, option_type) in delta.get('changed', dict()).items():
+            tree = tree.set(path, (path, value, option_type))
+        for path in delta.get('removed', list()):
+            tree = tree.set(path, None)
+        order = tuple(delta['order']) if 'order' in delta else base.order
+
+        return cls(tree, order)
+
+
+class PresetsManager(object):
+    """
+    Keeps named snapshots of the options of an option object (such as OptionStore) and switches between them
+    """
+
+    def __init__(self, option_object):
+        """
+        :param option_object: OptionStore or LayeredOptionStore
+        """
+
+        self._option_object = option_object
+        self._presets = OrderedDict()
+        self._snapshot = self._build_snapshot()
+        self._base = self._snapshot
+        option_object.add_listener(self._on_options_changed)
+
+    def get_option_object(self):
+        """
+        Returns option object whose presets are managed
+        :return: OptionStore or LayeredOptionStore
+        """
+
+        return self._option_object
+
+    def close(self):
+        """
+        Stops tracking the changes of the option object
+        """
+
+        self._option_object.remove_listener(self._on_options_changed)
+
+    def get_base(self):
+        """
+        Returns the snapshot presets deltas are serialized against
+        :return: OptionsSnapshot
+        """
+
+        return self._base
+
+    def set_base(self, snapshot=None):
+        """
+        Sets the snapshot presets deltas are serialized against
+        :param snapshot: OptionsSnapshot or None, if not given current options are used
+        """
+
+        self._base = snapshot if snapshot is not None else self._snapshot
+
+    def take_snapshot(self):
+        """
+        Returns a snapshot of the current options. Snapshots share all their nodes with the current options tree.
+        :return: OptionsSnapshot
+        """
+
+        return self._snapshot
+
+    def get_preset_names(self):
+        """
+        Returns the names of the stored presets
+        :return: list(str)
+        """
+
+        return list(self._presets.keys())
+
+    def get_preset(self, name):
+        """
+        Returns the snapshot of the preset with given name
+        :param name: str
+        :return: OptionsSnapshot or None
+        """
+
+        return self._presets.get(name)
+
+    def save_preset(self, name):
+        """
+        Stores current options as a preset with given name
+        :param name: str
+        :return: OptionsSnapshot
+        """
+
+        self._presets[name] = self._snapshot
+
+        return self._snapshot
+
+    def remove_preset(self, name):
+        """
+        Removes preset with given name
+        :param name: str
+        :return: bool
+        """
+
+        return self._presets.pop(name, None) is not None
+
+    def apply_preset(self, name):
+        """
+        Sets the options of the preset with given name into the option object
+        :param name: str
+        :return: tuple(dict, bool), changed option values (path: value) and whether the options structure changed
+        """
+
+        snapshot = self._presets.get(name)
+        if snapshot is None:
+            raise ValueError('Options preset "{}" does not exist!'.format(name))
+
+        return self.apply_snapshot(snapshot, label='Apply Preset "{}"'.format(name))
+
+    def apply_snapshot(self, snapshot, label=None):
+        """
+        Sets the options of the given snapshot into the option object. Only the options that differ are written.
+        :param snapshot: OptionsSnapshot
+        :param label: str or None, label of the undo entry
+        :return: tuple(dict, bool), changed option values (path: value) and whether the options structure changed
+        """
+
+        current = self._snapshot
+        changed_entries, removed_paths = get_tree_changes(current.tree, snapshot.tree)
+        structure_changed = bool(removed_paths) or snapshot.order != current.order
+        if structure_changed:
+            self._option_object.set_entries(snapshot.get_entries())
+        elif changed_entries:
+            with self._option_object.batch(label):
+                for path, value, option_type in changed_entries:
+                    self._option_object.add_option(path, value, option_type=option_type)
+
+        return dict((path, value) for path, value, _ in changed_entries), structure_changed
+
+    def save_presets(self, file_path):
+        """
+        Saves the presets into given file. Presets are stored as deltas against the base snapshot
+        :param file_path: str
+        """
+
+        data = {
+            'version': PRESETS_FORMAT_VERSION,
+            'base': [list(entry) for entry in self._base.get_entries()],
+            'presets': OrderedDict((name, snapshot.get_delta(self._base)) for name, snapshot in self._presets.items())
+        }
+        backends.write_file_atomic(file_path, json.dumps(data, indent=2).encode('utf-8'))
+
+    def load_presets(self, file_path):
+        """
+        Loads the presets stored in the given file. Stored presets with the same name are replaced
+        :param file_path: str
+        """
+
+        with open(file_path, 'rb') as fh:
+            data = json.loads(fh.read().decode('utf-8'), object_pairs_hook=OrderedDict)
+        if data.get('version', PRESETS_FORMAT_VERSION) > PRESETS_FORMAT_VERSION:
+            LOGGER.warning('Presets file "{}" was saved with a newer version'.format(file_path))
+
+        entries = [tuple(entry) for entry in data.get('base', list())]
+        base = OptionsSnapshot(PathTree.from_entries(entries), tuple(entry[0] for entry in entries))
+        for name, delta in data.get('presets', dict()).items():
+            self._presets[name] = OptionsSnapshot.from_delta(base, delta)
+
+    def _build_snapshot(self):
+        """
+        Internal function that builds the snapshot of the current options of the option object
+        :return: OptionsSnapshot
+        """
+
+        entries = [backends.split_option_value(*option) for option in self._option_object.get_options()]
+
+        return OptionsSnapshot(PathTree.from_entries(entries), tuple(entry[0] for entry in entries))
+
+    def _on_options_changed(self, option_object, paths):
+        """
+        Internal callback function that is called each time the options of the option object change
+        Only the nodes of the modified paths are copied.
+        :param option_object: OptionStore or LayeredOptionStore
+        :param paths: list(str) or None
+        """
+
+        if paths is None:
+            self._snapshot = self._build_snapshot()
+            return
+
+        tree, order = self._snapshot.tree, self._snapshot.order
+        for path in paths:
+            if path in option_object:
+                entry = (path, option_object.get_option(path), option_object.get_option_type(path))
+            else:
+                entry = None
+            tree = tree.set(path, entry)
+
+        # Notifications do not tell whether options were only moved (set_entries, undo of a move...), so order is
+        # always compared. Unchanged orders keep sharing the previous tuple
+        new_order = tuple(option_object)
+        if new_order != order:
+            order = new_order
+
+        self._snapshot = OptionsSnapshot(tree, order)
+
+
+def get_tree_changes(old_tree, new_tree):
+    """
+    Returns the options that differ between both trees. Subtrees shared by both trees are skipped.
+    :param old_tree: PathTree
+    :param new_tree: PathTree
+    :return: tuple(list(tuple(str, object, str)), list(str)), added or changed entries and removed paths
+    """
+
+    changed_entries = list()
+    removed_paths = list()
+    _compare_nodes(old_tree, new_tree, changed_entries, removed_paths)
+
+    return changed_entries, removed_paths
+
+
+def _compare_nodes(old_node, new_node, changed_entries, removed_paths):
+    if old_node is new_node:
+        return
+
+    if new_node is None:
+        removed_paths.extend(entry[0] for entry in old_node.iterate())
+        return
+    if old_node is None:
+        changed_entries.extend(new_node.iterate())
+        return
+
+    if new_node.entry is not None:
+        if old_node.entry is None or old_node.entry != new_node.entry:
+            changed_entries.append(new_node.entry)
+    elif old_node.entry is not None:
+        removed_paths.append(old_node.entry[0])
+
+    old_children, new_children = old_node.children, new_node.children
+    for token, new_child in new_children.items():
+        _compare_nodes(old_children.get(token), new_child, changed_entries, removed_paths)
+    for token, old_child in old_children.items():
+        if token not in new_children:
+            removed_paths.extend(entry[0] for entry in old_child.iterate())
+
+
+def _split_path(path):
+    """
+    Internal function that returns the tokens of the given option path
+    :param path: str, option path (group paths end with a dot)
+    :return: list(str)
+    """
+
+    return path[:-1].split('.') if path.endswith('.') else path.split('.')
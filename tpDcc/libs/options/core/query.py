@@ -0,0 +1,278 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains indexed queries over option sets.
+Options are indexed by path in a dictionary (exact lookups) and in a sorted list of paths (prefix, subtree and glob
+queries), so tools do not need to scan the flat list returned by option objects get_options function.
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import re
+import bisect
+import fnmatch
+import logging
+
+from tpDcc.libs.options.core import backends
+
+LOGGER = logging.getLogger('tpDcc-libs-options')
+
+# Characters that end the literal prefix of a glob pattern
+GLOB_SPECIAL_CHARACTERS = '*?['
+
+
+class OptionsIndex(object):
+    """
+    Index of the options of an option object. If the option object notifies its changes (such as OptionStore), the
+    index is updated incrementally with the modified paths.
+    """
+
+    def __init__(self, option_object=None):
+        """
+        :param option_object: object or None, option object whose options are indexed
+        """
+
+        self._option_object = option_object
+        self._paths = list()
+        self._items = dict()
+        self._types = dict()
+
+        if option_object is not None:
+            self.build(option_object.get_options())
+            if hasattr(option_object, 'add_listener'):
+                option_object.add_listener(self._on_options_changed)
+
+    def __len__(self):
+        return len(self._paths)
+
+    def __contains__(self, path):
+        return path in self._items
+
+    def __iter__(self):
+        return iter(self._paths)
+
+    def close(self):
+        """
+        Stops tracking the changes of the option object
+        """
+
+        if self._option_object is not None and hasattr(self._option_object, 'remove_listener'):
+            self._option_object.remove_listener(self._on_options_changed)
+
+    def build(self, options):
+        """
+        Indexes the given options replacing the current ones
+        :param options: list, options with the format returned by option objects get_options function
+        """
+
+        self._items = dict()
+        self._types = dict()
+        for option in options:
+            path, value, option_type = backends.split_option_value(*option)
+            self._items[path] = (value, option_type)
+            self._types.setdefault(option_type, set()).add(path)
+        self._paths = sorted(self._items)
+
+    def update(self, path, value=None, option_type=None, removed=False):
+        """
+        Updates the index of a single option
+        :param path: str
+        :param value: variant
+        :param option_type: str or None
+        :param removed: bool, whether the option was removed
+        """
+
+        current = self._items.get(path)
+        if current is not None:
+            self._types[current[1]].discard(path)
+        if removed:
+            if current is not None:
+                del self._items[path]
+                del self._paths[bisect.bisect_left(self._paths, path)]
+            return
+
+        if current is None:
+            bisect.insort(self._paths, path)
+        self._items[path] = (value, option_type)
+        self._types.setdefault(option_type, set()).add(path)
+
+    def get(self, path, default=None):
+        """
+        Returns the value of the option with given path. O(1)
+        :param path: str
+        :param default: variant
+        :return: variant
+        """
+
+        item = self._items.get(path)
+
+        return item[0] if item is not None else default
+
+    def get_type(self, path):
+        """
+        Returns the type of the option with given path. O(1)
+        :param path: str
+        :return: str or None
+        """
+
+        item = self._items.get(path)
+
+        return item[1] if item is not None else None
+
+    def iterate(self, prefix=''):
+        """
+        Generator that iterates, in path order, over the options whose path starts with the given prefix
+        O(log n) to find the first option plus O(1) per returned option.
+        :param prefix: str
+        :return: generator(tuple(str, object, str)), option entries
+        """
+
+        paths, items = self._paths, self._items
+        index = bisect.bisect_left(paths, prefix)
+        while index < len(paths):
+            path = paths[index]
+            if not path.startswith(prefix):
+                break
+            item = items[path]
+            yield path, item[0], item[1]
+            index += 1
+
+    def iterate_group(self, group_path='', recursive=True):
+        """
+        Generator that iterates, in path order, over the options of the given group
+        :param group_path: str, group path (with or without trailing dot). If empty, root options are returned
+        :param recursive: bool, whether to return the options of the subgroups too
+        :return: generator(tuple(str, object, str))
+        """
+
+        prefix = group_path if not group_path or group_path.endswith('.') else group_path + '.'
+        if recursive:
+            for entry in self.iterate(prefix):
+                if entry[0] != prefix:
+                    yield entry
+            return
+
+        paths, items = self._paths, self._items
+        index = bisect.bisect_left(paths, prefix)
+        while index < len(paths):
+            path = paths[index]
+            if not path.startswith(prefix):
+                break
+            if path == prefix:
+                index += 1
+                continue
+            name = path[len(prefix):]
+            separator = name.find('.')
+            if separator == -1 or separator == len(name) - 1:
+                item = items[path]
+                yield path, item[0], item[1]
+                index += 1
+            else:
+                # Paths of a subgroup are contiguous: '/' is the character after '.', so we jump over the whole subtree
+                index = bisect.bisect_left(paths, prefix + name[:separator] + '/', index)
+
+    def glob(self, pattern):
+        """
+        Generator that iterates, in path order, over the options whose path matches the given glob pattern
+        Only the options that share the literal prefix of the pattern are tested.
+        :param pattern: str, glob pattern (for example, 'arm.*.enable')
+        :return: generator(tuple(str, object, str))
+        """
+
+        match = _compile_glob(pattern)
+        for entry in self.iterate(_get_literal_prefix(pattern)):
+            if match(entry[0]):
+                yield entry
+
+    def search(self, regex):
+        """
+        Generator that iterates, in path order, over the options whose path matches the given regular expression
+        :param regex: str or compiled regular expression
+        :return: generator(tuple(str, object, str))
+        """
+
+        search = re.compile(regex).search if isinstance(regex, backends.string_types) else regex.search
+        for entry in self.iterate():
+            if search(entry[0]):
+                yield entry
+
+    def of_type(self, option_type):
+        """
+        Generator that iterates, in path order, over the options of the given type
+        :param option_type: str or None
+        :return: generator(tuple(str, object, str))
+        """
+
+        items = self._items
+        for path in sorted(self._types.get(option_type, ())):
+            item = items[path]
+            yield path, item[0], item[1]
+
+    def find(self, prefix='', pattern=None, regex=None, option_type=None):
+        """
+        Generator that iterates, in path order, over the options that match all the given filters
+        :param prefix: str, path prefix
+        :param pattern: str or None, glob pattern
+        :param regex: str or None, regular expression
+        :param option_type: str or None, option type
+        :return: generator(tuple(str, object, str))
+        """
+
+        if pattern:
+            literal_prefix = _get_literal_prefix(pattern)
+            if literal_prefix.startswith(prefix):
+                prefix = literal_prefix
+        match = _compile_glob(pattern) if pattern else None
+        search = re.compile(regex).search if regex else None
+
+        for entry in self.iterate(prefix):
+            path = entry[0]
+            if option_type is not None and entry[2] != option_type:
+                continue
+            if match and not match(path):
+                continue
+            if search and not search(path):
+                continue
+            yield entry
+
+    def _on_options_changed(self, option_object, paths):
+        """
+        Internal callback function that is called each time the options of the option object change
+        :param option_object: object
+        :param paths: list(str) or None
+        """
+
+        if paths is None:
+            self.build(option_object.get_options())
+            return
+
+        for path in paths:
+            if path in option_object:
+                self.update(path, option_object.get_option(path), option_object.get_option_type(path))
+            else:
+                self.update(path, removed=True)
+
+
+def _get_literal_prefix(pattern):
+    """
+    Internal function that returns the part of the given glob pattern before its first special character
+    :param pattern: str
+    :return: str
+    """
+
+    for i, character in enumerate(pattern):
+        if character in GLOB_SPECIAL_CHARACTERS:
+            return pattern[:i]
+
+    return pattern
+
+
+def _compile_glob(pattern):
+    """
+    Internal function that returns a function that checks whether a path matches given glob pattern
+    :param pattern: str
+    :return: callable
+    """
+
+    return re.compile(fnmatch.translate(pattern)).match
@@ -0,0 +1,416 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains typed schema declarations for option sets.
+Schemas declare type, default value, range, choices and documentation of options and are used to validate option sets
+in a single pass before any widget is built.
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import numbers
+import logging
+from collections import OrderedDict
+
+from tpDcc.libs.options.core import decoder, arrays
+
+LOGGER = logging.getLogger('tpDcc-libs-options')
+
+_SCHEMAS = dict()
+
+
+class OptionValidationError(ValueError):
+    """
+    Exception raised when an option set does not match its schema
+    """
+
+    def __init__(self, errors):
+        """
+        :param errors: list(tuple(str, str)), list of (option path, error message)
+        """
+
+        self.errors = errors
+        message = '\n'.join('{}: {}'.format(path, error) for path, error in errors)
+        super(OptionValidationError, self).__init__('Invalid options:\n{}'.format(message))
+
+
+class OptionField(object):
+    """
+    Declaration of a single option
+    """
+
+    def __init__(self, option_type, default=None, min_value=None, max_value=None, choices=None, doc=''):
+        """
+        :param option_type: str, option type ('float', 'integer', 'boolean', 'string', 'color', ...)
+        :param default: variant, default value of the option
+        :param min_value: int or float or None, minimum value (numeric options only)
+        :param max_value: int or float or None, maximum value (numeric options only)
+        :param choices: list or None, valid values of the option
+        :param doc: str, option documentation
+        """
+
+        self.option_type = option_type
+        self.default = default
+        self.min_value = min_value
+        self.max_value = max_value
+        self.choices = tuple(choices) if choices is not None else None
+        self.doc = doc
+
+    def __repr__(self):
+        return 'OptionField({}, default={})'.format(self.option_type, self.default)
+
+
+class OptionSchema(object):
+    """
+    Collection of option fields declared for an option set
+    """
+
+    def __init__(self, name, fields=None, strict=False):
+        """
+        :param name: str, schema name, used to register it and to link option sets with it
+        :param fields: dict or None, option path: OptionField
+        :param strict: bool, whether options that are not declared in the schema are considered invalid
+        """
+
+        self._name = name
+        self._fields = OrderedDict()
+        self._strict = strict
+        self._validators = dict()
+        for path, field in (fields or dict()).items():
+            self.add_field(path, field)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def __contains__(self, path):
+        return path in self._fields
+
+    def __iter__(self):
+        return iter(self._fields.items())
+
+    @classmethod
+    def from_options(cls, name, options, strict=False):
+        """
+        Creates a schema whose fields and defaults are taken from the given option set (for example, a template)
+        :param name: str
+        :param options: list, options with the format returned by option objects get_options function
+        :param strict: bool
+        :return: OptionSchema
+        """
+
+        schema = cls(name, strict=strict)
+        for record in decoder.decode_options(options):
+            schema.add_field(record.path, OptionField(record.option_type, default=record.value))
+
+        return schema
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def strict(self):
+        return self._strict
+
+    def add_field(self, path, field=None, **kwargs):
+        """
+        Declares a new option in the schema
+        :param path: str, option path
+        :param field: OptionField or str, option field or option type
+        :param kwargs: dict, OptionField keyword arguments used when field is an option type
+        :return: OptionField
+        """
+
+        if not isinstance(field, OptionField):
+            field = OptionField(field, **kwargs)
+        self._fields[path] = field
+        self._validators.pop(path, None)
+
+        return field
+
+    def remove_field(self, path):
+        """
+        Removes the declaration of the option with given path
+        :param path: str
+        """
+
+        self._fields.pop(path, None)
+        self._validators.pop(path, None)
+
+    def get_field(self, path):
+        """
+        Returns the declaration of the option with given path
+        :param path: str
+        :return: OptionField or None
+        """
+
+        return self._fields.get(path)
+
+    def get_default(self, path, default=None):
+        """
+        Returns default value of the option with given path
+        :param path: str
+        :param default: variant, value returned if the option is not declared
+        :return: variant
+        """
+
+        field = self._fields.get(path)
+        if not field:
+            return default
+
+        return field.default
+
+    def get_validator(self, path, option_type=None):
+        """
+        Returns the compiled validator of the option with given path. Validators are cached per schema.
+        :param path: str
+        :param option_type: str or None, type of the option, used if option is not declared in the schema
+        :return: callable, function that receives a value and returns an error message or None if the value is valid
+        """
+
+        field = self._fields.get(path)
+        if field is None:
+            return get_type_validator(option_type)
+
+        validator = self._validators.get(path)
+        if validator is None:
+            validator = self._validators[path] = compile_validator(field)
+
+        return validator
+
+    def validate_value(self, path, value, option_type=None):
+        """
+        Validates a single option value
+        :param path: str
+        :param value: variant
+        :param option_type: str or None
+        :raises OptionValidationError: if value is not valid
+        """
+
+        error = self._validate(path, option_type, value)
+        if error:
+            raise OptionValidationError([(path, error)])
+
+    def validate(self, options):
+        """
+        Validates all the given options in a single pass
+        :param options: list, options with the format returned by option objects get_options function
+        :raises OptionValidationError: if any option is not valid
+        """
+
+        errors = list()
+        for record in decoder.decode_options(options):
+            error = self._validate(record.path, record.option_type, record.value)
+            if error:
+                errors.append((record.path, error))
+        if errors:
+            raise OptionValidationError(errors)
+
+    def _validate(self, path, option_type, value):
+        """
+        Internal function that validates an option value and returns the error message if the value is not valid
+        :param path: str
+        :param option_type: str or None
+        :param value: variant
+        :return: str or None
+        """
+
+        field = self._fields.get(path)
+        if field is None:
+            if self._strict:
+                return 'option is not declared in schema "{}"'.format(self._name)
+        elif option_type and field.option_type != option_type:
+            return 'expected option of type "{}" but found "{}"'.format(field.option_type, option_type)
+
+        return self.get_validator(path, option_type)(value)
+
+
+def _is_number(value):
+    return isinstance(value, numbers.Number) and not isinstance(value, bool)
+
+
+def _is_string(value):
+    return isinstance(value, decoder.string_types)
+
+
+def _is_vector(value, sizes):
+    return isinstance(value, (list, tuple)) and len(value) in sizes and all(_is_number(v) for v in value)
+
+
+def _check_float(value):
+    if not _is_number(value):
+        return 'expected a number but found {!r}'.format(value)
+
+
+def _check_integer(value):
+    if not _is_number(value) or (isinstance(value, float) and not value.is_integer()):
+        return 'expected an integer but found {!r}'.format(value)
+
+
+def _check_boolean(value):
+    if not isinstance(value, bool):
+        return 'expected a boolean but found {!r}'.format(value)
+
+
+def _check_string(value):
+    if not _is_string(value):
+        return 'expected a string but found {!r}'.format(value)
+
+
+def _check_color(value):
+    if not _is_vector(value, (3, 4)):
+        return 'expected a list of 3 or 4 numbers but found {!r}'.format(value)
+
+
+def _check_vector3(value):
+    if not _is_vector(value, (3,)):
+        return 'expected a list of 3 numbers but found {!r}'.format(value)
+
+
+def _check_list(value):
+    if not isinstance(value, (list, tuple)):
+        return 'expected a list but found {!r}'.format(value)
+
+
+def _check_array(value):
+    if arrays.is_encoded_array(value):
+        if value['dtype'] not in arrays.TYPECODES or value['columns'] not in arrays.COLUMNS:
+            return 'expected a float or int array of {} columns but found {!r}'.format(
+                arrays.COLUMNS, dict(value, data='...'))
+        return
+    if not isinstance(value, (list, tuple)):
+        return 'expected a numeric array but found {!r}'.format(value)
+
+
+def _check_dictionary(value):
+    if isinstance(value, dict):
+        return
+    if not isinstance(value, (list, tuple)) or not value or not isinstance(value[0], dict):
+        return 'expected a dictionary or a [dictionary, keys order] pair but found {!r}'.format(value)
+
+
+def _check_combo(value):
+    if not isinstance(value, (list, tuple)):
+        return 'expected a list of combo items but found {!r}'.format(value)
+
+
+def _check_any(value):
+    return None
+
+
+def _check_min_value(value, min_value, components=False):
+    if (min(value) if components else value) < min_value:
+        return 'value {!r} is lower than {!r}'.format(value, min_value)
+
+
+def _check_max_value(value, max_value, components=False):
+    if (max(value) if components else value) > max_value:
+        return 'value {!r} is greater than {!r}'.format(value, max_value)
+
+
+def _check_choices(value, choices, combo=False):
+    if combo:
+        # Combo values store their items and their current selection: [items, [index, text]]
+        current = value[1] if len(value) > 1 else None
+        if not isinstance(current, (list, tuple)) or len(current) < 2:
+            return None
+        value = current[1]
+    if value not in choices:
+        return 'value {!r} is not one of {!r}'.format(value, choices)
+
+
+# Validators of the values of each option type
+TYPE_VALIDATORS = {
+    'group': _check_boolean,
+    'title': _check_any,
+    'boolean': _check_boolean,
+    'float': _check_float,
+    'integer': _check_integer,
+    'string': _check_string,
+    'text': _check_string,
+    'nonedittext': _check_string,
+    'directory': _check_string,
+    'file': _check_string,
+    'script': _check_string,
+    'color': _check_color,
+    'vector3f': _check_vector3,
+    'list': _check_list,
+    'array': _check_array,
+    'dictionary': _check_dictionary,
+    'combo': _check_combo
+}
+
+
+# Option types whose values can be checked against a range. Ranges of component types apply to every component
+RANGE_TYPES = ('float', 'integer', 'vector3f', 'color')
+COMPONENT_RANGE_TYPES = ('vector3f', 'color')
+
+
+def get_type_validator(option_type):
+    """
+    Returns the validator of the values of the given option type
+    :param option_type: str or None
+    :return: callable
+    """
+
+    return TYPE_VALIDATORS.get(option_type, _check_any)
+
+
+def compile_validator(field):
+    """
+    Compiles a validator function for the given field
+    :param field: OptionField
+    :return: callable, function that receives a value and returns an error message or None if the value is valid
+    """
+
+    checks = [get_type_validator(field.option_type)]
+    min_value, max_value, choices = field.min_value, field.max_value, field.choices
+    if field.option_type in RANGE_TYPES:
+        components = field.option_type in COMPONENT_RANGE_TYPES
+        if min_value is not None:
+            checks.append(lambda v: _check_min_value(v, min_value, components))
+        if max_value is not None:
+            checks.append(lambda v: _check_max_value(v, max_value, components))
+    if choices is not None:
+        combo = field.option_type == 'combo'
+        checks.append(lambda v: _check_choices(v, choices, combo))
+
+    if len(checks) == 1:
+        return checks[0]
+
+    def _validator(value):
+        for check in checks:
+            error = check(value)
+            if error:
+                return error
+
+    return _validator
+
+
+def register_schema(schema):
+    """
+    Registers given schema so option sets can be linked to it by name
+    :param schema: OptionSchema
+    """
+
+    _SCHEMAS[schema.name] = schema
+
+
+def unregister_schema(name):
+    """
+    Unregisters schema with given name
+    :param name: str
+    """
+
+    _SCHEMAS.pop(name, None)
+
+
+def get_schema(name):
+    """
+    Returns registered schema with given name
+    :param name: str
+    :return: OptionSchema or None
+    """
+
+    return _SCHEMAS.get(name)
@@ -0,0 +1,754 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains execution of option script snippets.
+Compiled code objects are cached by source hash, so running the same snippet again does not parse and compile it.
+Snippets that declare they do not depend on the DCC can run in a worker thread or process, so long scripts do not
+block the DCC UI thread.
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import os
+import re
+import sys
+import ctypes
+import hashlib
+import logging
+import threading
+import traceback
+import multiprocessing
+from collections import namedtuple, OrderedDict
+
+from tpDcc.libs.options.core import backends
+
+LOGGER = logging.getLogger('tpDcc-libs-options')
+
+# Maximum number of compiled code objects kept in cache
+CODE_CACHE_SIZE = 64
+
+# Maximum number of syntax check results kept in cache
+SYNTAX_CACHE_SIZE = 256
+
+# File name used in the tracebacks of option scripts
+SCRIPT_FILE_NAME = '<option script>'
+
+# Header comment used by snippets to declare they can run outside the DCC UI thread. For example:
+#   # options-run: thread
+#   # options-run: process timeout=30
+RUN_HEADER_PATTERN = re.compile(r'^#\s*options-run\s*:\s*(thread|process)(?:\s+timeout\s*=\s*([0-9.]+))?\s*$')
+
+# Seconds between checks of cancellation and timeout while a process runs
+PROCESS_POLL_INTERVAL = 0.05
+
+_CODE_CACHE = OrderedDict()
+_SYNTAX_CACHE = OrderedDict()
+_CODE_CACHE_LOCK = threading.Lock()
+_THREAD_OUTPUT = None
+_THREAD_OUTPUT_USERS = 0
+_THREAD_OUTPUT_LOCK = threading.Lock()
+_SYNTAX_CHECKER = None
+
+# Names of the Python interpreters shipped with DCCs, used to start script processes when the current executable is
+# the DCC itself
+PYTHON_EXECUTABLES = ('mayapy', 'hython', 'python3', 'python')
+
+# Syntax error of a script
+# line: int, line number (starting at 1)
+# column: int, column number (starting at 1, 0 if unknown)
+# message: str
+SyntaxIssue = namedtuple('SyntaxIssue', ['line', 'column', 'message'])
+
+
+class RunMode(object):
+    MAIN = 'main'
+    THREAD = 'thread'
+    PROCESS = 'process'
+
+
+class ScriptStatus(object):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    FINISHED = 'finished'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+    TIMED_OUT = 'timed_out'
+
+
+class ScriptCancelledError(Exception):
+    """
+    Exception raised inside scripts running in a worker thread when they are cancelled or time out
+    """
+
+    pass
+
+
+def get_code(code_snippet):
+    """
+    Returns the compiled code object of the given snippet. Code objects are cached by source hash
+    :param code_snippet: str
+    :return: code
+    """
+
+    key = _get_source_key(code_snippet)
+    code = _get_cached(_CODE_CACHE, key)
+    if code is None:
+        code = compile(code_snippet, SCRIPT_FILE_NAME, 'exec')
+        _set_cached(_CODE_CACHE, key, code, CODE_CACHE_SIZE)
+
+    return code
+
+
+def check_syntax(code_snippet):
+    """
+    Returns the syntax error of the given snippet. Results are cached by source hash and valid snippets keep their
+    compiled code, so running them afterwards does not compile them again.
+    :param code_snippet: str
+    :return: SyntaxIssue or None
+    """
+
+    key = _get_source_key(code_snippet)
+    issue = _get_cached(_SYNTAX_CACHE, key)
+    if issue is not None:
+        return issue
+
+    try:
+        get_code(code_snippet)
+    except (SyntaxError, ValueError) as exc:
+        issue = SyntaxIssue(getattr(exc, 'lineno', None) or 1, getattr(exc, 'offset', None) or 0,
+                            getattr(exc, 'msg', None) or str(exc))
+        _set_cached(_SYNTAX_CACHE, key, issue, SYNTAX_CACHE_SIZE)
+
+    return issue
+
+
+def clear_code_cache():
+    """
+    Removes all the cached code objects and syntax check results
+    """
+
+    with _CODE_CACHE_LOCK:
+        _CODE_CACHE.clear()
+        _SYNTAX_CACHE.clear()
+
+
+def get_run_settings(code_snippet):
+    """
+    Returns how the given snippet must be run. Snippets declare they do not depend on the DCC with a header comment
+    in their first lines (for example, "# options-run: process timeout=30")
+    :param code_snippet: str
+    :return: tuple(str, float or None), RunMode value and timeout in seconds
+    """
+
+    for line in code_snippet.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if not line.startswith('#'):
+            break
+        match = RUN_HEADER_PATTERN.match(line)
+        if match:
+            return match.group(1), float(match.group(2)) if match.group(2) else None
+
+    return RunMode.MAIN, None
+
+
+def get_script_scope(option_object):
+    """
+    Returns the global scope used to run snippets in the current thread. Option object is available as "options"
+    :param option_object: object
+    :return: dict
+    """
+
+    return {'__name__': '__main__', 'options': option_object}
+
+
+def run_code_snippet(code_snippet, scope):
+    """
+    Executes given code snippet in the current thread
+    :param code_snippet: str
+    :param scope: dict, global scope of the snippet
+    """
+
+    exec(get_code(code_snippet), scope)
+
+
+def run_script(code_snippet, options, mode=None, timeout=None, on_output=None, on_finished=None):
+    """
+    Runs given code snippet in a worker thread or process. Scripts get a dictionary with the option values (path: value)
+    as "options" in their scope; they cannot modify the option object.
+    :param code_snippet: str
+    :param options: list, options with the format returned by option objects get_options function
+    :param mode: str or None, RunMode.THREAD or RunMode.PROCESS. If not given, snippet header is used
+    :param timeout: float or None, seconds after which the script is stopped. If not given, snippet header is used
+    :param on_output: callable or None, called from a worker thread with each chunk of text written into stdout
+    :param on_finished: callable or None, called from a worker thread with the ScriptRun once it ends
+    :return: ScriptRun
+    """
+
+    header_mode, header_timeout = get_run_settings(code_snippet)
+    mode = mode or header_mode
+    if mode == RunMode.MAIN:
+        raise ValueError('Script does not declare it can run outside the main thread!')
+
+    values = dict((path, value) for path, value, _ in (backends.split_option_value(*option) for option in options))
+    script_run = ScriptRun(
+        code_snippet, values, mode=mode, timeout=timeout if timeout is not None else header_timeout,
+        on_output=on_output, on_finished=on_finished)
+    script_run.start()
+
+    return script_run
+
+
+class ScriptRun(object):
+    """
+    Execution of a code snippet in a worker thread or process.
+    Scripts running in a thread are stopped raising ScriptCancelledError inside them, so blocking calls delay
+    cancellation until they return. Scripts running in a process are terminated.
+    """
+
+    def __init__(self, code_snippet, options, mode=RunMode.THREAD, timeout=None, on_output=None, on_finished=None):
+        """
+        :param code_snippet: str
+        :param options: dict, option values available in the script scope as "options"
+        :param mode: str, RunMode.THREAD or RunMode.PROCESS
+        :param timeout: float or None
+        :param on_output: callable or None
+        :param on_finished: callable or None
+        """
+
+        if mode not in (RunMode.THREAD, RunMode.PROCESS):
+            raise ValueError('Invalid script run mode "{}"!'.format(mode))
+
+        self._code_snippet = code_snippet
+        self._options = options
+        self._mode = mode
+        self._timeout = timeout
+        self._on_output = on_output
+        self._on_finished = on_finished
+        self._status = ScriptStatus.PENDING
+        self._error = None
+        self._output = list()
+        self._stop_status = None
+        self._stop_lock = threading.Lock()
+        self._executing = False
+        self._finished = threading.Event()
+        self._thread = None
+        self._timer = None
+
+    def __repr__(self):
+        return 'ScriptRun(mode={}, status={})'.format(self._mode, self._status)
+
+    def get_mode(self):
+        """
+        Returns where the script runs
+        :return: str, RunMode value
+        """
+
+        return self._mode
+
+    def get_status(self):
+        """
+        Returns the status of the run
+        :return: str, ScriptStatus value
+        """
+
+        return self._status
+
+    def get_error(self):
+        """
+        Returns the traceback of the error raised by the script
+        :return: str or None
+        """
+
+        return self._error
+
+    def get_output(self):
+        """
+        Returns the text written into stdout by the script
+        :return: str
+        """
+
+        return ''.join(self._output)
+
+    def is_running(self):
+        """
+        Returns whether the script is still running
+        :return: bool
+        """
+
+        return self._status in (ScriptStatus.PENDING, ScriptStatus.RUNNING)
+
+    def start(self):
+        """
+        Starts running the script
+        """
+
+        if self._thread is not None:
+            return
+
+        # Compiling in the caller thread reports syntax errors before any worker is started
+        get_code(self._code_snippet)
+        process_context = _get_process_context() if self._mode == RunMode.PROCESS else None
+        if self._mode == RunMode.THREAD:
+            target, args = self._run_thread, tuple()
+        else:
+            target, args = self._run_process, (process_context,)
+        self._thread = threading.Thread(target=target, args=args, name='tpDcc-libs-options-script')
+        self._thread.daemon = True
+        self._status = ScriptStatus.RUNNING
+        self._executing = True
+        self._thread.start()
+        if self._timeout:
+            self._timer = threading.Timer(self._timeout, self._stop, (ScriptStatus.TIMED_OUT,))
+            self._timer.daemon = True
+            self._timer.start()
+
+    def cancel(self):
+        """
+        Requests the script to stop
+        """
+
+        self._stop(ScriptStatus.CANCELLED)
+
+    def wait(self, timeout=None):
+        """
+        Blocks until the script ends
+        :param timeout: float or None, maximum number of seconds to wait
+        :return: bool, True if the script ended; False if timeout was reached
+        """
+
+        return self._finished.wait(timeout)
+
+    def _stop(self, status):
+        """
+        Internal function that stops the script
+        :param status: str, ScriptStatus.CANCELLED or ScriptStatus.TIMED_OUT
+        """
+
+        with self._stop_lock:
+            if not self._executing or self._stop_status is not None:
+                return
+            self._stop_status = status
+            if self._mode != RunMode.THREAD:
+                return
+            result = _set_async_exception(self._thread.ident, ScriptCancelledError)
+            if result > 1:
+                # Exception was set into more than one thread state, so it is reverted
+                _set_async_exception(self._thread.ident, None)
+                LOGGER.error('Impossible to stop option script thread {}'.format(self._thread.ident))
+            elif not result:
+                LOGGER.warning('Option script thread {} was not found'.format(self._thread.ident))
+
+    def _end_execution(self):
+        """
+        Internal function called from the worker thread once user code returns. After it, the script cannot be
+        stopped anymore, and a cancel exception that was requested but not raised yet is discarded, so it cannot be
+        raised while the run finishes
+        """
+
+        with self._stop_lock:
+            if self._executing and self._stop_status is not None:
+                _set_async_exception(threading.current_thread().ident, None)
+            self._executing = False
+
+    def _write_output(self, text):
+        """
+        Internal function that stores and streams a chunk of text written by the script
+        :param text: str
+        """
+
+        if not text:
+            return
+
+        self._output.append(text)
+        if self._on_output:
+            try:
+                self._on_output(text)
+            except Exception:
+                LOGGER.error('Error while streaming script output: {}'.format(traceback.format_exc()))
+
+    def _finish(self, status, error=None):
+        """
+        Internal function that sets the final status of the run and notifies it
+        :param status: str
+        :param error: str or None
+        """
+
+        if self._timer is not None:
+            self._timer.cancel()
+        self._status = status
+        self._error = error
+        self._finished.set()
+        if error:
+            LOGGER.error('Error while running option script: {}'.format(error))
+        if self._on_finished:
+            try:
+                self._on_finished(self)
+            except Exception:
+                LOGGER.error('Error while notifying script end: {}'.format(traceback.format_exc()))
+
+    def _run_thread(self):
+        """
+        Internal function that runs the script in the current (worker) thread
+        """
+
+        output = _install_thread_output()
+        output.register(self._write_output)
+        scope = get_script_scope(self._options)
+        status, error = ScriptStatus.FINISHED, None
+        try:
+            try:
+                exec(get_code(self._code_snippet), scope)
+            except ScriptCancelledError:
+                status = self._stop_status
+            except Exception:
+                status, error = self._stop_status or ScriptStatus.FAILED, traceback.format_exc()
+            self._end_execution()
+        except ScriptCancelledError:
+            # Script was stopped right after it ended. Only one cancel exception is ever requested, so none is pending
+            status, error = self._stop_status, None
+            self._executing = False
+        finally:
+            output.unregister()
+            _uninstall_thread_output()
+
+        self._finish(status, error)
+
+    def _run_process(self, process_context):
+        """
+        Internal function that runs the script in a child process and streams its output
+        :param process_context: multiprocessing context (or module) used to start the process
+        """
+
+        messages = process_context.Queue()
+        process = process_context.Process(
+            target=_run_in_process, args=(self._code_snippet, self._options, messages),
+            name='tpDcc-libs-options-script')
+        process.daemon = True
+        try:
+            process.start()
+        except Exception:
+            self._executing = False
+            self._finish(ScriptStatus.FAILED, traceback.format_exc())
+            return
+
+        status, error = None, None
+        while status is None:
+            if self._stop_status is not None:
+                process.terminate()
+                status = self._stop_status
+                break
+            try:
+                message = messages.get(timeout=PROCESS_POLL_INTERVAL)
+            except Exception:
+                if not process.is_alive():
+                    break
+                continue
+            status, error = self._handle_process_message(message)
+
+        process.join()
+
+        # Process can exit right after queuing its last messages, so they are read before deciding the status
+        while status is None:
+            try:
+                message = messages.get(timeout=PROCESS_POLL_INTERVAL)
+            except Exception:
+                status, error = ScriptStatus.FAILED, 'Script process exited with code {}'.format(process.exitcode)
+                break
+            status, error = self._handle_process_message(message)
+
+        messages.close()
+        self._executing = False
+        self._finish(status, error)
+
+    def _handle_process_message(self, message):
+        """
+        Internal function that handles a message sent by a script process
+        :param message: tuple(str, object), message type and data
+        :return: tuple(str or None, str or None), final status (None if the script did not end) and error
+        """
+
+        message_type, data = message
+        if message_type == 'output':
+            self._write_output(data)
+        elif message_type == 'error':
+            return ScriptStatus.FAILED, data
+        elif message_type == 'done':
+            return ScriptStatus.FINISHED, None
+
+        return None, None
+
+
+class SyntaxChecker(object):
+    """
+    Checks the syntax of scripts in a background thread shared by all the script widgets.
+    Each requester only keeps its latest submitted text, so texts superseded while typing are never checked.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._jobs = OrderedDict()
+        self._thread = None
+
+    def submit(self, requester, code_snippet, callback):
+        """
+        Queues the syntax check of given text
+        :param requester: object, object that requests the check. Previous queued texts of this object are discarded
+        :param code_snippet: str
+        :param callback: callable, called from the worker thread with the checked text and its SyntaxIssue (or None)
+        """
+
+        with self._condition:
+            self._jobs.pop(id(requester), None)
+            self._jobs[id(requester)] = (code_snippet, callback)
+            self._ensure_thread()
+            self._condition.notify_all()
+
+    def cancel(self, requester):
+        """
+        Discards the queued syntax check of given requester
+        :param requester: object
+        """
+
+        with self._condition:
+            self._jobs.pop(id(requester), None)
+
+    def _ensure_thread(self):
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._thread = threading.Thread(target=self._run, name='tpDcc-libs-options-syntax')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._jobs:
+                    self._condition.wait()
+                _, (code_snippet, callback) = self._jobs.popitem(last=False)
+
+            try:
+                callback(code_snippet, check_syntax(code_snippet))
+            except Exception:
+                LOGGER.error('Error while checking script syntax: {}'.format(traceback.format_exc()))
+
+
+def get_syntax_checker():
+    """
+    Returns the background syntax checker shared by all script widgets
+    :return: SyntaxChecker
+    """
+
+    global _SYNTAX_CHECKER
+    if _SYNTAX_CHECKER is None:
+        _SYNTAX_CHECKER = SyntaxChecker()
+
+    return _SYNTAX_CHECKER
+
+
+class _ThreadOutput(object):
+    """
+    Replacement of sys.stdout that sends the text written by script threads to their runs. Text written by any other
+    thread is written into the original stream.
+    """
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._writers = dict()
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+    def get_stream(self):
+        return self._stream
+
+    def register(self, writer):
+        self._writers[threading.current_thread().ident] = writer
+
+    def unregister(self):
+        self._writers.pop(threading.current_thread().ident, None)
+
+    def write(self, text):
+        writer = self._writers.get(threading.current_thread().ident)
+        if writer is None:
+            return self._stream.write(text)
+        writer(text)
+
+    def flush(self):
+        if threading.current_thread().ident not in self._writers:
+            self._stream.flush()
+
+
+class _QueueOutput(object):
+    """
+    Replacement of sys.stdout used by script processes that sends written text to the parent process
+    """
+
+    def __init__(self, messages):
+        self._messages = messages
+
+    def write(self, text):
+        if text:
+            self._messages.put(('output', text))
+
+    def flush(self):
+        pass
+
+
+def _get_source_key(code_snippet):
+    """
+    Internal function that returns the key used to cache the given snippet
+    :param code_snippet: str
+    :return: str
+    """
+
+    return hashlib.sha1(code_snippet.encode('utf-8')).hexdigest()
+
+
+def _get_cached(cache, key):
+    """
+    Internal function that returns a value from the given LRU cache
+    :param cache: OrderedDict
+    :param key: str
+    :return: object or None
+    """
+
+    with _CODE_CACHE_LOCK:
+        value = cache.pop(key, None)
+        if value is not None:
+            cache[key] = value
+
+    return value
+
+
+def _set_cached(cache, key, value, size):
+    """
+    Internal function that stores a value into the given LRU cache
+    :param cache: OrderedDict
+    :param key: str
+    :param value: object
+    :param size: int, maximum number of values of the cache
+    """
+
+    with _CODE_CACHE_LOCK:
+        cache[key] = value
+        while len(cache) > size:
+            cache.popitem(last=False)
+
+
+def _install_thread_output():
+    """
+    Internal function that installs the stdout replacement used by script threads. The replacement is shared by all
+    the running scripts and is only installed while at least one of them runs
+    :return: _ThreadOutput
+    """
+
+    global _THREAD_OUTPUT, _THREAD_OUTPUT_USERS
+    with _THREAD_OUTPUT_LOCK:
+        if not _THREAD_OUTPUT_USERS:
+            _THREAD_OUTPUT = _ThreadOutput(sys.stdout)
+            sys.stdout = _THREAD_OUTPUT
+        _THREAD_OUTPUT_USERS += 1
+
+        return _THREAD_OUTPUT
+
+
+def _uninstall_thread_output():
+    """
+    Internal function that restores the original stdout once no script thread is running. If another tool replaced
+    stdout in the meantime, its stream is kept
+    """
+
+    global _THREAD_OUTPUT, _THREAD_OUTPUT_USERS
+    with _THREAD_OUTPUT_LOCK:
+        _THREAD_OUTPUT_USERS -= 1
+        if _THREAD_OUTPUT_USERS:
+            return
+        if sys.stdout is _THREAD_OUTPUT:
+            sys.stdout = _THREAD_OUTPUT.get_stream()
+        _THREAD_OUTPUT = None
+
+
+def _set_async_exception(thread_ident, exception):
+    """
+    Internal function that raises given exception asynchronously in the thread with given identifier
+    :param thread_ident: int
+    :param exception: type or None, exception class. If None, the pending exception of the thread is cleared
+    :return: int, number of modified thread states
+    """
+
+    return ctypes.pythonapi.PyThreadState_SetAsyncExc(
+        ctypes.c_ulong(thread_ident), ctypes.py_object(exception) if exception is not None else None)
+
+
+def _get_python_executable():
+    """
+    Internal function that returns the Python interpreter used to start script processes. Inside a DCC, the current
+    executable is the DCC itself, so the interpreter shipped next to it (such as mayapy) is used
+    :return: str or None, None if no interpreter is found
+    """
+
+    executable = sys.executable
+    if not executable:
+        return None
+
+    name = os.path.splitext(os.path.basename(executable))[0].lower()
+    if name.startswith('python'):
+        return executable
+
+    directory = os.path.dirname(executable)
+    for interpreter_name in PYTHON_EXECUTABLES:
+        for extension in ('', '.exe'):
+            interpreter_path = os.path.join(directory, interpreter_name + extension)
+            if os.path.isfile(interpreter_path):
+                return interpreter_path
+
+    return None
+
+
+def _get_process_context():
+    """
+    Internal function that returns the multiprocessing context used to start script processes. Processes are always
+    spawned with a Python interpreter, so the DCC is never forked or started again
+    :return: multiprocessing context (or module in Python 2)
+    :raises RuntimeError: if script processes cannot be started in current environment
+    """
+
+    executable = _get_python_executable()
+    if not executable:
+        raise RuntimeError(
+            'Impossible to run option script in a process: no Python interpreter found next to "{}"'.format(
+                sys.executable))
+
+    get_context = getattr(multiprocessing, 'get_context', None)
+    if get_context is not None:
+        context = get_context('spawn')
+        context.set_executable(executable)
+        return context
+
+    # Python 2 only spawns processes in Windows; in other platforms current process would be forked
+    if os.name != 'nt' and executable != sys.executable:
+        raise RuntimeError('Impossible to run option script in a process: DCC process cannot be forked')
+    multiprocessing.set_executable(executable)
+
+    return multiprocessing
+
+
+def _run_in_process(code_snippet, options, messages):
+    """
+    Internal function that runs a script in a child process
+    :param code_snippet: str
+    :param options: dict
+    :param messages: multiprocessing.Queue, queue where output, errors and end of the script are sent
+    """
+
+    sys.stdout = _QueueOutput(messages)
+    try:
+        run_code_snippet(code_snippet, get_script_scope(options))
+    except Exception:
+        messages.put(('error', traceback.format_exc()))
+    else:
+        messages.put(('done', None))
@@ -0,0 +1,355 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains text search over option sets.
+Options are indexed by the trigrams of their path and value, so a search only verifies the options that contain all
+the trigrams of the searched text. Filters keep their last result, so typing more characters only narrows it.
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import logging
+
+from tpDcc.libs.options.core import backends
+
+LOGGER = logging.getLogger('tpDcc-libs-options')
+
+# Maximum number of characters of option values that are indexed
+MAX_VALUE_LENGTH = 128
+
+
+class OptionsSearchIndex(object):
+    """
+    Trigram index over the paths and values of the options of an option object. If the option object notifies its
+    changes (such as OptionStore), the index is updated incrementally with the modified paths.
+    """
+
+    def __init__(self, option_object=None):
+        """
+        :param option_object: object or None, option object whose options are indexed
+        """
+
+        self._option_object = option_object
+        self._texts = dict()
+        self._trigrams = dict()
+        self._version = 0
+
+        if option_object is not None:
+            self.build(option_object.get_options())
+            if hasattr(option_object, 'add_listener'):
+                option_object.add_listener(self._on_options_changed)
+
+    def __len__(self):
+        return len(self._texts)
+
+    def __contains__(self, path):
+        return path in self._texts
+
+    def get_version(self):
+        """
+        Returns a counter that is incremented each time indexed options change
+        :return: int
+        """
+
+        return self._version
+
+    def get_paths(self):
+        """
+        Returns the paths of all the indexed options
+        :return: list(str)
+        """
+
+        return list(self._texts.keys())
+
+    def close(self):
+        """
+        Stops tracking the changes of the option object
+        """
+
+        if self._option_object is not None and hasattr(self._option_object, 'remove_listener'):
+            self._option_object.remove_listener(self._on_options_changed)
+
+    def build(self, options):
+        """
+        Indexes the given options replacing the current ones
+        :param options: list, options with the format returned by option objects get_options function
+        """
+
+        self._texts = dict()
+        self._trigrams = dict()
+        for option in options:
+            path, value, _ = backends.split_option_value(*option)
+            self._add(path, value)
+        self._version += 1
+
+    def update(self, path, value=None, removed=False):
+        """
+        Updates the index of a single option
+        :param path: str
+        :param value: variant
+        :param removed: bool, whether the option was removed
+        """
+
+        self._remove(path)
+        if not removed:
+            self._add(path, value)
+        self._version += 1
+
+    def get_text(self, path):
+        """
+        Returns the indexed text of the option with given path
+        :param path: str
+        :return: str or None
+        """
+
+        return self._texts.get(path)
+
+    def search(self, text, fuzzy=False, candidates=None):
+        """
+        Returns the paths of the options whose path or value contains the given text (case insensitive)
+        :param text: str
+        :param fuzzy: bool, if True, options that contain most of the trigrams of the text (instead of the whole text)
+            are returned too, so typos are tolerated
+        :param candidates: iterable(str) or None, if given, only these paths are checked
+        :return: set(str)
+        """
+
+        text = text.lower()
+        texts = self._texts
+        if not text:
+            return set(texts if candidates is None else candidates)
+
+        trigrams = _get_trigrams(text)
+        if candidates is None and trigrams:
+            if fuzzy:
+                return self._search_fuzzy(text, trigrams)
+            postings = sorted((self._trigrams.get(trigram, ()) for trigram in trigrams), key=len)
+            candidates = set(postings[0]).intersection(*postings[1:]) if postings[0] else set()
+
+        if candidates is None:
+            candidates = texts
+
+        return set(path for path in candidates if text in texts.get(path, ''))
+
+    def _search_fuzzy(self, text, trigrams, similarity=0.6):
+        """
+        Internal function that returns the paths of the options that share most of the trigrams of the given text
+        :param text: str
+        :param trigrams: set(str)
+        :param similarity: float, minimum ratio of text trigrams that options must contain
+        :return: set(str)
+        """
+
+        hits = dict()
+        for trigram in trigrams:
+            for path in self._trigrams.get(trigram, ()):
+                hits[path] = hits.get(path, 0) + 1
+        min_hits = max(1, int(len(trigrams) * similarity + 0.5))
+
+        return set(path for path, count in hits.items() if count >= min_hits)
+
+    def _add(self, path, value):
+        """
+        Internal function that indexes the given option
+        :param path: str
+        :param value: variant
+        """
+
+        value_text = value if isinstance(value, backends.string_types) else str(value)
+        text = '{} {}'.format(path, value_text[:MAX_VALUE_LENGTH]).lower()
+        self._texts[path] = text
+        for trigram in _get_trigrams(text):
+            self._trigrams.setdefault(trigram, set()).add(path)
+
+    def _remove(self, path):
+        """
+        Internal function that removes the given option from the index
+        :param path: str
+        """
+
+        text = self._texts.pop(path, None)
+        if text is None:
+            return
+
+        for trigram in _get_trigrams(text):
+            paths = self._trigrams.get(trigram)
+            if paths is not None:
+                paths.discard(path)
+                if not paths:
+                    del self._trigrams[trigram]
+
+    def _on_options_changed(self, option_object, paths):
+        """
+        Internal callback function that is called each time the options of the option object change
+        :param option_object: object
+        :param paths: list(str) or None
+        """
+
+        if paths is None:
+            self.build(option_object.get_options())
+            return
+
+        for path in paths:
+            if path in option_object:
+                self.update(path, option_object.get_option(path))
+            else:
+                self.update(path, removed=True)
+
+
+class OptionsFilter(object):
+    """
+    Incremental filter over a search index. Each time filter text changes, only the options whose visibility changed
+    are returned. Groups are visible while any of their descendants matches.
+    """
+
+    def __init__(self, search_index, fuzzy=False):
+        """
+        :param search_index: OptionsSearchIndex
+        :param fuzzy: bool
+        """
+
+        self._index = search_index
+        self._fuzzy = fuzzy
+        self._text = ''
+        self._index_version = search_index.get_version()
+        self._matches = None
+        self._visible = None
+        self._descendants = dict()
+
+    def get_text(self):
+        """
+        Returns current filter text
+        :return: str
+        """
+
+        return self._text
+
+    def get_visible(self):
+        """
+        Returns the paths of the visible options
+        :return: set(str) or None, None if filter is not active (all options are visible)
+        """
+
+        return self._visible
+
+    def get_matching_groups(self):
+        """
+        Returns the paths of the groups that are visible because any of their descendants matches the filter
+        :return: set(str)
+        """
+
+        return set(self._descendants)
+
+    def reset(self):
+        """
+        Deactivates the filter
+        :return: tuple(set(str), set(str)), paths of the options to show and paths of the options to hide
+        """
+
+        return self.set_text('')
+
+    def set_text(self, text):
+        """
+        Sets filter text. If the new text contains the previous one, only previous matches are checked
+        :param text: str
+        :return: tuple(set(str), set(str)), paths of the options to show and paths of the options to hide
+        """
+
+        text = text.strip()
+        index_changed = self._index.get_version() != self._index_version
+        if not text:
+            self._text = text
+            self._matches = None
+            previous_visible, self._visible = self._visible, None
+            self._descendants = dict()
+            if previous_visible is None:
+                return set(), set()
+            return set(self._index.get_paths()) - previous_visible, set()
+
+        candidates = None
+        if self._matches is not None and not index_changed and not self._fuzzy and text.lower().find(
+                self._text.lower()) != -1:
+            candidates = self._matches
+        matches = self._index.search(text, fuzzy=self._fuzzy, candidates=candidates)
+
+        self._text = text
+        self._index_version = self._index.get_version()
+        previous_matches = self._matches
+        self._matches = matches
+
+        if previous_matches is None or index_changed:
+            return self._set_visible(matches)
+
+        to_show, to_hide = set(), set()
+        for path in matches - previous_matches:
+            if path not in self._visible:
+                to_show.add(path)
+            for group_path in _get_ancestors(path):
+                count = self._descendants.get(group_path, 0)
+                self._descendants[group_path] = count + 1
+                if not count and group_path not in previous_matches:
+                    to_show.add(group_path)
+        for path in previous_matches - matches:
+            if not self._descendants.get(path):
+                to_hide.add(path)
+            for group_path in _get_ancestors(path):
+                count = self._descendants.get(group_path, 0) - 1
+                if count > 0:
+                    self._descendants[group_path] = count
+                    continue
+                self._descendants.pop(group_path, None)
+                if group_path not in matches:
+                    to_hide.add(group_path)
+        # Groups that got and lost all their matching descendants were hidden before and remain hidden
+        unchanged = to_show & to_hide
+        to_show -= unchanged
+        to_hide -= unchanged
+        self._visible = (self._visible | to_show) - to_hide
+
+        return to_show, to_hide
+
+    def _set_visible(self, matches):
+        """
+        Internal function that computes from scratch the visible options of the given matches
+        :param matches: set(str)
+        :return: tuple(set(str), set(str)), paths of the options to show and paths of the options to hide
+        """
+
+        descendants = dict()
+        for path in matches:
+            for group_path in _get_ancestors(path):
+                descendants[group_path] = descendants.get(group_path, 0) + 1
+        visible = set(matches)
+        visible.update(descendants)
+
+        previous_visible = self._visible
+        if previous_visible is None:
+            previous_visible = set(self._index.get_paths())
+        self._descendants = descendants
+        self._visible = visible
+
+        return visible - previous_visible, previous_visible - visible
+
+
+def _get_trigrams(text):
+    """
+    Internal function that returns the trigrams of the given text
+    :param text: str
+    :return: set(str)
+    """
+
+    return set(text[i:i + 3] for i in range(len(text) - 2))
+
+
+def _get_ancestors(path):
+    """
+    Internal generator that returns the paths of the groups that contain the option with given path
+    :param path: str
+    :return: generator(str)
+    """
+
+    index = path.find('.')
+    while index != -1 and index < len(path) - 1:
+        yield path[:index + 1]
+        index = path.find('.', index + 1)
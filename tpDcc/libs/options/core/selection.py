@@ -0,0 +1,170 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains compact storage of large node selections.
+Component names that only differ in their last index are compressed into ranges using DCC notation (for example,
+50000 vertices become "pSphere1.vtx[0:49999]"), so big selections can be stored and displayed without building huge
+strings. Ranges are only expanded when individual names are requested.
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import re
+import sys
+import logging
+
+LOGGER = logging.getLogger('tpDcc-libs-options')
+
+# Maximum number of characters of selection summaries
+SUMMARY_LENGTH = 80
+
+_INDEX_PATTERN = re.compile(r'^(.*)\[(\d+)(?::(\d+))?\]$')
+
+try:
+    _intern = sys.intern
+except AttributeError:
+    _intern = intern
+
+
+class SelectionBuffer(object):
+    """
+    Immutable compressed selection
+    """
+
+    __slots__ = ('_items', '_count')
+
+    def __init__(self, names):
+        """
+        :param names: iterable(str), selected names. Names can already use range notation
+        """
+
+        self._items, self._count = compress_selection(names)
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        return expand_selection(self._items)
+
+    def __repr__(self):
+        return 'SelectionBuffer({})'.format(self.get_summary())
+
+    def get_items(self, expand=False):
+        """
+        Returns selected names
+        :param expand: bool, whether ranges are expanded into individual names
+        :return: list(str)
+        """
+
+        return list(expand_selection(self._items)) if expand else list(self._items)
+
+    def get_summary(self, max_length=SUMMARY_LENGTH):
+        """
+        Returns a short description of the selection
+        :param max_length: int, maximum number of characters of the listed names
+        :return: str
+        """
+
+        names = ', '.join(self._items)
+        if len(names) > max_length:
+            names = names[:max_length].rsplit(', ', 1)[0] + ', ...'
+
+        return '{} items: {}'.format(self._count, names)
+
+    def to_text(self):
+        """
+        Returns the selection as a list literal. Ranges are not expanded
+        :return: str
+        """
+
+        return str(self.get_items())
+
+
+def compress_selection(names):
+    """
+    Compresses given names into ranges. Selection order is kept: only names that follow each other and whose indices
+    are consecutive (ascending) are merged into a range; duplicated names are kept.
+    :param names: iterable(str)
+    :return: tuple(tuple(str), int), compressed names and number of selected names
+    """
+
+    items = list()
+    count = 0
+    run = None
+    for name in names:
+        match = _INDEX_PATTERN.match(name)
+        if match:
+            prefix, start, end = match.group(1), int(match.group(2)), match.group(3)
+            end = int(end) if end is not None else start
+            if run is not None and run[0] == prefix and start == run[2] + 1 and end >= start:
+                run[2] = end
+            else:
+                if run is not None:
+                    items.append(_get_range_name(*run))
+                run = [prefix, start, end]
+            count += end - start + 1
+            continue
+        if run is not None:
+            items.append(_get_range_name(*run))
+            run = None
+        items.append(_intern_name(name))
+        count += 1
+    if run is not None:
+        items.append(_get_range_name(*run))
+
+    return tuple(items), count
+
+
+def expand_selection(items):
+    """
+    Generator that expands the ranges of the given names
+    :param items: iterable(str), names that can use range notation
+    :return: generator(str)
+    """
+
+    for item in items:
+        match = _INDEX_PATTERN.match(item)
+        if not match or match.group(3) is None:
+            yield item
+            continue
+        prefix = match.group(1)
+        for index in range(int(match.group(2)), int(match.group(3)) + 1):
+            yield '{}[{}]'.format(prefix, index)
+
+
+def is_range_name(name):
+    """
+    Returns whether given name uses range notation (for example, "pSphere1.vtx[0:49999]")
+    :param name: str
+    :return: bool
+    """
+
+    match = _INDEX_PATTERN.match(name)
+
+    return bool(match and match.group(3) is not None)
+
+
+def _get_range_name(prefix, start, end):
+    """
+    Internal function that returns the name of the given range of indices
+    :param prefix: str, part of the name before the index
+    :param start: int
+    :param end: int
+    :return: str
+    """
+
+    prefix = _intern_name(prefix)
+
+    return '{}[{}]'.format(prefix, start) if start == end else '{}[{}:{}]'.format(prefix, start, end)
+
+
+def _intern_name(name):
+    """
+    Internal function that interns the given name, so names repeated across selections share memory. Unicode names
+    are not interned in Python 2
+    :param name: str
+    :return: str
+    """
+
+    return _intern(name) if isinstance(name, str) else name
@@ -0,0 +1,882 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains option store implementation. An option store is an option object (the object linked to an
+OptionsViewer) that keeps options in memory and persists them through a pluggable storage backend.
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import os
+import copy
+import bisect
+import logging
+import traceback
+import contextlib
+from collections import OrderedDict
+
+from tpDcc.libs.options.core import backends, writer, undo, query, diff, scripts, schema as options_schema
+
+LOGGER = logging.getLogger('tpDcc-libs-options')
+
+
+class OptionStore(object):
+    def __init__(self, option_file=None, backend=None, auto_save=True, write_behind=False, schema=None, sparse=False,
+                 undo_limit=100):
+        """
+        :param option_file: str or None, file where options are persisted
+        :param backend: str or OptionsBackend or None, if not given backend is resolved from file extension
+        :param auto_save: bool, whether options are saved into disk each time they are modified
+        :param write_behind: bool or WriteBehindWriter, whether saves are written into disk by a background thread
+        :param schema: OptionSchema or str or None, schema (or name of a registered schema) used to validate options.
+            If not given, the schema registered with the name stored in the options file metadata is used.
+        :param sparse: bool, whether only the options whose value differs from the schema default are stored. Default
+            values are materialized from the schema when options are read.
+        :param undo_limit: int, maximum number of changes that can be undone. If 0, changes are not recorded
+        """
+
+        self._option_file = option_file
+        self._backend = backends.get_backend(backend, file_path=option_file)
+        self._auto_save = auto_save
+        self._writer = None
+        self.set_write_behind(write_behind)
+        self._options = OrderedDict()
+        self._positions = None
+        self._metadata = dict()
+        self._batch_level = 0
+        self._changed_paths = set()
+        self._removed_paths = set()
+        self._full_write = False
+        self._version = 0
+        self._sparse = sparse
+        self._listeners = list()
+        self._index = None
+        self._undo_stack = undo.UndoStack(undo_limit) if undo_limit else None
+        self._schema = _resolve_schema(schema)
+        if self._schema:
+            self._metadata['schema'] = self._schema.name
+
+        if option_file and os.path.isfile(option_file):
+            self.load()
+
+    def __len__(self):
+        if not self._is_sparse():
+            return len(self._options)
+
+        return sum(1 for _ in self._iterate_options())
+
+    def __contains__(self, name):
+        return name in self._options or (self._is_sparse() and name in self._schema)
+
+    def __iter__(self):
+        return (path for path, _ in self._iterate_options())
+
+    # =================================================================================================================
+    # OPTION OBJECT INTERFACE
+    # =================================================================================================================
+
+    def get_option_file(self):
+        """
+        Returns file where options are stored
+        :return: str
+        """
+
+        return self._option_file
+
+    def set_option_file(self, option_file, backend=None, load=True):
+        """
+        Sets file where options are stored
+        :param option_file: str
+        :param backend: str or OptionsBackend or None
+        :param load: bool, whether to load the options stored in the file
+        """
+
+        self._option_file = option_file
+        self._backend = backends.get_backend(backend, file_path=option_file)
+        if load and option_file and os.path.isfile(option_file):
+            self.load()
+        else:
+            self._full_write = True
+
+    def get_version(self):
+        """
+        Returns a counter that is incremented each time the options of the store change. Viewers use it to know whether
+        options need to be reloaded without hashing their contents
+        :return: int
+        """
+
+        return self._version
+
+    def add_listener(self, callback):
+        """
+        Adds a function that is called each time options change
+        :param callback: callable, function that receives the store and the list of changed paths (None if any option
+            may have changed)
+        """
+
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        """
+        Removes a function added with add_listener
+        :param callback: callable
+        """
+
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def get_index(self):
+        """
+        Returns the index used to query options by path. Index is created the first time it is requested and then
+        updated incrementally each time options change
+        :return: OptionsIndex
+        """
+
+        if self._index is None:
+            self._index = query.OptionsIndex(self)
+
+        return self._index
+
+    def get_backend(self):
+        """
+        Returns backend used to persist options
+        :return: OptionsBackend
+        """
+
+        return self._backend
+
+    def has_options(self):
+        """
+        Returns whether the store has options or not
+        :return: bool
+        """
+
+        return bool(self._options) or bool(self._is_sparse() and len(self._schema))
+
+    def get_options(self):
+        """
+        Returns all options in display order with the format used by option lists:
+            [name, [value, option_type]] or [name, value] if option has no explicit type
+        :return: list
+        """
+
+        options = list()
+        for path, (value, option_type) in self._iterate_options():
+            options.append([path, [value, option_type]] if option_type else [path, value])
+
+        return options
+
+    def has_stored_option(self, name):
+        """
+        Returns whether the option with given name is stored. Schema defaults of sparse stores are not stored
+        :param name: str
+        :return: bool
+        """
+
+        return name in self._options
+
+    def get_option(self, name, default=None):
+        """
+        Returns the value of the option with given name
+        :param name: str
+        :param default: variant, value returned if option does not exist
+        :return: variant
+        """
+
+        if name not in self._options:
+            if self._is_sparse() and name in self._schema:
+                return self._schema.get_default(name)
+            return default
+
+        return self._options[name][0]
+
+    def get_option_type(self, name):
+        """
+        Returns the type of the option with given name
+        :param name: str
+        :return: str or None
+        """
+
+        if name not in self._options:
+            if self._is_sparse() and name in self._schema:
+                return self._schema.get_field(name).option_type
+            return None
+
+        return self._options[name][1]
+
+    def add_option(self, name, value, group=None, option_type=None):
+        """
+        Adds or updates an option
+        :param name: str
+        :param value: variant
+        :param group: str or None, name of the group the option belongs to
+        :param option_type: str or None
+        """
+
+        if group:
+            name = '{}.{}'.format(group, name)
+
+        if self._schema:
+            self._schema.validate_value(name, value, option_type)
+
+        current = self._options.get(name)
+        if current is not None and current[0] == value and current[1] == option_type:
+            return
+
+        if self._is_default(name, value, option_type):
+            if current is not None:
+                self._record(undo.Splice(self._get_index(name), ((name,) + current,), ()))
+                self._pop_option(name)
+                self._changed_paths.discard(name)
+                self._removed_paths.add(name)
+                self._on_changed([name])
+            return
+
+        if current is None:
+            self._record(undo.Splice(len(self._options), (), ((name, value, option_type),)))
+            self._full_write = True
+            if self._positions is not None:
+                self._positions.append(name)
+        else:
+            self._record(undo.ValueChange(name, current, (value, option_type)))
+        self._options[name] = (value, option_type)
+        self._changed_paths.add(name)
+        self._removed_paths.discard(name)
+        self._on_changed([name])
+
+    def set_option(self, name, value):
+        """
+        Sets the value of an option keeping its current type
+        :param name: str
+        :param value: variant
+        """
+
+        self.add_option(name, value, option_type=self.get_option_type(name))
+
+    def remove_option(self, name):
+        """
+        Removes option with given name
+        :param name: str
+        :return: bool
+        """
+
+        if name not in self._options:
+            return False
+
+        self._record(undo.Splice(self._get_index(name), ((name,) + self._options[name],), ()))
+        self._pop_option(name)
+        self._changed_paths.discard(name)
+        self._removed_paths.add(name)
+        self._on_changed([name])
+
+        return True
+
+    def clear_options(self):
+        """
+        Removes all the options
+        """
+
+        if not self._options:
+            return
+
+        self._record(undo.Splice(0, tuple(self.get_entries()), ()))
+        self._options.clear()
+        self._positions = None
+        self._changed_paths.clear()
+        self._removed_paths.clear()
+        self._full_write = True
+        self._on_changed()
+
+    def get_metadata(self, key, default=None):
+        """
+        Returns metadata value stored with given key
+        :param key: str
+        :param default: variant
+        :return: variant
+        """
+
+        return self._metadata.get(key, default)
+
+    def set_metadata(self, key, value):
+        """
+        Sets metadata value that is persisted together with the options
+        :param key: str
+        :param value: variant
+        """
+
+        self._metadata[key] = value
+        self._full_write = True
+        self._on_changed()
+
+    def is_sparse(self):
+        """
+        Returns whether only the options that differ from the schema defaults are stored
+        :return: bool
+        """
+
+        return self._sparse
+
+    def set_sparse(self, flag):
+        """
+        Sets whether only the options that differ from the schema defaults are stored
+        :param flag: bool
+        """
+
+        if flag == self._sparse:
+            return
+
+        entries = self.get_entries(materialize=True)
+        self._sparse = flag
+        self._options = OrderedDict(
+            (path, (value, option_type)) for path, value, option_type in self._strip_defaults(entries))
+        self._positions = None
+        self._full_write = True
+        if self._undo_stack is not None:
+            self._undo_stack.clear()
+        self._on_changed()
+
+    def get_schema(self):
+        """
+        Returns schema used to validate options
+        :return: OptionSchema or None
+        """
+
+        return self._schema
+
+    def set_schema(self, schema):
+        """
+        Sets schema used to validate options. Schema name is stored in options metadata
+        :param schema: OptionSchema or str or None, schema or name of a registered schema
+        """
+
+        schema = _resolve_schema(schema)
+        self._schema = schema
+        if schema and self._metadata.get('schema') != schema.name:
+            self.set_metadata('schema', schema.name)
+
+    def validate(self, entries=None):
+        """
+        Validates options in a single pass
+        :param entries: list(tuple(str, object, str)) or None, entries to validate. If not given, current options
+            are validated
+        :raises OptionValidationError: if any option is not valid
+        """
+
+        self._validate_entries(entries if entries is not None else self.get_entries(), self._schema)
+
+    def run_code_snippet(self, code_snippet):
+        """
+        Executes given code snippet. Option store is available in the snippet scope as "options"
+        :param code_snippet: str
+        """
+
+        scripts.run_code_snippet(code_snippet, scripts.get_script_scope(self))
+
+    # =================================================================================================================
+    # PERSISTENCE
+    # =================================================================================================================
+
+    def get_entries(self, materialize=False):
+        """
+        Returns options as backend entries
+        :param materialize: bool, whether to include the default values of sparse stores
+        :return: list(tuple(str, object, str))
+        """
+
+        items = self._iterate_options() if materialize else self._options.items()
+
+        return [(path, value, option_type) for path, (value, option_type) in items]
+
+    def set_entries(self, entries, metadata=None):
+        """
+        Replaces all options with the given backend entries. Only the options that actually changed are recorded into
+        the undo history and, if the options structure did not change, saved into disk.
+        :param entries: list(tuple(str, object, str))
+        :param metadata: dict or None
+        """
+
+        self.validate(entries)
+        entries = self._strip_defaults(entries)
+        options = OrderedDict((path, (value, option_type)) for path, value, option_type in entries)
+        changes = undo.get_changes(self._options, options)
+        if not changes and metadata is None:
+            return
+
+        self._options = options
+        self._positions = None
+        for change in changes:
+            self._record(change)
+            if isinstance(change, undo.ValueChange):
+                self._changed_paths.add(change.path)
+            else:
+                self._full_write = True
+        if metadata is not None:
+            self._metadata = dict(metadata)
+            if self._schema:
+                self._metadata['schema'] = self._schema.name
+            self._full_write = True
+        self._on_changed(_get_changed_paths(changes) if metadata is None else None)
+
+    def load(self, option_file=None):
+        """
+        Loads options from disk
+        :param option_file: str or None, if not given current option file is used
+        """
+
+        option_file = option_file or self._option_file
+        self.flush(option_file)
+        if not option_file or not os.path.isfile(option_file):
+            LOGGER.warning('Impossible to load options because options file "{}" does not exist!'.format(option_file))
+            return
+
+        entries, metadata = self._backend.read(option_file)
+        schema = self._schema or options_schema.get_schema(metadata.get('schema'))
+        self._validate_entries(entries, schema)
+        self._schema = schema
+        if schema:
+            metadata['schema'] = schema.name
+        entries = self._strip_defaults(entries)
+        self._options = OrderedDict((path, (value, option_type)) for path, value, option_type in entries)
+        self._positions = None
+        self._metadata = metadata
+        self._version += 1
+        self._reset_changes()
+        if self._undo_stack is not None:
+            self._undo_stack.clear()
+        self._notify_listeners(None)
+
+    def is_file_modified(self, option_file=None):
+        """
+        Returns whether the options stored in disk differ from the options in memory (for example, because the file
+        was edited by another tool). Saves that are not written into disk yet are not taken into account
+        :param option_file: str or None, if not given current option file is used
+        :return: bool
+        """
+
+        option_file = option_file or self._option_file
+        if not option_file or not os.path.isfile(option_file):
+            return False
+
+        entries, metadata = self._backend.read(option_file)
+        if self._schema:
+            metadata['schema'] = self._schema.name
+        if metadata != self._metadata:
+            return True
+        entries = self._strip_defaults(entries)
+        if len(entries) != len(self._options):
+            return True
+        for (path, value, option_type), (stored_path, (stored_value, stored_type)) in zip(
+                entries, self._options.items()):
+            if path != stored_path or option_type != stored_type or not diff.are_values_equal(value, stored_value):
+                return True
+
+        return False
+
+    def save(self, option_file=None):
+        """
+        Saves options into disk
+        :param option_file: str or None, if not given current option file is used
+        """
+
+        option_file = option_file or self._option_file
+        if not option_file:
+            LOGGER.warning('Impossible to save options because options file is not defined!')
+            return
+
+        full_write = option_file != self._option_file or self._full_write
+        if self._writer:
+            # Changes of a failed write were already reset, so the whole file is written again
+            full_write = full_write or self._writer.get_error(option_file) is not None
+            # Snapshot is read from the writer thread, so it cannot share mutable values with the stored options
+            self._writer.submit(
+                option_file, self._backend, _copy_entries(self.get_entries()), copy.deepcopy(self._metadata),
+                list(self._changed_paths), list(self._removed_paths), full_write=full_write)
+        elif full_write:
+            self._backend.write(option_file, self.get_entries(), self._metadata)
+        else:
+            self._backend.write_changes(
+                option_file, self.get_entries(), list(self._changed_paths), list(self._removed_paths), self._metadata)
+        self._reset_changes()
+
+    def is_write_behind(self):
+        """
+        Returns whether saves are written into disk by a background thread
+        :return: bool
+        """
+
+        return self._writer is not None
+
+    def set_write_behind(self, write_behind):
+        """
+        Sets whether saves are written into disk by a background thread.
+        :param write_behind: bool or WriteBehindWriter, if True the writer shared by all stores is used
+        """
+
+        if not write_behind:
+            self.flush()
+            self._writer = None
+        elif isinstance(write_behind, writer.WriteBehindWriter):
+            self._writer = write_behind
+        else:
+            self._writer = writer.get_writer()
+
+    def pending(self, option_file=None):
+        """
+        Returns the number of saves of this store that are not written into disk yet
+        :param option_file: str or None, if not given current option file is used
+        :return: int
+        """
+
+        option_file = option_file or self._option_file
+        if not self._writer or not option_file:
+            return 0
+
+        return self._writer.pending(option_file)
+
+    def flush(self, option_file=None, timeout=None):
+        """
+        Blocks until all the saves of this store are written into disk
+        :param option_file: str or None, if not given current option file is used
+        :param timeout: float or None, maximum number of seconds to wait
+        :return: bool, True if all the saves were written
+        """
+
+        option_file = option_file or self._option_file
+        if not self._writer or not option_file:
+            return True
+
+        return self._writer.flush(option_file, timeout=timeout)
+
+    def is_dirty(self):
+        """
+        Returns whether there are changes not saved into disk. Stores whose last write-behind save failed are dirty
+        :return: bool
+        """
+
+        if self._full_write or self._changed_paths or self._removed_paths:
+            return True
+
+        return bool(self._writer and self._option_file and self._writer.get_error(self._option_file))
+
+    @contextlib.contextmanager
+    def batch(self, label=None):
+        """
+        Context manager that groups several modifications into a single save and a single undo entry
+        :param label: str or None, label of the undo entry
+        """
+
+        self._batch_level += 1
+        try:
+            if self._undo_stack is not None:
+                with self._undo_stack.macro(label):
+                    yield self
+            else:
+                yield self
+        finally:
+            self._batch_level -= 1
+            if not self._batch_level and self._auto_save and self._option_file and self.is_dirty():
+                self.save()
+
+    # =================================================================================================================
+    # UNDO
+    # =================================================================================================================
+
+    def get_undo_stack(self):
+        """
+        Returns the undo history of the store
+        :return: UndoStack or None
+        """
+
+        return self._undo_stack
+
+    def undo(self):
+        """
+        Reverts the last recorded change
+        :return: bool, True if a change was reverted
+        """
+
+        entry = self._undo_stack.take_undo() if self._undo_stack is not None else None
+        if not entry:
+            return False
+
+        self._apply_changes(entry.changes, revert=True)
+
+        return True
+
+    def redo(self):
+        """
+        Applies again the last reverted change
+        :return: bool, True if a change was applied
+        """
+
+        entry = self._undo_stack.take_redo() if self._undo_stack is not None else None
+        if not entry:
+            return False
+
+        self._apply_changes(entry.changes, revert=False)
+
+        return True
+
+    def _record(self, change):
+        """
+        Internal function that records given change into the undo history
+        :param change: ValueChange or Splice
+        """
+
+        if self._undo_stack is not None:
+            self._undo_stack.push(change)
+
+    def _get_index(self, path):
+        """
+        Internal function that returns the position of the stored option with given path
+        :param path: str
+        :return: int
+        """
+
+        if self._positions is None:
+            self._positions = _OptionPositions(self._options)
+
+        return self._positions.get_index(path)
+
+    def _pop_option(self, path):
+        """
+        Internal function that removes the stored option with given path, keeping option positions updated
+        :param path: str
+        :return: tuple(object, str), value and type of the removed option
+        """
+
+        if self._positions is not None:
+            self._positions.remove(path)
+            if self._positions.is_fragmented():
+                self._positions = None
+
+        return self._options.pop(path)
+
+    def _apply_changes(self, changes, revert=False):
+        """
+        Internal function that applies or reverts the given recorded changes
+        :param changes: list(ValueChange or Splice)
+        :param revert: bool
+        """
+
+        with self._undo_stack.applying(), self.batch():
+            for change in (reversed(changes) if revert else changes):
+                if isinstance(change, undo.ValueChange):
+                    self._options[change.path] = change.old_item if revert else change.new_item
+                    self._changed_paths.add(change.path)
+                    continue
+                old_items, new_items = change.old_items, change.new_items
+                if revert:
+                    old_items, new_items = new_items, old_items
+                items = list(self._options.items())
+                items[change.index:change.index + len(old_items)] = [
+                    (path, (value, option_type)) for path, value, option_type in new_items]
+                self._options = OrderedDict(items)
+                self._positions = None
+                self._removed_paths.update(item[0] for item in old_items)
+                self._removed_paths.difference_update(item[0] for item in new_items)
+                self._changed_paths.difference_update(self._removed_paths)
+                self._changed_paths.update(item[0] for item in new_items)
+                self._full_write = True
+            self._on_changed(_get_changed_paths(changes))
+
+    def _is_sparse(self):
+        """
+        Internal function that returns whether default values are currently omitted from the stored options
+        :return: bool
+        """
+
+        return self._sparse and self._schema is not None
+
+    def _is_default(self, path, value, option_type):
+        """
+        Internal function that returns whether given option value is the schema default of a sparse store
+        :param path: str
+        :param value: variant
+        :param option_type: str or None
+        :return: bool
+        """
+
+        if not self._is_sparse():
+            return False
+
+        field = self._schema.get_field(path)
+        if field is None or (option_type and option_type != field.option_type):
+            return False
+
+        return diff.are_values_equal(value, field.default)
+
+    def _strip_defaults(self, entries):
+        """
+        Internal function that removes the entries with default values if the store is sparse
+        :param entries: list(tuple(str, object, str))
+        :return: list(tuple(str, object, str))
+        """
+
+        if not self._is_sparse():
+            return entries
+
+        return [entry for entry in entries if not self._is_default(*entry)]
+
+    def _iterate_options(self):
+        """
+        Internal generator that iterates over all options. Default values of sparse stores are materialized from the
+        schema: schema options are returned in schema order followed by the options not declared in the schema.
+        :return: generator(tuple(str, tuple(object, str)))
+        """
+
+        if not self._is_sparse():
+            for item in self._options.items():
+                yield item
+            return
+
+        options = self._options
+        for path, field in self._schema:
+            item = options.get(path)
+            yield path, item if item is not None else (field.default, field.option_type)
+        for path, item in options.items():
+            if path not in self._schema:
+                yield path, item
+
+    def _validate_entries(self, entries, schema):
+        """
+        Internal function that validates given entries with given schema
+        :param entries: list(tuple(str, object, str))
+        :param schema: OptionSchema or None
+        :raises OptionValidationError: if any option is not valid
+        """
+
+        if not schema:
+            return
+
+        schema.validate([[path, [value, option_type]] if option_type else [path, value]
+                         for path, value, option_type in entries])
+
+    def _reset_changes(self):
+        """
+        Internal function that resets the tracked changes
+        """
+
+        self._changed_paths.clear()
+        self._removed_paths.clear()
+        self._full_write = False
+
+    def _notify_listeners(self, paths):
+        """
+        Internal function that notifies listeners about option changes
+        :param paths: list(str) or None, changed option paths. None means that any option may have changed
+        """
+
+        for listener in list(self._listeners):
+            try:
+                listener(self, paths)
+            except Exception:
+                LOGGER.error('Error while notifying options changes: {}'.format(traceback.format_exc()))
+
+    def _on_changed(self, paths=None):
+        """
+        Internal function that is called each time options are modified
+        :param paths: list(str) or None, changed option paths. None means that any option may have changed
+        """
+
+        self._version += 1
+        self._notify_listeners(paths)
+        if self._batch_level or not self._auto_save or not self._option_file:
+            return
+
+        self.save()
+
+
+class _OptionPositions(object):
+    """
+    Positions of the options of a store, used to record removals in the undo history without scanning the options.
+    Removed options leave a hole, so a removal does not shift the positions of the following options.
+    """
+
+    def __init__(self, paths):
+        """
+        :param paths: iterable(str), option paths in display order
+        """
+
+        self._positions = dict((path, position) for position, path in enumerate(paths))
+        self._holes = list()
+        self._size = len(self._positions)
+
+    def append(self, path):
+        self._positions[path] = self._size
+        self._size += 1
+
+    def remove(self, path):
+        position = self._positions.pop(path, None)
+        if position is not None:
+            bisect.insort(self._holes, position)
+
+    def get_index(self, path):
+        """
+        Returns the index of the option with given path
+        :param path: str
+        :return: int, -1 if option is not stored
+        """
+
+        position = self._positions.get(path)
+        if position is None:
+            return -1
+
+        return position - bisect.bisect_left(self._holes, position)
+
+    def is_fragmented(self):
+        """
+        Returns whether there are more holes than options, so positions are worth computing again
+        :return: bool
+        """
+
+        return len(self._holes) > len(self._positions)
+
+
+def _copy_entries(entries):
+    """
+    Internal function that returns a copy of the given entries whose mutable values (lists, dictionaries...) are
+    copied too
+    :param entries: list(tuple(str, object, str))
+    :return: list(tuple(str, object, str))
+    """
+
+    return [
+        (path, copy.deepcopy(value) if isinstance(value, (list, tuple, dict)) else value, option_type)
+        for path, value, option_type in entries]
+
+
+def _resolve_schema(schema):
+    """
+    Internal function that returns the schema instance of the given schema or registered schema name
+    :param schema: OptionSchema or str or None
+    :return: OptionSchema or None
+    """
+
+    if not schema or isinstance(schema, options_schema.OptionSchema):
+        return schema
+
+    schema_instance = options_schema.get_schema(schema)
+    if not schema_instance:
+        raise ValueError('Options schema "{}" is not registered!'.format(schema))
+
+    return schema_instance
+
+
+def _get_changed_paths(changes):
+    """
+    Internal function that returns the paths of the options modified by the given recorded changes
+    :param changes: list(ValueChange or Splice)
+    :return: list(str)
+    """
+
+    paths = list()
+    for change in changes:
+        if isinstance(change, undo.ValueChange):
+            paths.append(change.path)
+        else:
+            paths.extend(item[0] for item in change.old_items + change.new_items)
+
+    return paths
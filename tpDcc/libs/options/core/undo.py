@@ -0,0 +1,290 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains undo support for option stores.
+Undo entries only store the inverse of the operations done (the old and the new state of the modified options), never
+full snapshots of the option set.
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import contextlib
+from collections import namedtuple, deque
+
+# Change of the value or the type of an option that keeps its position
+# path: option path
+# old_item: tuple(object, str), value and option type before the change
+# new_item: tuple(object, str), value and option type after the change
+ValueChange = namedtuple('ValueChange', ['path', 'old_item', 'new_item'])
+
+# Structural change: the options in the range [index, index + len(old_items)) are replaced with new_items
+# index: position of the first replaced option
+# old_items: tuple(tuple(str, object, str)), options before the change
+# new_items: tuple(tuple(str, object, str)), options after the change
+Splice = namedtuple('Splice', ['index', 'old_items', 'new_items'])
+
+
+class UndoEntry(object):
+    """
+    Group of changes that are undone and redone together
+    """
+
+    __slots__ = ('label', 'changes')
+
+    def __init__(self, label=None, changes=None):
+        self.label = label
+        self.changes = changes or list()
+
+    def __repr__(self):
+        return 'UndoEntry({}, changes={})'.format(self.label, len(self.changes))
+
+    def is_value_change(self):
+        """
+        Returns whether the entry only changes the value of a single option
+        :return: bool
+        """
+
+        return len(self.changes) == 1 and isinstance(self.changes[0], ValueChange)
+
+    def merge(self, newer_entry):
+        """
+        Merges given entry into this one if both change the value of the same single option
+        :param newer_entry: UndoEntry
+        :return: bool, True if the entry was merged
+        """
+
+        if not self.is_value_change() or not newer_entry.is_value_change():
+            return False
+
+        change, newer_change = self.changes[0], newer_entry.changes[0]
+        if change.path != newer_change.path:
+            return False
+
+        self.changes[0] = ValueChange(change.path, change.old_item, newer_change.new_item)
+
+        return True
+
+
+class UndoStack(object):
+    """
+    Memory bounded undo history. Once the limit of entries is reached, the oldest entries are discarded.
+    """
+
+    def __init__(self, limit=100):
+        """
+        :param limit: int, maximum number of entries that can be undone
+        """
+
+        self._undo_entries = deque(maxlen=limit)
+        self._redo_entries = list()
+        self._macro_entry = None
+        self._macro_level = 0
+        self._applying = False
+        self._can_merge = False
+
+    def __len__(self):
+        return len(self._undo_entries)
+
+    def get_limit(self):
+        """
+        Returns the maximum number of entries that can be undone
+        :return: int
+        """
+
+        return self._undo_entries.maxlen
+
+    def set_limit(self, limit):
+        """
+        Sets the maximum number of entries that can be undone. Oldest entries that exceed the limit are discarded
+        :param limit: int
+        """
+
+        self._undo_entries = deque(self._undo_entries, maxlen=limit)
+
+    def can_undo(self):
+        """
+        Returns whether there are entries to undo
+        :return: bool
+        """
+
+        return bool(self._undo_entries)
+
+    def can_redo(self):
+        """
+        Returns whether there are entries to redo
+        :return: bool
+        """
+
+        return bool(self._redo_entries)
+
+    def get_undo_label(self):
+        """
+        Returns the label of the entry that will be undone next
+        :return: str or None
+        """
+
+        return self._undo_entries[-1].label if self._undo_entries else None
+
+    def get_redo_label(self):
+        """
+        Returns the label of the entry that will be redone next
+        :return: str or None
+        """
+
+        return self._redo_entries[-1].label if self._redo_entries else None
+
+    def is_applying(self):
+        """
+        Returns whether an entry is being undone or redone. Changes done while applying entries are not recorded
+        :return: bool
+        """
+
+        return self._applying
+
+    def clear(self):
+        """
+        Removes all the entries of the history
+        """
+
+        self._undo_entries.clear()
+        self._redo_entries = list()
+        self._can_merge = False
+
+    def push(self, change, label=None):
+        """
+        Records a new change. Changes recorded inside a macro are grouped into a single entry
+        :param change: ValueChange or Splice
+        :param label: str or None
+        """
+
+        if self._applying:
+            return
+
+        if self._macro_entry is not None:
+            self._macro_entry.changes.append(change)
+            return
+
+        self._push_entry(UndoEntry(label, [change]))
+
+    @contextlib.contextmanager
+    def macro(self, label=None):
+        """
+        Context manager that groups all the changes recorded inside it into a single entry
+        :param label: str or None
+        """
+
+        if self._applying:
+            yield
+            return
+
+        self._macro_level += 1
+        if self._macro_entry is None:
+            self._macro_entry = UndoEntry(label)
+        elif label and not self._macro_entry.label:
+            self._macro_entry.label = label
+        try:
+            yield
+        finally:
+            self._macro_level -= 1
+            if not self._macro_level:
+                entry, self._macro_entry = self._macro_entry, None
+                if entry.changes:
+                    self._push_entry(entry)
+
+    def take_undo(self):
+        """
+        Moves the last entry into the redo history and returns it so its changes can be reverted
+        :return: UndoEntry or None
+        """
+
+        if not self._undo_entries:
+            return None
+
+        entry = self._undo_entries.pop()
+        self._redo_entries.append(entry)
+        self._can_merge = False
+
+        return entry
+
+    def take_redo(self):
+        """
+        Moves the last undone entry back into the undo history and returns it so its changes can be applied again
+        :return: UndoEntry or None
+        """
+
+        if not self._redo_entries:
+            return None
+
+        entry = self._redo_entries.pop()
+        self._undo_entries.append(entry)
+        self._can_merge = False
+
+        return entry
+
+    @contextlib.contextmanager
+    def applying(self):
+        """
+        Context manager used while the changes of an entry are undone or redone, so they are not recorded again
+        """
+
+        self._applying = True
+        try:
+            yield
+        finally:
+            self._applying = False
+
+    def _push_entry(self, entry):
+        """
+        Internal function that adds a new entry into the history. Consecutive changes of the value of the same option
+        (for example, while dragging a slider) are merged into a single entry.
+        :param entry: UndoEntry
+        """
+
+        self._redo_entries = list()
+        if self._can_merge and self._undo_entries and self._undo_entries[-1].merge(entry):
+            last_change = self._undo_entries[-1].changes[0]
+            if last_change.old_item == last_change.new_item:
+                self._undo_entries.pop()
+                self._can_merge = False
+            return
+
+        self._undo_entries.append(entry)
+        self._can_merge = True
+
+
+def get_changes(old_options, new_options):
+    """
+    Returns the minimal changes needed to update the given old options into the new ones.
+    Options kept in the same position only record their value changes. Paths that were added, removed or moved are
+    recorded as a single splice of the smallest range that contains them.
+    :param old_options: OrderedDict, option path: (value, option type)
+    :param new_options: OrderedDict, option path: (value, option type)
+    :return: list(ValueChange or Splice)
+    """
+
+    old_paths = list(old_options.keys())
+    new_paths = list(new_options.keys())
+
+    start = 0
+    max_start = min(len(old_paths), len(new_paths))
+    while start < max_start and old_paths[start] == new_paths[start]:
+        start += 1
+    old_end, new_end = len(old_paths), len(new_paths)
+    while old_end > start and new_end > start and old_paths[old_end - 1] == new_paths[new_end - 1]:
+        old_end -= 1
+        new_end -= 1
+
+    changes = list()
+    for path in old_paths[:start] + old_paths[old_end:]:
+        old_item, new_item = old_options[path], new_options[path]
+        if old_item != new_item:
+            changes.append(ValueChange(path, old_item, new_item))
+
+    if start < old_end or start < new_end:
+        changes.append(Splice(
+            start,
+            tuple((path,) + tuple(old_options[path]) for path in old_paths[start:old_end]),
+            tuple((path,) + tuple(new_options[path]) for path in new_paths[start:new_end])))
+
+    return changes
@@ -0,0 +1,61 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains utility functions for tpDcc-libs-options
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import os
+import json
+import hashlib
+
+
+def get_options_hash(options):
+    """
+    Returns a hash of the contents of the given options
+    :param options: list, options with the format returned by option objects get_options function
+    :return: str
+    """
+
+    data = json.dumps(options, sort_keys=True, default=repr)
+    if not isinstance(data, bytes):
+        data = data.encode('utf-8')
+
+    return hashlib.sha1(data).hexdigest()
+
+
+def get_file_hash(file_path, chunk_size=1024 * 1024):
+    """
+    Returns a hash of the contents of the given file
+    :param file_path: str
+    :param chunk_size: int
+    :return: str or None
+    """
+
+    if not file_path or not os.path.isfile(file_path):
+        return None
+
+    file_hash = hashlib.sha1()
+    with open(file_path, 'rb') as fh:
+        for chunk in iter(lambda: fh.read(chunk_size), b''):
+            file_hash.update(chunk)
+
+    return file_hash.hexdigest()
+
+
+def are_files_identical(file_path, other_file_path):
+    """
+    Returns whether the contents of both files are byte identical
+    :param file_path: str
+    :param other_file_path: str
+    :return: bool
+    """
+
+    if not os.path.isfile(file_path) or not os.path.isfile(other_file_path):
+        return False
+    if os.path.getsize(file_path) != os.path.getsize(other_file_path):
+        return False
+
+    return get_file_hash(file_path) == get_file_hash(other_file_path)
@@ -10,18 +10,24 @@ from __future__ import print_function, division, absolute_import
 import os
 import logging
 
-from Qt.QtCore import Qt, Signal
-from Qt.QtWidgets import QSizePolicy, QWidget, QFrame, QScrollArea, QDialogButtonBox
+from Qt.QtCore import Qt, Signal, QTimer
+from Qt.QtWidgets import QSizePolicy, QWidget, QFrame, QScrollArea, QDialogButtonBox, QShortcut, QComboBox, QLineEdit
+from Qt.QtWidgets import QDoubleSpinBox
+from Qt.QtGui import QKeySequence
 
 from tpDcc.managers import resources
 from tpDcc.libs.python import fileio
-from tpDcc.libs.qt.core import base
+from tpDcc.libs.qt.core import base, qtutils
 from tpDcc.libs.qt.widgets import layouts, buttons, dividers, messagebox
 
-from tpDcc.libs.options.core import optionlist
+from tpDcc.libs.options.core import utils, backends, watcher, schema, presets, search, diff, merge, paths, multiedit
+from tpDcc.libs.options.core import expressions, optionlist
 
 LOGGER = logging.getLogger('tpDcc-libs-options')
 
+# Milliseconds to wait after the last write of the option list before refreshing the state tracked by the viewer
+OPTIONS_WRITTEN_DELAY = 250
+
 
 class OptionsViewer(base.BaseWidget):
 
@@ -36,6 +42,20 @@ class OptionsViewer(base.BaseWidget):
         self._edit_mode = False
         self._current_widgets = list()
         self._widget_to_copy = None
+        self._options_signature = None
+        self._options_watcher = None
+        self._watched_options = None
+        self._presets_manager = None
+        self._search_index = None
+        self._options_filter = None
+        self._option_widgets = None
+        self._diff_reference = None
+        self._options_diff = None
+        self._highlighted_paths = dict()
+        self._merge_on_drop = False
+        self._merge_base = None
+        self._merge_conflicts = list()
+        self._expression_graph = None
 
         super(OptionsViewer, self).__init__(parent)
 
@@ -88,8 +108,44 @@ class OptionsViewer(base.BaseWidget):
         top_layout.addWidget(self.move_down_btn)
         top_layout.addWidget(self.remove_btn)
         top_layout.addStretch()
+        self._presets_combo = QComboBox(parent=self)
+        self._presets_combo.setToolTip('Presets')
+        self._save_preset_btn = buttons.BaseButton(parent=self)
+        self._save_preset_btn.setIcon(resources.icon('save'))
+        self._save_preset_btn.setToolTip('Save Preset')
+        self._presets_combo.setVisible(False)
+        self._save_preset_btn.setVisible(False)
+        top_layout.addWidget(self._presets_combo)
+        top_layout.addWidget(self._save_preset_btn)
         self.main_layout.addWidget(dividers.Divider())
 
+        self._multi_edit_widget = QWidget()
+        multi_edit_layout = layouts.HorizontalLayout()
+        multi_edit_layout.setContentsMargins(0, 0, 0, 0)
+        multi_edit_layout.setSpacing(2)
+        self._multi_edit_widget.setLayout(multi_edit_layout)
+        self._multi_edit_mode_combo = QComboBox(parent=self)
+        self._multi_edit_mode_combo.setToolTip('Edit mode applied to all selected numeric options')
+        self._multi_edit_mode_combo.addItem('Set', multiedit.EditMode.ABSOLUTE)
+        self._multi_edit_mode_combo.addItem('Add', multiedit.EditMode.RELATIVE)
+        self._multi_edit_mode_combo.addItem('Multiply', multiedit.EditMode.SCALE)
+        self._multi_edit_amount_spn = QDoubleSpinBox(parent=self)
+        self._multi_edit_amount_spn.setRange(-999999, 999999)
+        self._multi_edit_amount_spn.setDecimals(3)
+        self._multi_edit_apply_btn = buttons.BaseButton('Apply', parent=self)
+        self._multi_edit_apply_btn.setToolTip('Apply edit to all selected numeric options')
+        multi_edit_layout.addWidget(self._multi_edit_mode_combo)
+        multi_edit_layout.addWidget(self._multi_edit_amount_spn)
+        multi_edit_layout.addWidget(self._multi_edit_apply_btn)
+        multi_edit_layout.addStretch()
+        self._multi_edit_widget.setVisible(False)
+        self.main_layout.addWidget(self._multi_edit_widget)
+
+        self._filter_line = QLineEdit(parent=self)
+        self._filter_line.setPlaceholderText('Filter options...')
+        self._filter_line.setClearButtonEnabled(True)
+        self.main_layout.addWidget(self._filter_line)
+
         self._scroll = QScrollArea()
         self._scroll.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         self._scroll.setFocusPolicy(Qt.NoFocus)
@@ -100,11 +156,28 @@ class OptionsViewer(base.BaseWidget):
 
         self.main_layout.addWidget(self._scroll)
 
+        self._undo_shortcut = QShortcut(QKeySequence.Undo, self)
+        self._undo_shortcut.setContext(Qt.WidgetWithChildrenShortcut)
+        self._redo_shortcut = QShortcut(QKeySequence.Redo, self)
+        self._redo_shortcut.setContext(Qt.WidgetWithChildrenShortcut)
+
+        self._options_written_timer = QTimer(self)
+        self._options_written_timer.setSingleShot(True)
+        self._options_written_timer.setInterval(OPTIONS_WRITTEN_DELAY)
+
     def setup_signals(self):
         self._edit_mode_btn.toggled.connect(self._on_edit_mode)
         self._move_up_btn.clicked.connect(self._on_move_up)
         self.move_down_btn.clicked.connect(self._on_move_down)
         self.remove_btn.clicked.connect(self._on_remove)
+        self._undo_shortcut.activated.connect(self.undo)
+        self._presets_combo.activated.connect(self._on_preset_selected)
+        self._filter_line.textChanged.connect(self._on_filter_text_changed)
+        self._save_preset_btn.clicked.connect(self._on_save_preset)
+        self._redo_shortcut.activated.connect(self.redo)
+        self._multi_edit_apply_btn.clicked.connect(self._on_multi_edit)
+        self._options_list.valueChanged.connect(self._on_options_written)
+        self._options_written_timer.timeout.connect(self._refresh_written_options)
 
     def dragEnterEvent(self, event):
         if self._option_object and event.mimeData().hasFormat("text/uri-list"):
@@ -123,19 +196,42 @@ class OptionsViewer(base.BaseWidget):
             return
 
         options_file = self._option_object.get_option_file()
+        self._flush_option_object()
         if not options_file or not os.path.isfile(options_file):
             return
 
+        if utils.are_files_identical(options_file_to_load, options_file):
+            LOGGER.info('Dropped options file is identical to current one. Nothing to load.')
+            return
+
+        if self._merge_on_drop and self._merge_base is not None:
+            self._merge_options_file(options_file_to_load)
+            return
+
         if not fileio.is_file_empty(options_file):
             permission = messagebox.MessageBox.question(
                 self, 'Overwriting Options', 'Current options will be overwritten. Do you want to continue?')
             if permission != QDialogButtonBox.Yes:
                 return
 
-        options_text = fileio.get_file_text(options_file_to_load)
-        fileio.write_to_file(options_file, options_text)
+        if hasattr(self._option_object, 'set_entries'):
+            # Option stores can import files stored with any backend
+            entries, metadata = backends.get_backend(file_path=options_file_to_load).read(options_file_to_load)
+            try:
+                self._option_object.set_entries(entries, metadata)
+            except schema.OptionValidationError as exc:
+                LOGGER.error('Impossible to load options from "{}": {}'.format(options_file_to_load, exc))
+                return
+        else:
+            options_text = fileio.get_file_text(options_file_to_load)
+            fileio.write_to_file(options_file, options_text)
 
         self.update_options()
+        self._update_merge_base()
+
+    def closeEvent(self, event):
+        self._flush_option_object()
+        super(OptionsViewer, self).closeEvent(event)
 
     def settings(self):
         """
@@ -168,10 +264,21 @@ class OptionsViewer(base.BaseWidget):
         :param force_update: bool
         """
 
+        if option_object is not self._option_object:
+            self._options_written_timer.stop()
+            self._options_signature = None
+            if self._presets_manager:
+                self._presets_manager.close()
+                self._presets_manager = None
+            self._close_search_index()
+            self._set_expression_graph(option_object)
         self._option_object = option_object
+        self._update_presets_widgets()
         self._options_list.set_option_object(option_object)
         if option_object and force_update:
             self.update_options()
+        self._update_merge_base()
+        self._update_watched_file()
 
     def get_option_type(self):
         """
@@ -221,17 +328,41 @@ class OptionsViewer(base.BaseWidget):
         self._edit_widget.setVisible(False)
         self._edit_splitter.setVisible(False)
 
-    def update_options(self):
+    def update_options(self, force=False):
         """
         Function that updates the current options of the selected task
+        Widgets are only rebuilt if the options changed since the last time they were loaded.
+        :param force: bool, whether to rebuild the widgets even if options did not change
         """
 
         if not self._option_object:
             self._options_list.clear_widgets()
+            self._options_signature = None
             LOGGER.warning('Impossible to update options because option object is not defined!')
             return
 
-        self._options_list.update_options()
+        self._flush_written_options()
+        options = None
+        if not hasattr(self._option_object, 'get_version'):
+            options = self._option_object.get_options()
+        signature = self._get_options_signature(options)
+        if not force and signature == self._options_signature:
+            return
+
+        self._options_list.update_options(options)
+        self._options_signature = signature
+        if self._options_watcher:
+            self._watched_options = options if options is not None else self._option_object.get_options()
+
+        # Rebuilt widgets are all visible and not highlighted, so filter and diff are applied again from scratch
+        self._option_widgets = None
+        self._highlighted_paths = dict()
+        self._update_diff_highlight()
+        if self._options_filter:
+            if not hasattr(self._option_object, 'add_listener'):
+                self._search_index.build(options if options is not None else self._option_object.get_options())
+            self._options_filter = search.OptionsFilter(self._search_index)
+            self._apply_filter(self._filter_line.text())
 
     def clear_options(self):
         """
@@ -239,8 +370,307 @@ class OptionsViewer(base.BaseWidget):
         """
 
         self._options_list.clear_widgets()
+        self._options_signature = None
         if self._option_object:
+            self._flush_option_object()
             self._option_object = None
+        if self._presets_manager:
+            self._presets_manager.close()
+            self._presets_manager = None
+        self._close_search_index()
+        self._update_presets_widgets()
+        self._update_watched_file()
+
+    def is_watching_option_file(self):
+        """
+        Returns whether external edits of the option file are reloaded automatically
+        :return: bool
+        """
+
+        return self._options_watcher is not None
+
+    def set_watch_option_file(self, flag, debounce=300, poll_interval=None):
+        """
+        Sets whether external edits of the option file are reloaded automatically
+        :param flag: bool
+        :param debounce: int, milliseconds to wait after the last file change before reloading options
+        :param poll_interval: int or None, if given, option file is polled each given milliseconds instead of using
+            file system notifications
+        """
+
+        if self._options_watcher:
+            self._options_watcher.stop()
+            self._options_watcher.deleteLater()
+            self._options_watcher = None
+            self._watched_options = None
+
+        if not flag:
+            return
+
+        self._options_watcher = watcher.OptionsFileWatcher(debounce=debounce, poll_interval=poll_interval, parent=self)
+        self._options_watcher.fileChanged.connect(self._on_option_file_changed)
+        if self._option_object:
+            self._watched_options = self._option_object.get_options()
+        self._update_watched_file()
+
+    def undo(self):
+        """
+        Reverts the last change done to the options, if the option object supports undo (for example, OptionStore)
+        :return: bool
+        """
+
+        if not self._option_object or not hasattr(self._option_object, 'undo'):
+            return False
+
+        result = self._option_object.undo()
+        if result:
+            self.update_options()
+
+        return result
+
+    def redo(self):
+        """
+        Applies again the last reverted change, if the option object supports undo (for example, OptionStore)
+        :return: bool
+        """
+
+        if not self._option_object or not hasattr(self._option_object, 'redo'):
+            return False
+
+        result = self._option_object.redo()
+        if result:
+            self.update_options()
+
+        return result
+
+    def get_presets_manager(self):
+        """
+        Returns the manager of the presets of the current option object. Only option objects that notify their
+        changes (such as OptionStore) support presets.
+        :return: PresetsManager or None
+        """
+
+        if not self._presets_manager and self._option_object and hasattr(self._option_object, 'add_listener'):
+            self._presets_manager = presets.PresetsManager(self._option_object)
+
+        return self._presets_manager
+
+    def save_preset(self, name):
+        """
+        Stores current options as a preset with given name
+        :param name: str
+        """
+
+        presets_manager = self.get_presets_manager()
+        if not presets_manager:
+            LOGGER.warning('Current option object does not support presets!')
+            return
+
+        presets_manager.save_preset(name)
+        self._update_presets_widgets()
+
+    def apply_preset(self, name):
+        """
+        Loads the preset with given name. If the preset only changes option values, widgets are updated in place
+        :param name: str
+        """
+
+        presets_manager = self.get_presets_manager()
+        if not presets_manager:
+            LOGGER.warning('Current option object does not support presets!')
+            return
+
+        changed_values, structure_changed = presets_manager.apply_preset(name)
+        if structure_changed or not self._options_list.apply_option_changes(changed_values):
+            self.update_options(force=True)
+        else:
+            self._on_options_written()
+
+    def get_filter_text(self):
+        """
+        Returns the text used to filter visible options
+        :return: str
+        """
+
+        return self._filter_line.text()
+
+    def set_filter_text(self, text):
+        """
+        Sets the text used to filter visible options. Only options whose path or value contains the text are shown
+        :param text: str
+        """
+
+        self._filter_line.setText(text)
+
+    def get_diff_reference(self):
+        """
+        Returns the options current options are compared with
+        :return: list(tuple(str, object, str)) or None
+        """
+
+        return self._diff_reference
+
+    def set_diff_reference(self, reference):
+        """
+        Enables diff mode: widgets of the options that differ from the given reference (for example, the template of
+        an asset or a previous version of its options file) are highlighted
+        :param reference: list or str or None, reference options (with the format returned by option objects
+            get_options function) or file where they are stored. If None, diff mode is disabled
+        """
+
+        if reference is None:
+            self._diff_reference = None
+        elif isinstance(reference, backends.string_types):
+            self._diff_reference = backends.get_backend(file_path=reference).read(reference)[0]
+        else:
+            self._diff_reference = [backends.split_option_value(*option) for option in reference]
+        self._update_diff_highlight()
+
+    def get_options_diff(self):
+        """
+        Returns the differences between the diff reference and current options
+        :return: OptionsDiff or None, None if diff mode is disabled
+        """
+
+        self._flush_written_options()
+
+        return self._options_diff
+
+    def is_merge_on_drop(self):
+        """
+        Returns whether dropped option files are merged into current options instead of overwriting them
+        :return: bool
+        """
+
+        return self._merge_on_drop
+
+    def set_merge_on_drop(self, flag):
+        """
+        Sets whether dropped option files are merged into current options instead of overwriting them.
+        Options are merged with a three-way merge that uses the options loaded last time as common base.
+        :param flag: bool
+        """
+
+        self._merge_on_drop = flag
+
+    def get_merge_conflicts(self):
+        """
+        Returns the conflicts of the last merge
+        :return: list(MergeConflict)
+        """
+
+        return self._merge_conflicts
+
+    def merge_options(self, their_options, prefer='ours'):
+        """
+        Merges the given options into current ones with a three-way merge whose base are the options loaded last time.
+        Widgets of conflicting options are highlighted.
+        :param their_options: list or str, options (with the format returned by option objects get_options function) or
+            file where they are stored
+        :param prefer: str, 'ours' or 'theirs', side whose value is used for conflicting options
+        :return: MergeResult or None
+        """
+
+        if not self._option_object:
+            LOGGER.warning('Impossible to merge options because option object is not defined!')
+            return None
+
+        if isinstance(their_options, backends.string_types):
+            their_entries = backends.get_backend(file_path=their_options).read(their_options)[0]
+        else:
+            their_entries = [backends.split_option_value(*option) for option in their_options]
+        our_entries = [backends.split_option_value(*option) for option in self._option_object.get_options()]
+        base_entries = self._merge_base if self._merge_base is not None else our_entries
+        result = merge.merge_entries(base_entries, our_entries, their_entries, prefer=prefer)
+
+        try:
+            self._set_option_entries(result.entries)
+        except schema.OptionValidationError as exc:
+            LOGGER.error('Impossible to merge options: {}'.format(exc))
+            return None
+
+        self._merge_conflicts = result.conflicts
+        self._merge_base = their_entries
+        self.update_options()
+        if result.conflicts:
+            LOGGER.warning('{} options were modified by both sides, {} values were kept: {}'.format(
+                len(result.conflicts), prefer, ', '.join(conflict.path for conflict in result.conflicts)))
+            widgets = self._get_option_widgets()
+            for conflict in result.conflicts:
+                widget = widgets.get(conflict.path)
+                if widget:
+                    self._options_list.highlight_widget(widget, 'conflict')
+                    self._highlighted_paths[conflict.path] = 'conflict'
+
+        return result
+
+    def multi_edit(self, mode, amount, widgets=None):
+        """
+        Applies an absolute, relative or scaled change to all the given numeric options (float, integer and vector3f)
+        at once. Options are written with a single save and a single undo entry.
+        :param mode: str, multiedit.EditMode value
+        :param amount: float, new value (ABSOLUTE), offset (RELATIVE) or factor (SCALE)
+        :param widgets: list(Option) or None, widgets to edit. If not given, selected widgets are edited
+        :return: dict, option path: new value of the edited options
+        """
+
+        if not self._option_object:
+            return dict()
+
+        widgets = self._current_widgets if widgets is None else widgets
+        option_paths = [self._options_list.get_path(widget) for widget in widgets
+                        if multiedit.is_numeric_type(widget.get_option_type())]
+        if not option_paths:
+            return dict()
+
+        changed_values = multiedit.edit_numeric_options(self._option_object, option_paths, mode, amount)
+        if not changed_values:
+            return changed_values
+
+        if self._options_list.apply_option_changes(changed_values):
+            self._on_options_written()
+        else:
+            self.update_options()
+
+        return changed_values
+
+    def get_expression_graph(self):
+        """
+        Returns the graph of the expressions that drive the options of the current option object. Only option objects
+        that notify their changes (such as OptionStore) support expressions.
+        :return: ExpressionGraph or None
+        """
+
+        return self._expression_graph
+
+    def set_option_expression(self, path, expression):
+        """
+        Drives the option with given path with an expression of other options (for example, "2 * arm.segments").
+        Option is recomputed each time one of the options referenced by the expression changes.
+        :param path: str
+        :param expression: str or None, if not given, option is no longer driven
+        :raises ExpressionError: if the expression is not valid or creates a dependency cycle
+        """
+
+        if not self._expression_graph:
+            LOGGER.warning('Impossible to set option expression because option object does not support expressions!')
+            return
+
+        if expression:
+            self._expression_graph.set_expression(path, expression)
+        else:
+            self._expression_graph.remove_expression(path)
+
+    def validate_paths(self):
+        """
+        Validates again the paths of all file and directory options. Cached validation results are discarded and paths
+        are checked in background, so the UI thread only queues the validations.
+        """
+
+        paths.get_path_validator().get_cache().invalidate()
+        for widget in self._get_option_widgets().values():
+            if hasattr(widget, 'validate_path'):
+                widget.validate_path()
 
     def has_options(self):
         """
@@ -254,6 +684,208 @@ class OptionsViewer(base.BaseWidget):
 
         return self._option_object.has_options()
 
+    def _get_options_signature(self, options=None):
+        """
+        Internal function that returns a value that identifies the current contents of the option object
+        Option objects that expose a version counter (such as OptionStore) are not hashed.
+        :param options: list or None, current options of the option object (to avoid retrieving them again)
+        :return: tuple or None
+        """
+
+        if not self._option_object:
+            return None
+
+        if hasattr(self._option_object, 'get_version'):
+            return 'version', self._option_object.get_version()
+
+        if options is None:
+            options = self._option_object.get_options()
+
+        return 'hash', utils.get_options_hash(options)
+
+    def _update_watched_file(self):
+        """
+        Internal function that updates the file watched by the options watcher
+        """
+
+        if not self._options_watcher:
+            return
+
+        option_file = self._option_object.get_option_file() if self._option_object else None
+        if option_file != self._options_watcher.get_file():
+            self._options_watcher.set_file(option_file)
+
+    def _apply_filter(self, text):
+        """
+        Internal function that filters visible options with the given text
+        Only the widgets whose visibility changed since the last filter are updated.
+        :param text: str
+        """
+
+        if not self._option_object:
+            return
+
+        if self._options_filter is None:
+            if not text.strip():
+                return
+            self._search_index = search.OptionsSearchIndex(self._option_object)
+            self._options_filter = search.OptionsFilter(self._search_index)
+
+        to_show, to_hide = self._options_filter.set_text(text)
+        if not to_show and not to_hide:
+            return
+
+        widgets = self._get_option_widgets()
+        self._options_list.setUpdatesEnabled(False)
+        try:
+            for path in to_hide:
+                widget = widgets.get(path)
+                if widget:
+                    widget.setVisible(False)
+            for path in to_show:
+                widget = widgets.get(path)
+                if widget:
+                    widget.setVisible(True)
+            # Groups that were already visible (for example, on the first filtered keystroke) can be collapsed, so
+            # all the ancestors of the matches are expanded, not only the newly shown ones
+            if text:
+                for path in self._options_filter.get_matching_groups():
+                    widget = widgets.get(path)
+                    if widget and hasattr(widget, 'set_expanded'):
+                        widget.set_expanded(True)
+        finally:
+            self._options_list.setUpdatesEnabled(True)
+
+    def _update_diff_highlight(self, options=None):
+        """
+        Internal function that compares current options with the diff reference and highlights the widgets of the
+        options that differ. Only widgets whose highlight changed are repainted.
+        :param options: list or None, current options of the option object (to avoid retrieving them again)
+        """
+
+        options_diff = None
+        if self._diff_reference is not None and self._option_object:
+            if options is None:
+                options = self._option_object.get_options()
+            current_entries = [backends.split_option_value(*option) for option in options]
+            options_diff = diff.diff_entries(self._diff_reference, current_entries)
+        self._options_diff = options_diff
+
+        highlighted_paths = dict(
+            (path, options_diff.get_status(path)) for path in options_diff.get_paths()) if options_diff else dict()
+        if not highlighted_paths and not self._highlighted_paths:
+            return
+
+        widgets = self._get_option_widgets()
+        for path in set(self._highlighted_paths) | set(highlighted_paths):
+            status = highlighted_paths.get(path)
+            if status == self._highlighted_paths.get(path):
+                continue
+            widget = widgets.get(path)
+            if widget:
+                self._options_list.highlight_widget(widget, status)
+        self._highlighted_paths = highlighted_paths
+
+    def _get_option_widgets(self):
+        """
+        Internal function that returns the widgets of the current options by path. Widgets are cached until they are
+        rebuilt or modified
+        :return: dict(str, Option or OptionListGroup)
+        """
+
+        if self._option_widgets is None:
+            self._option_widgets = dict(self._options_list.get_option_widgets())
+
+        return self._option_widgets
+
+    def _update_merge_base(self, options=None):
+        """
+        Internal function that stores current options as the common base of the next merge
+        :param options: list or None, current options of the option object (to avoid retrieving them again)
+        """
+
+        if not self._option_object:
+            self._merge_base = None
+            return
+
+        if options is None:
+            options = self._option_object.get_options()
+        self._merge_base = [backends.split_option_value(*option) for option in options]
+
+    def _set_option_entries(self, entries):
+        """
+        Internal function that replaces the options of the option object with the given entries
+        :param entries: list(tuple(str, object, str))
+        """
+
+        if hasattr(self._option_object, 'set_entries'):
+            self._option_object.set_entries(entries)
+            return
+
+        with self._options_list.batch_writes():
+            self._option_object.clear_options()
+            for path, value, option_type in entries:
+                self._option_object.add_option(path, value, None, option_type)
+
+    def _set_expression_graph(self, option_object):
+        """
+        Internal function that tracks the expressions graph of the given option object
+        :param option_object: object or None
+        """
+
+        if self._expression_graph:
+            self._expression_graph.remove_listener(self._on_expressions_recomputed)
+            self._expression_graph.close()
+            self._expression_graph = None
+        if option_object and hasattr(option_object, 'add_listener'):
+            self._expression_graph = expressions.get_expression_graph(option_object)
+            self._expression_graph.add_listener(self._on_expressions_recomputed)
+
+    def _merge_options_file(self, file_path):
+        """
+        Internal function that merges the options of the given file into the current ones
+        :param file_path: str
+        """
+
+        permission = messagebox.MessageBox.question(
+            self, 'Merging Options', 'Dropped options will be merged into current ones. Do you want to continue?')
+        if permission != QDialogButtonBox.Yes:
+            return
+
+        self.merge_options(file_path)
+
+    def _close_search_index(self):
+        """
+        Internal function that releases the search index of the current option object
+        """
+
+        if self._search_index is not None:
+            self._search_index.close()
+        self._search_index = None
+        self._options_filter = None
+        self._option_widgets = None
+
+    def _update_presets_widgets(self):
+        """
+        Internal function that updates the presets widgets with the presets of the current option object
+        """
+
+        supports_presets = bool(self._option_object and hasattr(self._option_object, 'add_listener'))
+        self._presets_combo.setVisible(supports_presets)
+        self._save_preset_btn.setVisible(supports_presets)
+        self._presets_combo.clear()
+        if self._presets_manager:
+            self._presets_combo.addItems(self._presets_manager.get_preset_names())
+            self._presets_combo.setCurrentIndex(-1)
+
+    def _flush_option_object(self):
+        """
+        Internal function that waits until the pending background writes of the option object are written into disk
+        """
+
+        if self._option_object and hasattr(self._option_object, 'flush'):
+            self._option_object.flush()
+
     def _edit_activate(self, edit_value):
         """
         Internal function that updates widget states when edit button is pressed
@@ -264,6 +896,7 @@ class OptionsViewer(base.BaseWidget):
         self.move_down_btn.setVisible(edit_value)
         self._move_up_btn.setVisible(edit_value)
         self.remove_btn.setVisible(edit_value)
+        self._multi_edit_widget.setVisible(edit_value)
         if not edit_value:
             self._options_list.clear_selection()
         self._options_list.set_edit(edit_value)
@@ -277,6 +910,143 @@ class OptionsViewer(base.BaseWidget):
         self._edit_activate(edit_value)
         self.editModeChanged.emit(edit_value)
 
+    def _on_options_written(self):
+        """
+        Internal callback function that is called when the option list writes its values into the option object
+        Widgets already reflect those values, so the new contents are registered as loaded. Registering them
+        retrieves all the options (and hashes them if the option object has no version counter), so consecutive
+        writes (such as the ones done while typing) are coalesced into a single refresh.
+        """
+
+        self._option_widgets = None
+        # Saves already written into disk are registered as seen, so the watcher does not notify them
+        if self._options_watcher and (
+                not hasattr(self._option_object, 'pending') or not self._option_object.pending()):
+            self._options_watcher.update_stamp()
+        self._options_written_timer.start()
+
+    def _flush_written_options(self):
+        """
+        Internal function that refreshes, without waiting, the state of the writes whose refresh is still scheduled
+        """
+
+        if self._options_written_timer.isActive():
+            self._refresh_written_options()
+
+    def _refresh_written_options(self):
+        """
+        Internal function that registers current contents of the option object as loaded
+        """
+
+        self._options_written_timer.stop()
+        if not self._option_object:
+            return
+
+        options = None
+        if self._options_watcher or not hasattr(self._option_object, 'get_version'):
+            options = self._option_object.get_options()
+        self._options_signature = self._get_options_signature(options)
+        if self._options_watcher:
+            self._watched_options = options
+        if self._diff_reference is not None:
+            self._update_diff_highlight(options)
+
+    def _on_option_file_changed(self, file_path):
+        """
+        Internal callback function that is called when the watched option file is modified on disk
+        Only the changed options are updated. Changes whose contents match the options currently loaded (such as the
+        writes done by this viewer) are ignored without reloading the option object.
+        :param file_path: str
+        """
+
+        if not self._option_object or file_path != self._option_object.get_option_file():
+            return
+
+        self._flush_written_options()
+
+        # Our own writes are still in flight, the watcher will notify us again once they are written into disk
+        if hasattr(self._option_object, 'pending') and self._option_object.pending():
+            return
+
+        # Our own saves also notify the watcher. Reloading them would clear the undo history and rebuild all the
+        # listeners of the option object, so options are only loaded if file contents differ from the loaded ones
+        if hasattr(self._option_object, 'is_file_modified'):
+            try:
+                if not self._option_object.is_file_modified():
+                    return
+            except Exception:
+                LOGGER.debug('Impossible to compare options file "{}" with loaded options'.format(file_path))
+
+        if hasattr(self._option_object, 'load'):
+            try:
+                self._option_object.load()
+            except schema.OptionValidationError as exc:
+                LOGGER.error(
+                    'Options file "{}" was modified externally with invalid options: {}'.format(file_path, exc))
+                return
+        new_options = self._option_object.get_options()
+        self._update_merge_base(new_options)
+        old_options = self._watched_options if self._watched_options is not None else list()
+        changed_values, removed_paths, rebuild = watcher.get_options_changes(old_options, new_options)
+        if not rebuild and not changed_values and not removed_paths:
+            return
+
+        LOGGER.info('Options file "{}" was modified externally. Reloading options ...'.format(file_path))
+        if rebuild or not self._options_list.apply_option_changes(changed_values, removed_paths):
+            self.update_options(force=True)
+        else:
+            self._options_signature = self._get_options_signature(new_options)
+            self._watched_options = new_options
+
+    def _on_filter_text_changed(self, text):
+        """
+        Internal callback function that is called each time the user modifies the filter text
+        :param text: str
+        """
+
+        self._apply_filter(text)
+
+    def _on_preset_selected(self, index):
+        """
+        Internal callback function that is called when the user selects a preset
+        :param index: int
+        """
+
+        preset_name = self._presets_combo.itemText(index)
+        if preset_name:
+            self.apply_preset(preset_name)
+
+    def _on_save_preset(self):
+        """
+        Internal callback function that is called when the user presses save preset button
+        """
+
+        preset_name = qtutils.get_string_input('Save Preset', old_name=self._presets_combo.currentText(), parent=self)
+        if preset_name:
+            self.save_preset(preset_name)
+            self._presets_combo.setCurrentIndex(self._presets_combo.findText(preset_name))
+
+    def _on_expressions_recomputed(self, expression_graph, changed_values):
+        """
+        Internal callback function that is called when options driven by expressions are recomputed
+        Only the widgets of the recomputed options are updated. If some of them cannot be updated in place, widgets
+        are rebuilt once the current write finishes.
+        :param expression_graph: ExpressionGraph
+        :param changed_values: dict, option path: new value
+        """
+
+        if not self._options_list.apply_option_changes(changed_values):
+            QTimer.singleShot(0, lambda: self.update_options(force=True))
+
+    def _on_multi_edit(self):
+        """
+        Internal callback function that is called when the user presses multi edit apply button
+        Applies the edit to all selected numeric options
+        """
+
+        mode = self._multi_edit_mode_combo.itemData(self._multi_edit_mode_combo.currentIndex())
+        self.multi_edit(mode, self._multi_edit_amount_spn.value())
+
     def _on_move_up(self):
         """
         Internal callback function that is called when the user pressed move up button
@@ -290,8 +1060,9 @@ class OptionsViewer(base.BaseWidget):
         widgets = self._options_list.sort_widgets(widgets, widgets[0].get_parent())
         if not widgets:
             return
-        for w in widgets:
-            w.move_up()
+        with self._options_list.batch_writes('Move Up'):
+            for w in widgets:
+                w.move_up()
 
     def _on_move_down(self):
         """
@@ -306,8 +1077,9 @@ class OptionsViewer(base.BaseWidget):
         widgets = self._options_list.sort_widgets(widgets, widgets[0].get_parent())
         if not widgets:
             return
-        for w in widgets:
-            w.move_down()
+        with self._options_list.batch_writes('Move Down'):
+            for w in widgets:
+                w.move_down()
 
     def _on_remove(self):
         """
@@ -322,5 +1094,6 @@ class OptionsViewer(base.BaseWidget):
         widgets = self._options_list.sort_widgets(widgets, widgets[0].get_parent())
         if not widgets:
             return
-        for w in widgets:
-            w.remove()
+        with self._options_list.batch_writes('Remove'):
+            for w in widgets:
+                w.remove()
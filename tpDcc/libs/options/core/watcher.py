@@ -0,0 +1,163 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains watcher used to detect external edits of option files
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import os
+import logging
+
+from Qt.QtCore import QObject, QTimer, QFileSystemWatcher, Signal
+
+from tpDcc.libs.options.core import diff
+
+LOGGER = logging.getLogger('tpDcc-libs-options')
+
+
+class OptionsFileWatcher(QObject):
+    """
+    Watches an options file and notifies, debounced, when its contents change on disk.
+    By default QFileSystemWatcher is used; polling can be used instead for file systems where file notifications are
+    not reliable (for example, some network drives).
+    """
+
+    fileChanged = Signal(str)
+
+    def __init__(self, debounce=300, poll_interval=None, parent=None):
+        """
+        :param debounce: int, milliseconds to wait after the last change before notifying it
+        :param poll_interval: int or None, if given, file is polled each given milliseconds instead of using file
+            system notifications
+        :param parent: QObject
+        """
+
+        super(OptionsFileWatcher, self).__init__(parent)
+
+        self._file_path = None
+        self._file_stamp = None
+        self._system_watcher = None
+
+        self._debounce_timer = QTimer(self)
+        self._debounce_timer.setSingleShot(True)
+        self._debounce_timer.setInterval(debounce)
+        self._debounce_timer.timeout.connect(self._on_debounce_timeout)
+
+        self._poll_timer = None
+        if poll_interval:
+            self._poll_timer = QTimer(self)
+            self._poll_timer.setInterval(poll_interval)
+            self._poll_timer.timeout.connect(self._on_poll)
+        else:
+            self._system_watcher = QFileSystemWatcher(self)
+            self._system_watcher.fileChanged.connect(self._on_file_changed)
+
+    def get_file(self):
+        """
+        Returns file being watched
+        :return: str or None
+        """
+
+        return self._file_path
+
+    def set_file(self, file_path):
+        """
+        Sets the file to watch
+        :param file_path: str or None
+        """
+
+        if self._system_watcher and self._system_watcher.files():
+            self._system_watcher.removePaths(self._system_watcher.files())
+        self._debounce_timer.stop()
+
+        self._file_path = file_path
+        self._file_stamp = self._get_file_stamp()
+        if not file_path:
+            if self._poll_timer:
+                self._poll_timer.stop()
+            return
+
+        if self._poll_timer:
+            self._poll_timer.start()
+        elif os.path.isfile(file_path):
+            self._system_watcher.addPath(file_path)
+
+    def stop(self):
+        """
+        Stops watching current file
+        """
+
+        self.set_file(None)
+
+    def update_stamp(self):
+        """
+        Stores current modification stamp of the file as already seen, so current contents are not notified
+        """
+
+        self._file_stamp = self._get_file_stamp()
+
+    def _get_file_stamp(self):
+        """
+        Internal function that returns the modification time and size of the watched file
+        :return: tuple(float, int) or None
+        """
+
+        if not self._file_path or not os.path.isfile(self._file_path):
+            return None
+
+        file_stat = os.stat(self._file_path)
+
+        return file_stat.st_mtime, file_stat.st_size
+
+    def _on_file_changed(self, file_path):
+        """
+        Internal callback function that is called when file system watcher detects a file change
+        :param file_path: str
+        """
+
+        # Files replaced through atomic renames are dropped from the watcher, so we add them again
+        if file_path not in self._system_watcher.files() and os.path.isfile(file_path):
+            self._system_watcher.addPath(file_path)
+
+        self._debounce_timer.start()
+
+    def _on_poll(self):
+        """
+        Internal callback function that is called each poll interval
+        """
+
+        if self._get_file_stamp() != self._file_stamp:
+            self._debounce_timer.start()
+
+    def _on_debounce_timeout(self):
+        """
+        Internal callback function that is called when file changes are settled
+        """
+
+        file_stamp = self._get_file_stamp()
+        if file_stamp is None or file_stamp == self._file_stamp:
+            return
+
+        self._file_stamp = file_stamp
+        self.fileChanged.emit(self._file_path)
+
+
+def get_options_changes(old_options, new_options):
+    """
+    Returns the changes needed to update the given old options into the new ones
+    :param old_options: list, options with the format returned by option objects get_options function
+    :param new_options: list, options with the format returned by option objects get_options function
+    :return: tuple(dict, list, bool), changed option values (path: value), removed paths and whether the structure of
+        the options changed (added, retyped or reordered options) so a full rebuild is needed
+    """
+
+    options_diff = diff.diff_options(old_options, new_options)
+    if options_diff.added or options_diff.retyped or options_diff.moved:
+        return dict(), list(), True
+
+    changed_values = dict((path, new_value) for path, _, new_value in options_diff.changed)
+    removed_paths = [path for path, _, _ in options_diff.removed]
+
+    return changed_values, removed_paths, False
@@ -0,0 +1,198 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains write-behind persistence for option stores.
+Snapshots of option sets are serialized and written into disk by a background thread so slow drives do not block
+the DCC UI thread.
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import time
+import atexit
+import logging
+import threading
+import traceback
+from collections import OrderedDict
+
+LOGGER = logging.getLogger('tpDcc-libs-options')
+
+_WRITER = None
+
+
+class WriteJob(object):
+    """
+    Pending write of an option set snapshot
+    """
+
+    def __init__(self, file_path, backend, entries, metadata, changed_paths, removed_paths, full_write):
+        self.file_path = file_path
+        self.backend = backend
+        self.entries = entries
+        self.metadata = metadata
+        self.changed_paths = set(changed_paths)
+        self.removed_paths = set(removed_paths)
+        self.full_write = full_write
+
+    def merge(self, newer_job):
+        """
+        Collapses a newer snapshot of the same file into this job. The newest snapshot wins but the paths modified by
+        both jobs are kept so incremental backends still update every modified option.
+        :param newer_job: WriteJob
+        """
+
+        self.changed_paths -= newer_job.removed_paths
+        self.removed_paths -= newer_job.changed_paths
+        self.changed_paths |= newer_job.changed_paths
+        self.removed_paths |= newer_job.removed_paths
+        self.full_write = self.full_write or newer_job.full_write or newer_job.backend is not self.backend
+        self.backend = newer_job.backend
+        self.entries = newer_job.entries
+        self.metadata = newer_job.metadata
+
+    def run(self):
+        if self.full_write:
+            self.backend.write(self.file_path, self.entries, self.metadata)
+        else:
+            self.backend.write_changes(
+                self.file_path, self.entries, list(self.changed_paths), list(self.removed_paths), self.metadata)
+
+
+class WriteBehindWriter(object):
+    """
+    Queue of option snapshots written into disk by a background thread.
+    Queued snapshots of the same file are collapsed, so only the latest state of each file is written.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._jobs = OrderedDict()
+        self._running = dict()
+        self._errors = dict()
+        self._thread = None
+
+    def submit(self, file_path, backend, entries, metadata=None, changed_paths=None, removed_paths=None,
+               full_write=True):
+        """
+        Queues a snapshot of an option set to be written into given file
+        :param file_path: str
+        :param backend: OptionsBackend
+        :param entries: list(tuple(str, object, str))
+        :param metadata: dict or None
+        :param changed_paths: list(str) or None
+        :param removed_paths: list(str) or None
+        :param full_write: bool, whether the whole file must be rewritten
+        """
+
+        job = WriteJob(
+            file_path, backend, entries, dict(metadata or dict()), changed_paths or list(), removed_paths or list(),
+            full_write)
+        with self._condition:
+            current_job = self._jobs.get(file_path)
+            if current_job:
+                current_job.merge(job)
+            else:
+                self._jobs[file_path] = job
+            self._ensure_thread()
+            self._condition.notify_all()
+
+    def pending(self, file_path=None):
+        """
+        Returns the number of snapshots that are queued or being written
+        :param file_path: str or None, if given, only writes of given file are taken into account
+        :return: int
+        """
+
+        with self._condition:
+            if file_path:
+                return int(file_path in self._jobs) + self._running.get(file_path, 0)
+            return len(self._jobs) + sum(self._running.values())
+
+    def get_error(self, file_path):
+        """
+        Returns the error of the last write of given file
+        :param file_path: str
+        :return: str or None, None if last write succeeded
+        """
+
+        with self._condition:
+            return self._errors.get(file_path)
+
+    def flush(self, file_path=None, timeout=None):
+        """
+        Blocks until queued snapshots are written into disk
+        :param file_path: str or None, if given, only waits for the writes of given file
+        :param timeout: float or None, maximum number of seconds to wait
+        :return: bool, True if all writes finished and were written; False if timeout was reached or the last write
+            of any of the files failed
+        """
+
+        # Condition.wait returns None in Python 2, so the remaining time is computed instead of checking its result
+        end_time = time.time() + timeout if timeout is not None else None
+        with self._condition:
+            while self._has_pending(file_path):
+                if end_time is None:
+                    self._condition.wait()
+                    continue
+                remaining_time = end_time - time.time()
+                if remaining_time <= 0:
+                    return False
+                self._condition.wait(remaining_time)
+
+            if file_path:
+                return file_path not in self._errors
+            return not self._errors
+
+    def _has_pending(self, file_path):
+        if file_path:
+            return file_path in self._jobs or self._running.get(file_path, 0) > 0
+
+        return bool(self._jobs) or any(self._running.values())
+
+    def _ensure_thread(self):
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._thread = threading.Thread(target=self._run, name='tpDcc-libs-options-writer')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._jobs:
+                    self._condition.wait()
+                file_path, job = self._jobs.popitem(last=False)
+                self._running[file_path] = self._running.get(file_path, 0) + 1
+
+            error = None
+            try:
+                job.run()
+            except Exception:
+                error = traceback.format_exc()
+                LOGGER.error('Error while writing options file "{}": {}'.format(file_path, error))
+            finally:
+                with self._condition:
+                    if error:
+                        self._errors[file_path] = error
+                    else:
+                        self._errors.pop(file_path, None)
+                    self._running[file_path] -= 1
+                    if not self._running[file_path]:
+                        self._running.pop(file_path)
+                    self._condition.notify_all()
+
+
+def get_writer():
+    """
+    Returns the write-behind writer shared by all option stores
+    :return: WriteBehindWriter
+    """
+
+    global _WRITER
+    if _WRITER is None:
+        _WRITER = WriteBehindWriter()
+        atexit.register(_WRITER.flush)
+
+    return _WRITER
@@ -0,0 +1,229 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains numeric array option implementation
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import logging
+
+from Qt.QtCore import Qt, Signal, QAbstractTableModel
+from Qt.QtWidgets import QSizePolicy, QTableView, QHeaderView, QAbstractItemView
+
+from tpDcc.libs.qt.core import base
+from tpDcc.libs.qt.widgets import layouts, label
+
+from tpDcc.libs.options.core import option, arrays
+
+LOGGER = logging.getLogger('tpDcc-libs-options')
+
+
+class ArrayOption(option.Option, object):
+    def __init__(self, name, parent, main_widget):
+        super(ArrayOption, self).__init__(name=name, parent=parent, main_widget=main_widget)
+
+    def get_option_type(self):
+        return 'array'
+
+    def get_option_widget(self):
+        return NumericArrayWidget(name=self._name)
+
+    def get_value(self):
+        return self._option_widget.get_value()
+
+    def set_value(self, value):
+        self._option_widget.set_value(value)
+
+    def get_array(self):
+        """
+        Returns the array edited by the option
+        :return: NumericArray
+        """
+
+        return self._option_widget.get_array()
+
+    def _setup_option_widget_value_change(self):
+        self._option_widget.valueChanged.connect(self._on_value_changed)
+
+
+class NumericArrayModel(QAbstractTableModel, object):
+    """
+    Table model that reads and writes the values of a numeric array directly, so views only request the values of the
+    visible cells
+    """
+
+    COLUMN_LABELS = {1: ['Value'], 3: ['X', 'Y', 'Z']}
+
+    valueEdited = Signal()
+
+    def __init__(self, parent=None):
+        super(NumericArrayModel, self).__init__(parent)
+
+        self._array = arrays.NumericArray()
+
+    def get_array(self):
+        return self._array
+
+    def set_array(self, numeric_array):
+        self.beginResetModel()
+        self._array = numeric_array
+        self.endResetModel()
+
+    def rowCount(self, parent=None):
+        if parent is not None and parent.isValid():
+            return 0
+        return len(self._array)
+
+    def columnCount(self, parent=None):
+        if parent is not None and parent.isValid():
+            return 0
+        return self._array.get_columns()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return self._array.get_value(index.row(), index.column())
+        if role == Qt.TextAlignmentRole:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            return False
+        if self._array.get_dtype() == arrays.INTEGER:
+            # Integer arrays would silently truncate decimal values
+            if not value.is_integer():
+                return False
+            value = int(value)
+        if value == self._array.get_value(index.row(), index.column()):
+            return False
+
+        self._array.set_value(index.row(), index.column(), value)
+        self.dataChanged.emit(index, index)
+        self.valueEdited.emit()
+
+        return True
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsEditable
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Vertical:
+            return section
+        labels = self.COLUMN_LABELS.get(self._array.get_columns())
+
+        return labels[section] if labels and section < len(labels) else section
+
+
+class NumericArrayWidget(base.BaseWidget, object):
+
+    valueChanged = Signal(object)
+
+    def __init__(self, name, parent=None):
+        self._name = name
+        self._encoded_value = None
+        super(NumericArrayWidget, self).__init__(parent=parent)
+
+    def get_main_layout(self):
+        main_layout = layouts.VerticalLayout()
+        main_layout.setContentsMargins(2, 2, 2, 2)
+        main_layout.setSpacing(2)
+
+        return main_layout
+
+    def ui(self):
+        super(NumericArrayWidget, self).ui()
+
+        header_layout = layouts.HorizontalLayout()
+        header_layout.setContentsMargins(0, 0, 0, 0)
+        header_layout.setSpacing(5)
+        self._label = label.BaseLabel(self._name, parent=self)
+        self._label.setAlignment(Qt.AlignRight)
+        self._label.setMinimumWidth(75)
+        self._label.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self._info_label = label.BaseLabel(parent=self)
+        self._info_label.setAttribute(Qt.WA_TransparentForMouseEvents)
+        header_layout.addWidget(self._label)
+        header_layout.addWidget(self._info_label)
+        header_layout.addStretch()
+
+        self._model = NumericArrayModel(parent=self)
+        self._table = QTableView(parent=self)
+        self._table.setModel(self._model)
+        self._table.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        self._table.setFixedHeight(150)
+        self._table.setSelectionMode(QAbstractItemView.ContiguousSelection)
+        self._table.setEditTriggers(QAbstractItemView.DoubleClicked | QAbstractItemView.EditKeyPressed)
+        self._table.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self._table.horizontalHeader().setStretchLastSection(True)
+
+        # Fixed row heights let the view compute its layout without asking the model for the size of each row
+        vertical_header = self._table.verticalHeader()
+        vertical_header.setSectionResizeMode(QHeaderView.Fixed)
+        vertical_header.setDefaultSectionSize(20)
+
+        self.main_layout.addLayout(header_layout)
+        self.main_layout.addWidget(self._table)
+
+        self._update_info()
+
+    def setup_signals(self):
+        self._model.valueEdited.connect(self._on_value_edited)
+
+    def get_name(self):
+        return self._label.text()
+
+    def set_name(self, value):
+        self._label.setText(value)
+
+    def get_label_text(self):
+        return self.get_name()
+
+    def set_label_text(self, text):
+        self.set_name(text)
+
+    def get_array(self):
+        return self._model.get_array()
+
+    def get_value(self):
+        # Encoding is cached because option lists read the values of all their options every time an option changes
+        if self._encoded_value is None:
+            self._encoded_value = arrays.encode_array(self._model.get_array())
+
+        return self._encoded_value
+
+    def set_value(self, value):
+        try:
+            numeric_array = arrays.decode_array(value)
+        except (TypeError, ValueError) as exc:
+            LOGGER.error('Impossible to set value of array option "{}": {}'.format(self._name, exc))
+            return
+        self._encoded_value = arrays.from_binary(value) if arrays.is_encoded_array(value) else None
+        self._model.set_array(numeric_array)
+        self._update_info()
+
+    def _update_info(self):
+        numeric_array = self._model.get_array()
+        if numeric_array.get_columns() == 1:
+            info = '{} {} values'.format(len(numeric_array), numeric_array.get_dtype())
+        else:
+            info = '{} x {} {} values'.format(
+                len(numeric_array), numeric_array.get_columns(), numeric_array.get_dtype())
+        self._info_label.setText(info)
+
+    def _on_value_edited(self):
+        self._encoded_value = None
+        self.valueChanged.emit(self.get_value())
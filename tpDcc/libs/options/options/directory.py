@@ -7,12 +7,16 @@ Module that contains directory option implementation
 
 from __future__ import print_function, division, absolute_import
 
-from Qt.QtCore import Signal
+import os
+import weakref
+
+from Qt.QtCore import Qt, Signal, QStringListModel
+from Qt.QtWidgets import QLineEdit, QCompleter
 
 from tpDcc.libs.qt.core import base
-from tpDcc.libs.qt.widgets import directory
+from tpDcc.libs.qt.widgets import label, directory
 
-from tpDcc.libs.options.core import option
+from tpDcc.libs.options.core import option, paths
 
 
 class DirectoryOption(option.Option, object):
@@ -36,32 +40,179 @@ class DirectoryOption(option.Option, object):
         value = str(value)
         self._option_widget.set_directory(value)
 
+    def validate_path(self, force=False):
+        self._option_widget.validate_path(force=force)
+
     def _setup_option_widget_value_change(self):
         self._option_widget.directoryChanged.connect(self._on_value_changed)
 
 
-class DirectoryWidget(base.BaseWidget, object):
+class PathWidget(base.BaseWidget, object):
+    """
+    Base widget for options that store paths. Paths are validated in background and missing paths are decorated
+    once their validation finishes. Typed paths are completed from the directory index shared by all path options.
+    """
+
+    PATH_KIND = paths.PathKind.ANY
+    STATUS_TEXTS = {
+        paths.PathStatus.MISSING: 'missing',
+        paths.PathStatus.WRONG_KIND: 'invalid'
+    }
+    STATUS_COLORS = {
+        paths.PathStatus.MISSING: 'rgb(220, 80, 80)',
+        paths.PathStatus.WRONG_KIND: 'rgb(220, 160, 60)'
+    }
 
     directoryChanged = Signal(object)
+    pathValidated = Signal(object, object)
+    completionsFound = Signal(object, object)
 
     def __init__(self, name, parent=None):
         self._name = name
-        super(DirectoryWidget, self).__init__(parent=parent)
+        self._path_status = None
+        super(PathWidget, self).__init__(parent=parent)
+
+    def get_path_widget(self):
+        return None
 
     def ui(self):
-        super(DirectoryWidget, self).ui()
+        super(PathWidget, self).ui()
+
+        self.path_widget = self.get_path_widget()
+        self.main_layout.addWidget(self.path_widget)
+        self._status_label = label.BaseLabel('', parent=self)
+        self._status_label.setVisible(False)
+        self.main_layout.addWidget(self._status_label)
 
-        self.directory_widget = directory.GetDirectoryWidget()
-        self.main_layout.addWidget(self.directory_widget)
+        self._path_line = self.path_widget.findChild(QLineEdit)
+        self._completion_model = QStringListModel(self)
+        self._completer = QCompleter(self._completion_model, self)
+        self._completer.setCaseSensitivity(Qt.CaseInsensitive)
+        if self._path_line:
+            self._path_line.setCompleter(self._completer)
 
     def setup_signals(self):
-        self.directory_widget.directoryChanged.connect(self.directoryChanged.emit)
+        self.path_widget.directoryChanged.connect(self._on_directory_changed)
+        self.pathValidated.connect(self._on_path_validated)
+        self.completionsFound.connect(self._on_completions_found)
+        if self._path_line:
+            self._path_line.textEdited.connect(self._on_path_edited)
 
     def get_directory(self):
-        return self.directory_widget.get_directory()
+        return self.path_widget.get_directory()
 
     def set_directory(self, value):
-        self.directory_widget.set_directory(value)
+        self.path_widget.set_directory(value)
+        self.validate_path()
+
+        # Listing the folder of the path in advance lets first keystrokes be completed from memory
+        if value:
+            paths.get_directory_index().crawl(os.path.dirname(os.path.normpath(value)), depth=1)
 
     def get_label_text(self):
         return self._name
+
+    def get_path_status(self):
+        """
+        Returns the status of the last validation of current path
+        :return: str or None, PathStatus value or None if path was not validated yet
+        """
+
+        return self._path_status
+
+    def validate_path(self, force=False):
+        """
+        Validates current path in background. The widget is decorated once validation finishes
+        :param force: bool, whether to ignore cached validation results
+        """
+
+        paths.get_path_validator().validate(
+            self.get_directory(), self.PATH_KIND, callback=_get_signal_callback(self, 'pathValidated'), force=force)
+
+    def _set_path_status(self, path, status):
+        """
+        Internal function that decorates the widget with the given path status
+        :param path: str
+        :param status: str, PathStatus value
+        """
+
+        if status == self._path_status:
+            return
+
+        self._path_status = status
+        status_text = self.STATUS_TEXTS.get(status)
+        self._status_label.setText(status_text or '')
+        self._status_label.setStyleSheet('color: {};'.format(self.STATUS_COLORS[status]) if status_text else '')
+        self._status_label.setToolTip('{}: {}'.format(status_text.capitalize(), path) if status_text else '')
+        self._status_label.setVisible(bool(status_text))
+
+    def _set_completions(self, completions):
+        """
+        Internal function that shows the given path completions
+        :param completions: list(str)
+        """
+
+        self._completion_model.setStringList(completions)
+        if completions and self._path_line.hasFocus():
+            self._completer.complete()
+
+    def _on_path_edited(self, text):
+        completions = paths.get_directory_index().complete(
+            text, self.PATH_KIND, callback=_get_signal_callback(self, 'completionsFound'))
+        self._set_completions(completions)
+
+    def _on_completions_found(self, text, completions):
+        # Completions of texts that were modified while their folder was listed are discarded
+        if text != self._path_line.text():
+            return
+        self._set_completions(completions)
+
+    def _on_directory_changed(self, value):
+        self.directoryChanged.emit(value)
+        self.validate_path()
+
+    def _on_path_validated(self, path, status):
+        # Results of paths that were modified while they were validated are discarded
+        if path != self.get_directory():
+            return
+        self._set_path_status(path, status)
+
+
+class DirectoryWidget(PathWidget, object):
+
+    PATH_KIND = paths.PathKind.DIRECTORY
+
+    def __init__(self, name, parent=None):
+        super(DirectoryWidget, self).__init__(name, parent=parent)
+
+    def get_path_widget(self):
+        return directory.GetDirectoryWidget()
+
+    @property
+    def directory_widget(self):
+        return self.path_widget
+
+
+def _get_signal_callback(widget, signal_name):
+    """
+    Internal function that returns a callback that emits the given signal of the given widget. Background workers keep
+    their callbacks until they finish, so the widget is only weakly referenced and results that arrive once the widget
+    is deleted are ignored
+    :param widget: QWidget
+    :param signal_name: str
+    :return: callable
+    """
+
+    widget_ref = weakref.ref(widget)
+
+    def _emit(*args):
+        widget = widget_ref()
+        if widget is None:
+            return
+        try:
+            getattr(widget, signal_name).emit(*args)
+        except RuntimeError:
+            # Python wrapper can outlive its deleted C++ widget
+            pass
+
+    return _emit
@@ -7,12 +7,10 @@ Module that contains file option implementation
 
 from __future__ import print_function, division, absolute_import
 
-from Qt.QtCore import Signal
-
-from tpDcc.libs.qt.core import base
 from tpDcc.libs.qt.widgets import directory
 
-from tpDcc.libs.options.core import option
+from tpDcc.libs.options.core import option, paths
+from tpDcc.libs.options.options import directory as directory_option
 
 
 class FileOption(option.Option, object):
@@ -36,32 +34,23 @@ class FileOption(option.Option, object):
         value = str(value)
         self._option_widget.set_directory(value)
 
+    def validate_path(self, force=False):
+        self._option_widget.validate_path(force=force)
+
     def _setup_option_widget_value_change(self):
         self._option_widget.directoryChanged.connect(self._on_value_changed)
 
 
-class FileWidget(base.BaseWidget, object):
+class FileWidget(directory_option.PathWidget, object):
 
-    directoryChanged = Signal(object)
+    PATH_KIND = paths.PathKind.FILE
 
     def __init__(self, name, parent=None):
-        self._name = name
-        super(FileWidget, self).__init__(parent=parent)
-
-    def ui(self):
-        super(FileWidget, self).ui()
-
-        self.file_widget = directory.SelectFile()
-        self.main_layout.addWidget(self.file_widget)
-
-    def setup_signals(self):
-        self.file_widget.directoryChanged.connect(self.directoryChanged.emit)
-
-    def get_directory(self):
-        return self.file_widget.get_directory()
+        super(FileWidget, self).__init__(name, parent=parent)
 
-    def set_directory(self, value):
-        self.file_widget.set_directory(value)
+    def get_path_widget(self):
+        return directory.SelectFile()
 
-    def get_label_text(self):
-        return self._name
+    @property
+    def file_widget(self):
+        return self.path_widget
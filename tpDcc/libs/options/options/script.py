@@ -7,23 +7,39 @@ Module that contains script option implementation
 
 from __future__ import print_function, division, absolute_import
 
-from Qt.QtCore import Qt
-from Qt.QtWidgets import QSizePolicy
+import re
+import logging
+
+from Qt.QtCore import Qt, Signal, QTimer
+from Qt.QtWidgets import QSizePolicy, QPlainTextEdit, QTextEdit
+from Qt.QtGui import QColor, QTextCursor, QTextCharFormat, QTextFormat
 
 from tpDcc.libs.qt.widgets import layouts, code
 
-from tpDcc.libs.options.core import option
+from tpDcc.libs.options.core import option, scripts, completion
 from tpDcc.libs.options.options import text
 
+LOGGER = logging.getLogger('tpDcc-libs-options')
+
 
 class ScriptOption(option.Option, object):
+
+    # Signals used to send the output and the end of background script runs to the UI thread
+    scriptOutput = Signal(str)
+    scriptFinished = Signal(object)
+
     def __init__(self, name, parent, main_widget):
         super(ScriptOption, self).__init__(name=name, parent=parent, main_widget=main_widget)
 
+        self._script_run = None
+
         self.main_layout.setContentsMargins(0, 2, 0, 2)
         self.setSizePolicy(QSizePolicy(QSizePolicy.Minimum, QSizePolicy.Minimum))
         self.main_layout.setAlignment(Qt.AlignCenter | Qt.AlignTop)
 
+        self.scriptOutput.connect(self._on_script_output)
+        self.scriptFinished.connect(self._on_script_finished)
+
     def get_option_type(self):
         return 'script'
 
@@ -66,12 +82,50 @@ class ScriptOption(option.Option, object):
 
         self._option_widget.set_option_object(self._option_object)
 
+    def get_script_run(self):
+        """
+        Returns the last background run of the script
+        :return: ScriptRun or None
+        """
+
+        return self._script_run
+
+    def cancel_script(self):
+        """
+        Stops the background run of the script, if any
+        """
+
+        if self._script_run is not None:
+            self._script_run.cancel()
+
     def run_script(self):
+        """
+        Runs the script. Scripts that declare they do not depend on the DCC (with an "# options-run: thread" or
+        "# options-run: process" header) run in background and stream their output into the option widget. If the
+        script is already running in background, it is cancelled.
+        """
+
+        if self._script_run is not None and self._script_run.is_running():
+            self.cancel_script()
+            return
+
         value = self.get_value()
-        self._option_object.run_code_snippet(value)
-        parent = self.get_parent()
-        if hasattr(parent, 'refresh'):
-            parent.refresh()
+        run_mode, _ = scripts.get_run_settings(value)
+        if run_mode == scripts.RunMode.MAIN:
+            # Option objects run snippets with their own scope. OptionStore caches their compiled code
+            self._option_object.run_code_snippet(value)
+            parent = self.get_parent()
+            if hasattr(parent, 'refresh'):
+                parent.refresh()
+            return
+
+        self._option_widget.clear_output()
+        try:
+            self._script_run = scripts.run_script(
+                value, self._option_object.get_options(), mode=run_mode, on_output=self.scriptOutput.emit,
+                on_finished=self.scriptFinished.emit)
+        except (SyntaxError, RuntimeError) as exc:
+            LOGGER.error('Impossible to run script "{}": {}'.format(self._name, exc))
 
     def get_option_widget(self):
         btn = ScriptWidget(name='option script')
@@ -84,20 +138,100 @@ class ScriptOption(option.Option, object):
         btn.insert_button.clicked.connect(self.run_script)
         # if not self.edit_mode:
         #     btn.text_widget.hide()
-        btn.set_completer(code.CodeCompleter)
+        btn.set_completer(OptionsCompleter)
         if self._option_object:
             btn.set_option_object(self._option_object)
 
         return btn
 
+    def _on_script_output(self, output_text):
+        self._option_widget.append_output(output_text)
+
+    def _on_script_finished(self, script_run):
+        status = script_run.get_status()
+        if status in (scripts.ScriptStatus.CANCELLED, scripts.ScriptStatus.TIMED_OUT):
+            self._option_widget.append_output('\n# Script {}\n'.format(status.replace('_', ' ')))
+        elif script_run.get_error():
+            self._option_widget.append_output(script_run.get_error())
+
+
+class OptionsCompleter(code.CodeCompleter, object):
+    """
+    Code completer that also completes option names, Python keywords, builtins and option object functions using the
+    completion index shared by all the script widgets of an option object
+    """
+
+    # Minimum number of typed characters before index names are completed
+    MIN_PREFIX_LENGTH = 2
+
+    def __init__(self):
+        super(OptionsCompleter, self).__init__()
+
+        self._completion_index = None
+
+    def set_completion_index(self, completion_index):
+        self._completion_index = completion_index
+
+    def handle_text(self, text):
+        if super(OptionsCompleter, self).handle_text(text):
+            return True
+        if not text or self._completion_index is None:
+            return False
+
+        cursor = self.widget().textCursor()
+        match = re.search(r'[\w.]+$', str(text)[:cursor.columnNumber()])
+        if not match or len(match.group(0)) < self.MIN_PREFIX_LENGTH:
+            return False
+
+        prefix = match.group(0)
+        completions = self._completion_index.complete(prefix)
+        if not completions or completions == [prefix]:
+            return False
+
+        self._string_model.setStringList(completions)
+        self.setCompletionPrefix(prefix)
+        self.popup().setCurrentIndex(self.completionModel().index(0, 0))
+
+        return True
+
 
 class ScriptWidget(text.TextWidget, object):
+
+    # Milliseconds without typing before script syntax is checked
+    SYNTAX_CHECK_DELAY = 400
+    SYNTAX_ERROR_COLOR = QColor(220, 60, 60)
+
+    syntaxChecked = Signal(object, object)
+
     def __init__(self, name, parent=None):
         super(ScriptWidget, self).__init__(name, parent)
 
+        self._syntax_issue = None
+        self._option_object = None
+        self._completer = None
+
     def get_main_layout(self):
         return layouts.VerticalLayout()
 
+    def ui(self):
+        super(ScriptWidget, self).ui()
+
+        self.output_widget = QPlainTextEdit()
+        self.output_widget.setReadOnly(True)
+        self.output_widget.setMaximumHeight(150)
+        self.output_widget.hide()
+        self.main_layout.addWidget(self.output_widget)
+
+        self._syntax_timer = QTimer(self)
+        self._syntax_timer.setSingleShot(True)
+        self._syntax_timer.setInterval(self.SYNTAX_CHECK_DELAY)
+
+    def setup_signals(self):
+        super(ScriptWidget, self).setup_signals()
+
+        self._syntax_timer.timeout.connect(self._on_check_syntax)
+        self.syntaxChecked.connect(self._on_syntax_checked)
+
     def get_text_widget(self):
         code_text = code.CodeTextEdit()
         code_text.setMaximumHeight(30)
@@ -113,10 +247,37 @@ class ScriptWidget(text.TextWidget, object):
         self.text_widget.setPlainText(text)
 
     def set_option_object(self, option_object):
+        if option_object is self._option_object:
+            return
+
+        self._option_object = option_object
         self.text_widget.set_option_object(option_object)
+        self._update_completion_index()
 
     def set_completer(self, completer):
-        self.text_widget.set_completer(completer)
+        def _create_completer():
+            self._completer = completer()
+            self._update_completion_index()
+            return self._completer
+
+        self.text_widget.set_completer(_create_completer)
+
+    def get_syntax_issue(self):
+        """
+        Returns the syntax error of current script text, if any
+        :return: SyntaxIssue or None
+        """
+
+        return self._syntax_issue
+
+    def clear_output(self):
+        self.output_widget.clear()
+        self.output_widget.hide()
+
+    def append_output(self, output_text):
+        self.output_widget.show()
+        self.output_widget.moveCursor(QTextCursor.End)
+        self.output_widget.insertPlainText(output_text)
 
     def set_minimum(self):
         self.text_widget.setMaximumHeight(30)
@@ -124,5 +285,61 @@ class ScriptWidget(text.TextWidget, object):
     def _on_resize_on_press(self):
         self.text_widget.setMaximumHeight(500)
 
+        # Option objects that do not notify their changes are indexed again each time a script starts being edited
+        if self._option_object is not None and hasattr(self._completer, 'set_completion_index'):
+            completion_index = completion.get_completion_index(self._option_object)
+            if not completion_index.is_tracking():
+                completion_index.refresh()
+
+    def _update_completion_index(self):
+        """
+        Internal function that sets the completion index shared by all the script widgets of current option object
+        into the completer
+        """
+
+        if not hasattr(self._completer, 'set_completion_index'):
+            return
+
+        completion_index = None
+        if self._option_object is not None:
+            completion_index = completion.get_completion_index(self._option_object)
+            if not completion_index.is_tracking():
+                completion_index.refresh()
+        self._completer.set_completion_index(completion_index)
+
+    def _set_syntax_issue(self, issue):
+        """
+        Internal function that highlights the line of the given syntax error
+        :param issue: SyntaxIssue or None
+        """
+
+        if issue == self._syntax_issue:
+            return
+
+        self._syntax_issue = issue
+        selections = list()
+        if issue:
+            selection = QTextEdit.ExtraSelection()
+            selection.format = QTextCharFormat()
+            selection.format.setUnderlineStyle(QTextCharFormat.WaveUnderline)
+            selection.format.setUnderlineColor(self.SYNTAX_ERROR_COLOR)
+            selection.format.setProperty(QTextFormat.FullWidthSelection, True)
+            block = self.text_widget.document().findBlockByNumber(issue.line - 1)
+            selection.cursor = QTextCursor(block)
+            selection.cursor.movePosition(QTextCursor.EndOfBlock, QTextCursor.KeepAnchor)
+            selections.append(selection)
+        self.text_widget.setExtraSelections(selections)
+        self.text_widget.setToolTip('Line {}: {}'.format(issue.line, issue.message) if issue else '')
+
     def _on_text_changed(self):
         self.textChanged.emit(self.text_widget.toPlainText())
+        self._syntax_timer.start()
+
+    def _on_check_syntax(self):
+        scripts.get_syntax_checker().submit(self, self.get_text(), self.syntaxChecked.emit)
+
+    def _on_syntax_checked(self, script_text, issue):
+        # Results of texts that were modified while they were checked are discarded
+        if script_text != self.get_text():
+            return
+        self._set_syntax_issue(issue)
@@ -7,6 +7,8 @@ Module that contains text option implementations
 
 from __future__ import print_function, division, absolute_import
 
+import logging
+
 from Qt.QtCore import Qt, Signal
 from Qt.QtWidgets import QSizePolicy, QLineEdit
 
@@ -14,7 +16,9 @@ from tpDcc import dcc
 from tpDcc.libs.qt.core import base
 from tpDcc.libs.qt.widgets import layouts, label, buttons, lineedit
 
-from tpDcc.libs.options.core import option
+from tpDcc.libs.options.core import option, backends, literals, selection as options_selection
+
+LOGGER = logging.getLogger('tpDcc-libs-options')
 
 
 class TextOption(option.Option, object):
@@ -57,10 +61,19 @@ class NonEditTextOption(TextOption, object):
 
 
 class TextWidget(base.BaseWidget, object):
+
+    # Selections with more names than this are stored compressed and only their summary is displayed
+    SELECTION_BUFFER_THRESHOLD = 100
+
+    # Texts longer than this that contain a list of names are stored compressed when they are set
+    SELECTION_TEXT_THRESHOLD = 2000
+
     textChanged = Signal(str)
 
     def __init__(self, name='', parent=None):
         self._name = name
+        self._selection_buffer = None
+        self._selection_summary = None
         super(TextWidget, self).__init__(parent=parent)
 
         self._use_button = False
@@ -113,11 +126,46 @@ class TextWidget(base.BaseWidget, object):
         self.text_label.setVisible(bool(text))
 
     def get_text(self):
+        if self._selection_buffer is not None:
+            return self._selection_buffer.to_text()
+
         return self.text_widget.text()
 
     def set_text(self, text):
+        # Compressed selections are short once saved, so they are buffered whenever any of their names is a range
+        long_text = len(text) > self.SELECTION_TEXT_THRESHOLD
+        if (long_text or ':' in text) and text.lstrip().startswith('['):
+            try:
+                names = literals.parse_list(text)
+            except literals.LiteralParseError:
+                names = None
+            if names and all(isinstance(name, backends.string_types) for name in names) and (
+                    long_text or any(options_selection.is_range_name(name) for name in names)):
+                self.set_selection_buffer(options_selection.SelectionBuffer(names))
+                return
+
+        self._selection_buffer = None
         self.text_widget.setText(text)
 
+    def get_selection_buffer(self):
+        """
+        Returns the compressed selection stored in the widget, if any
+        :return: SelectionBuffer or None
+        """
+
+        return self._selection_buffer
+
+    def set_selection_buffer(self, selection_buffer):
+        """
+        Stores given compressed selection in the widget. Only its summary is displayed; names are expanded when the
+        text is read as a list. Editing the displayed text discards the selection.
+        :param selection_buffer: SelectionBuffer
+        """
+
+        self._selection_buffer = selection_buffer
+        self._selection_summary = selection_buffer.get_summary()
+        self.text_widget.setText(self._selection_summary)
+
     def set_placeholder(self, text):
         self.text_widget.setPlaceholderText(text)
 
@@ -146,13 +194,16 @@ class TextWidget(base.BaseWidget, object):
         self._suppress_button_command = flag
 
     def get_text_as_list(self):
+        if self._selection_buffer is not None:
+            return self._selection_buffer.get_items(expand=True)
+
         text = str(self.text_widget.text())
-        if text.find('[') > -1:
+        # Single names that contain brackets (such as "pCube1.vtx[0]") are not parsed
+        if text.lstrip().startswith(('[', '(')):
             try:
-                text = eval(text)
-                return text
-            except Exception:
-                pass
+                return literals.parse_list(text)
+            except literals.LiteralParseError as exc:
+                LOGGER.warning('Impossible to parse text of "{}" as a list: {}'.format(self._name, exc))
 
         if text:
             return [text]
@@ -171,6 +222,9 @@ class TextWidget(base.BaseWidget, object):
         if dcc.client().is_maya():
             import maya.cmds as cmds
             selection = cmds.ls(sl=True)
+            if len(selection) > self.SELECTION_BUFFER_THRESHOLD:
+                self.set_selection_buffer(options_selection.SelectionBuffer(selection))
+                return
             if len(selection) > 1:
                 selection = self._remove_unicode(selection)
                 selection = str(selection)
@@ -182,4 +236,6 @@ class TextWidget(base.BaseWidget, object):
             self.set_text(selection)
 
     def _on_text_changed(self):
-        self.textChanged.emit(self.text_widget.text())
+        if self._selection_buffer is not None and self.text_widget.text() != self._selection_summary:
+            self._selection_buffer = None
+        self.textChanged.emit(self.get_text())